@@ -1,2 +1,2 @@
-from .core import network_func, generate_salt, get_exchange_rate, get_payment, get_decimals, erc20_abi
+from .core import network_func, make_web3, make_provider, get_gateways, extra_rpc_urls, generate_salt, get_exchange_rate, get_payment, payment_to_dict, get_decimals, read_bridge_params, erc20_abi
 from .config import SUPPORTED_NETWORKS, ZERO_ADDRESS
\ No newline at end of file
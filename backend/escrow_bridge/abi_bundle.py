@@ -0,0 +1,195 @@
+"""
+Compact ABI + deployment bundle.
+
+Foundry artifacts carry bytecode, source maps and metadata alongside the ABI,
+and chainsettle_config.json ships ~200KB of registry ABIs that the backend
+never uses. ``build_bundle`` distills what the API and CLIs actually need into
+one small JSON file with precomputed function selectors and event topics:
+
+    python -m escrow_bridge.abi_bundle
+
+The bundle is loaded on first access. It records the size, mtime and sha256
+of every source file it was built from; if it has not been built, or any
+source has changed since (a redeploy, a recompiled artifact), the loader warns
+and falls back to reading the source artifacts directly.
+"""
+import os
+import json
+import sys
+import hashlib
+from functools import lru_cache
+
+from eth_utils.abi import abi_to_signature, event_abi_to_log_topic, function_abi_to_4byte_selector
+
+from escrow_bridge.core import erc20_abi
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(BASE_DIR, "..")
+CONTRACTS_DIR = os.path.join(BACKEND_DIR, "..", "contracts")
+
+BUNDLE_PATH = os.getenv("ESCROW_BRIDGE_ABI_BUNDLE", os.path.join(BASE_DIR, "abi_bundle.json"))
+CHAINSETTLE_CONFIG_PATH = os.path.join(BACKEND_DIR, "chainsettle_config.json")
+
+BUNDLE_VERSION = 2
+
+# Foundry artifacts to include: bundle name -> (source file, contract name)
+ARTIFACTS = {
+    "EscrowBridge": ("EscrowBridge.sol", "EscrowBridge"),
+    "EscrowBridgeETH": ("EscrowBridgeETH.sol", "EscrowBridgeETH"),
+}
+
+# Deployment files: network -> (deployment json, bundled contract name)
+DEPLOYMENTS = {
+    "base-sepolia": ("base-escrow-bridge.json", "EscrowBridge"),
+    "blockdag-testnet": ("blockdag-escrow-bridge.json", "EscrowBridge"),
+}
+
+
+def _compact_contract(abi):
+    """ABI plus selector/topic lookup tables."""
+    selectors = {}
+    topics = {}
+    for item in abi:
+        if item.get("type") == "function":
+            selectors[abi_to_signature(item)] = "0x" + function_abi_to_4byte_selector(item).hex()
+        elif item.get("type") == "event" and not item.get("anonymous"):
+            topics[item["name"]] = "0x" + event_abi_to_log_topic(item).hex()
+    return {"abi": abi, "selectors": selectors, "topics": topics}
+
+
+def _source_paths(contracts_dir=CONTRACTS_DIR, chainsettle_config_path=CHAINSETTLE_CONFIG_PATH):
+    paths = [os.path.join(contracts_dir, "out", source, f"{contract}.json") for source, contract in ARTIFACTS.values()]
+    paths += [os.path.join(contracts_dir, "deployments", filename) for filename, _ in DEPLOYMENTS.values()]
+    return paths + [chainsettle_config_path]
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest}
+
+
+def _changed_sources(bundle):
+    """
+    Recorded sources that differ from the files on disk. Size and mtime are
+    checked first; the hash only when they moved (e.g. after a fresh checkout).
+    Sources that are no longer present are not checked.
+    """
+    changed = []
+    for name, recorded in bundle.get("sources", {}).items():
+        path = os.path.normpath(os.path.join(BACKEND_DIR, name))
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if stat.st_size == recorded["size"] and stat.st_mtime == recorded["mtime"]:
+            continue
+        if _fingerprint(path)["sha256"] != recorded["sha256"]:
+            changed.append(name)
+    return changed
+
+
+def _read_sources(contracts_dir=CONTRACTS_DIR, chainsettle_config_path=CHAINSETTLE_CONFIG_PATH):
+    contracts = {"ERC20": _compact_contract(erc20_abi)}
+    for name, (source, contract) in ARTIFACTS.items():
+        path = os.path.join(contracts_dir, "out", source, f"{contract}.json")
+        if not os.path.exists(path):
+            print(f"[abi_bundle] Missing artifact {path}, skipping {name}")
+            continue
+        with open(path, "r") as f:
+            contracts[name] = _compact_contract(json.load(f)["abi"])
+
+    deployments = {}
+    for network, (filename, contract) in DEPLOYMENTS.items():
+        with open(os.path.join(contracts_dir, "deployments", filename), "r") as f:
+            data = json.load(f)
+        deployments[network] = {
+            "address": data["deployedTo"],
+            "contract": contract,
+            "transactionHash": data.get("transactionHash"),
+        }
+
+    # Keep only the addresses/URLs from chainsettle_config.json, not its registry ABIs
+    registries = {}
+    with open(chainsettle_config_path, "r") as f:
+        for chain, cfg in json.load(f).items():
+            registries[chain] = {k: v for k, v in cfg.items() if k != "abis"}
+
+    sources = {
+        os.path.relpath(path, BACKEND_DIR): _fingerprint(path)
+        for path in _source_paths(contracts_dir, chainsettle_config_path) if os.path.exists(path)
+    }
+
+    return {
+        "version": BUNDLE_VERSION,
+        "contracts": contracts,
+        "deployments": deployments,
+        "registries": registries,
+        "sources": sources,
+    }
+
+
+def build_bundle(out_path=BUNDLE_PATH, contracts_dir=CONTRACTS_DIR, chainsettle_config_path=CHAINSETTLE_CONFIG_PATH):
+    """Write the compact bundle to ``out_path`` and return it."""
+    bundle = _read_sources(contracts_dir, chainsettle_config_path)
+    with open(out_path, "w") as f:
+        json.dump(bundle, f, separators=(",", ":"))
+    load_bundle.cache_clear()
+    return bundle
+
+
+@lru_cache(maxsize=1)
+def load_bundle():
+    """Load the bundle once per process, building it in memory if missing or stale."""
+    try:
+        with open(BUNDLE_PATH, "r") as f:
+            bundle = json.load(f)
+        if bundle.get("version") != BUNDLE_VERSION:
+            print(f"[abi_bundle] {BUNDLE_PATH} is from an older format, reading source artifacts")
+        else:
+            changed = _changed_sources(bundle)
+            if not changed:
+                return bundle
+            print(f"[abi_bundle] WARNING: {', '.join(changed)} changed since {BUNDLE_PATH} was built; "
+                  f"reading source artifacts (rebuild with `python -m escrow_bridge.abi_bundle`)")
+    except FileNotFoundError:
+        print(f"[abi_bundle] {BUNDLE_PATH} not built, reading source artifacts")
+    return _read_sources()
+
+
+def get_abi(name):
+    return load_bundle()["contracts"][name]["abi"]
+
+
+def get_selector(name, signature):
+    """4-byte selector for a function signature, e.g. ``get_selector("EscrowBridge", "fee()")``."""
+    return load_bundle()["contracts"][name]["selectors"][signature]
+
+
+def get_topic(name, event):
+    """topic0 for an event, e.g. ``get_topic("EscrowBridge", "PaymentSettled")``."""
+    return load_bundle()["contracts"][name]["topics"][event]
+
+
+def get_deployment(network):
+    """Deployment info for a network: address, contract name and deploy tx hash."""
+    return load_bundle()["deployments"][network]
+
+
+def get_bridge_config(network):
+    """``{"address", "abi"}`` for the EscrowBridge deployed on a network."""
+    deployment = get_deployment(network)
+    return {"address": deployment["address"], "abi": get_abi(deployment["contract"])}
+
+
+def get_registry_address(chain, kind="paypal"):
+    """ChainSettle registry address, keyed like chainsettle_config.json (``base``, ``blockdag``, ...)."""
+    return load_bundle()["registries"][chain]["registry_addresses"][kind]
+
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else BUNDLE_PATH
+    bundle = build_bundle(out)
+    size = os.path.getsize(out)
+    print(f"Wrote {out} ({size / 1024:.1f} KB): contracts={sorted(bundle['contracts'])}, deployments={sorted(bundle['deployments'])}")
@@ -0,0 +1,194 @@
+"""
+Historical log backfill.
+
+The listener only looks a few blocks back, so tables built from events can't
+be rebuilt from it. ``backfill_logs`` scans a block range with several
+``eth_getLogs`` requests in flight at once. ``AdaptiveRange`` sizes each
+request: a range the provider rejects as too large ("query returned more than
+10000 results", "block range too large", ...) is split in half and retried,
+and sparse ranges double the size of the next request. Results are handled on
+the calling thread, and ``checkpoint(next_block)`` is called each time the
+contiguous scanned prefix advances, so an interrupted run resumes from there.
+"""
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+from escrow_bridge.batching import RpcBatch
+from escrow_bridge.db import SettledEvent, get_session
+from escrow_bridge.providers import is_too_many_results
+
+
+class AdaptiveRange:
+    """
+    Block span for the next ``eth_getLogs`` request.
+
+    :param size: initial span in blocks
+    :param min_size: never split below this
+    :param max_size: never grow above this
+    :param target_events: results per request to aim for; spans returning under a quarter of it grow
+    """
+
+    def __init__(self, size=2000, min_size=1, max_size=100_000, target_events=5000):
+        self.size = size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_events = target_events
+
+    def succeeded(self, span, events):
+        if events > self.target_events:
+            self.size = max(self.min_size, self.size // 2)
+        elif events < self.target_events // 4 and span >= self.size:
+            self.size = min(self.max_size, self.size * 2)
+
+    def too_many(self, span):
+        self.size = max(self.min_size, min(self.size, span // 2))
+
+
+class BackfillStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.blocks = 0
+        self.events = 0
+        self.requests = 0
+        self.splits = 0
+        self.retries = 0
+
+    @property
+    def elapsed(self):
+        return max(time.monotonic() - self.started, 1e-9)
+
+    def as_dict(self):
+        return {
+            "blocks": self.blocks,
+            "events": self.events,
+            "requests": self.requests,
+            "splits": self.splits,
+            "retries": self.retries,
+            "seconds": round(self.elapsed, 2),
+            "blocks_per_sec": round(self.blocks / self.elapsed, 1),
+            "events_per_sec": round(self.events / self.elapsed, 1),
+        }
+
+
+def _get_logs(w3, address, topics, start, end):
+    return w3.eth.get_logs({"address": address, "topics": topics, "fromBlock": start, "toBlock": end})
+
+
+def backfill_logs(w3, address, topics, start_block, end_block, handle, workers=4, ranges=None,
+                  checkpoint=None, progress=None, retries=3):
+    """
+    Fetch every log matching ``topics`` from ``address`` in [start_block, end_block].
+
+    ``handle(logs)`` is called once per completed range, in completion order.
+    ``checkpoint(next_block)`` is called when every block below ``next_block``
+    has been handled, and ``progress(stats)`` after each range. A range that
+    still fails after ``retries`` attempts raises; the checkpoint stays at the
+    last contiguous block. Returns a ``BackfillStats``.
+    """
+    ranges = ranges or AdaptiveRange()
+    stats = BackfillStats()
+    cursor = start_block
+    watermark = start_block
+    done = {}  # start -> end of handled ranges above the watermark
+    queued = []  # heap of (start, end, attempt): split halves and retries, lowest block first
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while len(in_flight) < workers and (queued or cursor <= end_block):
+                if queued:
+                    start, end, attempt = heapq.heappop(queued)
+                else:
+                    start, end, attempt = cursor, min(cursor + ranges.size - 1, end_block), 0
+                    cursor = end + 1
+                in_flight[pool.submit(_get_logs, w3, address, topics, start, end)] = (start, end, attempt)
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                start, end, attempt = in_flight.pop(future)
+                stats.requests += 1
+                try:
+                    logs = future.result()
+                except Exception as e:
+                    if is_too_many_results(e) and end > start:
+                        middle = (start + end) // 2
+                        ranges.too_many(end - start + 1)
+                        heapq.heappush(queued, (start, middle, 0))
+                        heapq.heappush(queued, (middle + 1, end, 0))
+                        stats.splits += 1
+                        continue
+                    if attempt + 1 < retries:
+                        heapq.heappush(queued, (start, end, attempt + 1))
+                        stats.retries += 1
+                        continue
+                    for pending in in_flight:
+                        pending.cancel()
+                    raise
+
+                ranges.succeeded(end - start + 1, len(logs))
+                handle(logs)
+                stats.blocks += end - start + 1
+                stats.events += len(logs)
+
+                done[start] = end
+                advanced = watermark
+                while advanced in done:
+                    advanced = done.pop(advanced) + 1
+                if advanced != watermark:
+                    watermark = advanced
+                    if checkpoint is not None:
+                        checkpoint(watermark)
+                if progress is not None:
+                    progress(stats)
+    return stats
+
+
+def block_timestamps(w3, block_numbers):
+    """{block number: timestamp} for many blocks in one JSON-RPC batch."""
+    with RpcBatch(w3) as batch:
+        pending = {number: batch.block_timestamp(number) for number in set(block_numbers)}
+    return {number: result.value for number, result in pending.items()}
+
+
+def save_settled_events(network, events, timestamps=None):
+    """
+    Insert ``settled_events`` rows for decoded PaymentSettled events that are
+    not stored yet, dated by their block timestamp. Returns the number added.
+    """
+    if not events:
+        return 0
+    timestamps = timestamps or {}
+    session = get_session()
+    try:
+        ids = [ev['args']['escrowId'].hex() for ev in events]
+        existing = {
+            row.escrow_id
+            for row in session.query(SettledEvent.escrow_id).filter(SettledEvent.escrow_id.in_(ids)).all()
+        }
+        added = 0
+        for escrow_id, ev in zip(ids, events):
+            if escrow_id in existing:
+                continue
+            existing.add(escrow_id)
+            args = ev['args']
+            timestamp = timestamps.get(ev['blockNumber'])
+            session.add(SettledEvent(
+                escrow_id=escrow_id,
+                network=network,
+                payer=args['payer'],
+                settled_at=datetime.utcfromtimestamp(timestamp) if timestamp else datetime.utcnow(),
+                amount_settled_tokens=args['payoutTokensAfterDeskFee'] / 1e6,  # USDC has 6 decimals
+                amount_settled_usd=args['postedUsdFromRegistry'] / 1e6,
+            ))
+            added += 1
+        session.commit()
+        return added
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -0,0 +1,217 @@
+"""
+JSON-RPC batching for independent web3 reads.
+
+Multicall3 (``escrow_bridge.multicall``) folds contract reads into one
+``eth_call``; batching goes one level lower and sends several JSON-RPC requests
+(``eth_call``, ``eth_getBalance``, ``eth_blockNumber``, ...) in a single HTTP
+round trip. Two entry points:
+
+* ``RpcBatch`` - explicit batches for synchronous code::
+
+      with RpcBatch(w3) as batch:
+          fee = batch.call(bridge.functions.fee())
+          balance = batch.balance(account.address)
+      fee.value, balance.value
+
+* ``BatchCoalescer`` - for async code; reads awaited in the same event-loop
+  tick are coalesced into one batch and demultiplexed back to their callers.
+"""
+import asyncio
+import weakref
+
+from web3 import Web3
+
+from escrow_bridge.multicall import decode_result
+
+# Many public endpoints reject batches larger than this
+MAX_BATCH_SIZE = 100
+
+
+class BatchCallError(Exception):
+    """A single request inside a batch returned a JSON-RPC error."""
+
+
+class PendingResult:
+    """Placeholder for a batched request's result, filled in when the batch executes."""
+
+    def __init__(self, formatter=None):
+        self._formatter = formatter
+        self._done = False
+        self._result = None
+        self.error = None
+
+    def _set(self, response):
+        self._done = True
+        if "error" in response:
+            self.error = BatchCallError(response["error"].get("message", response["error"]))
+            return
+        try:
+            raw = response.get("result")
+            self._result = self._formatter(raw) if self._formatter else raw
+        except Exception as e:
+            self.error = e
+
+    @property
+    def value(self):
+        """The decoded result; raises the request's error if it failed."""
+        if not self._done:
+            raise RuntimeError("batch has not been executed yet")
+        if self.error is not None:
+            raise self.error
+        return self._result
+
+    def value_or(self, default=None):
+        return default if self.error is not None else self.value
+
+
+def _block_param(block_identifier):
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    return block_identifier
+
+
+def _send(w3, requests):
+    """Send (method, params) pairs as JSON-RPC batches; returns one response per request."""
+    # Go through the client's middleware (e.g. the block cache), like w3.eth calls do
+    send_batch = w3.provider.batch_request_func(w3, w3.middleware_onion)
+    send_one = w3.provider.request_func(w3, w3.middleware_onion)
+    responses = []
+    for start in range(0, len(requests), MAX_BATCH_SIZE):
+        chunk = requests[start:start + MAX_BATCH_SIZE]
+        response = send_batch(chunk)
+        if isinstance(response, list) and len(response) == len(chunk):
+            responses.extend(response)
+            continue
+        # Endpoint refused the batch as a whole: fall back to one request each
+        print(f"[batch] Batch of {len(chunk)} rejected ({response}), sending individually")
+        responses.extend(send_one(method, params) for method, params in chunk)
+    return responses
+
+
+class RpcBatch:
+    """
+    Collects read requests and sends them as one JSON-RPC batch.
+
+    Requests return a ``PendingResult`` whose ``.value`` is available once the
+    batch executes (on leaving the ``with`` block, or via ``execute()``).
+    """
+
+    def __init__(self, w3, block_identifier="latest"):
+        self.w3 = w3
+        self.block_identifier = block_identifier
+        self._requests = []
+        self._results = []
+
+    def request(self, method, params, formatter=None):
+        pending = PendingResult(formatter)
+        self._requests.append((method, params))
+        self._results.append(pending)
+        return pending
+
+    def call(self, fn, block_identifier=None):
+        """Queue a bound contract call, e.g. ``batch.call(bridge.functions.fee())``."""
+        tx = {"to": fn.address, "data": fn._encode_transaction_data()}
+        block = _block_param(block_identifier or self.block_identifier)
+        return self.request(
+            "eth_call", [tx, block],
+            lambda raw: decode_result(self.w3, fn, bytes(Web3.to_bytes(hexstr=raw))),
+        )
+
+    def balance(self, address, block_identifier=None):
+        block = _block_param(block_identifier or self.block_identifier)
+        return self.request("eth_getBalance", [address, block], lambda raw: int(raw, 16))
+
+    def block_number(self):
+        return self.request("eth_blockNumber", [], lambda raw: int(raw, 16))
+
+    def block_timestamp(self, block_identifier):
+        return self.request(
+            "eth_getBlockByNumber", [_block_param(block_identifier), False],
+            lambda raw: int(raw["timestamp"], 16),
+        )
+
+    def execute(self):
+        requests, results = self._requests, self._results
+        self._requests, self._results = [], []
+        if not requests:
+            return []
+        for pending, response in zip(results, _send(self.w3, requests)):
+            pending._set(response)
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.execute()
+        return False
+
+
+class BatchCoalescer:
+    """
+    Coalesces reads awaited in the same event-loop tick into one JSON-RPC batch.
+
+    ``await coalescer.call(fn)`` behaves like ``await asyncio.to_thread(fn.call)``
+    except that concurrent callers share a single HTTP round trip.
+    """
+
+    def __init__(self, w3):
+        self.w3 = w3
+        self._batch = None
+        self._waiters = []
+        self._tasks = set()  # keep in-flight batches referenced until they finish
+
+    def _submit(self, add):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._batch is None:
+            self._batch = RpcBatch(self.w3)
+            self._waiters = []
+            loop.call_soon(self._flush)
+        self._waiters.append((add(self._batch), future))
+        return future
+
+    def _flush(self):
+        batch, waiters = self._batch, self._waiters
+        self._batch, self._waiters = None, []
+        task = asyncio.ensure_future(self._run(batch, waiters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch, waiters):
+        try:
+            await asyncio.to_thread(batch.execute)
+        except Exception as e:
+            for _, future in waiters:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for pending, future in waiters:
+            if future.done():
+                continue
+            if pending.error is not None:
+                future.set_exception(pending.error)
+            else:
+                future.set_result(pending.value)
+
+    async def call(self, fn):
+        return await self._submit(lambda batch: batch.call(fn))
+
+    async def balance(self, address):
+        return await self._submit(lambda batch: batch.balance(address))
+
+    async def block_number(self):
+        return await self._submit(lambda batch: batch.block_number())
+
+
+_coalescers = weakref.WeakKeyDictionary()
+
+
+def coalescer_for(w3):
+    """Shared ``BatchCoalescer`` for a Web3 client."""
+    coalescer = _coalescers.get(w3)
+    if coalescer is None:
+        coalescer = BatchCoalescer(w3)
+        _coalescers[w3] = coalescer
+    return coalescer
@@ -1,5 +1,6 @@
 import click
-from escrow_bridge import network_func, get_exchange_rate, erc20_abi, ZERO_ADDRESS, SUPPORTED_NETWORKS, get_decimals
+from escrow_bridge import network_func, get_exchange_rate, erc20_abi, ZERO_ADDRESS, SUPPORTED_NETWORKS, get_decimals, read_bridge_params
+from escrow_bridge.abi_bundle import get_bridge_config, get_registry_address
 from escrow_bridge.cli import (
     console, print_status, print_panel, progress_bar, print_json, print_table, symbol_map
 )
@@ -9,41 +10,12 @@ import time
 
 MAX_256 = 2**256 - 1
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# Go up from escrow_bridge/cli to backend
-BACKEND_DIR = os.path.join(BASE_DIR, "..", "..")
-# Go up from escrow_bridge/cli to project root, then to contracts
-CONTRACTS_DIR = os.path.join(BASE_DIR, "..", "..", "..", "contracts")
-
-CONFIG_PATH = os.path.join(BACKEND_DIR, 'chainsettle_config.json')
-with open(CONFIG_PATH, "r") as f:
-    config = json.load(f)
-
-# Using EscrowBridge (USDC version) for Base Sepolia
-escrow_bridge_artifact_path = os.path.join(CONTRACTS_DIR, "out", "EscrowBridge.sol", "EscrowBridge.json")
-base_address_path = os.path.join(CONTRACTS_DIR, "deployments", "base-escrow-bridge.json")
-bdag_address_path = os.path.join(CONTRACTS_DIR, "deployments", "blockdag-escrow-bridge.json")
-
-with open(base_address_path, 'r') as f:
-    ESCROW_BRIDGE_ADDRESS_BASE = json.load(f)['deployedTo']
-
-with open(bdag_address_path, 'r') as f:
-    ESCROW_BRIDGE_ADDRESS_BDAG = json.load(f)['deployedTo']
-
-with open(escrow_bridge_artifact_path, 'r') as f:
-    escrow_bridge_abi = json.load(f)['abi']
-
-# EscrowBridge (USDC) configuration
-escrow_bridge_config = {
-    "base-sepolia": {
-        "address": ESCROW_BRIDGE_ADDRESS_BASE,
-        "abi": escrow_bridge_abi
-    },
-    "blockdag-testnet": {
-        "address": ESCROW_BRIDGE_ADDRESS_BDAG,
-        "abi": escrow_bridge_abi
-    },
-}
+def _hex(value):
+    value = value.hex() if isinstance(value, (bytes, bytearray)) else str(value)
+    return value if value.startswith("0x") else "0x" + value
+
+# Contract addresses/ABIs and ChainSettle registry addresses come from the
+# compact ABI bundle (see escrow_bridge.abi_bundle), loaded on first use
 
 @click.group()
 def cli():
@@ -59,7 +31,7 @@ def fund_escrow(amount, network):
 
     norm_network = network.split("-")[0]
 
-    REGISTRY_ADDRESS = config[norm_network]['registry_addresses']["paypal"]
+    REGISTRY_ADDRESS = get_registry_address(norm_network, "paypal")
 
     with progress_bar("Connecting to network...") as progress:
         task = progress.add_task("Setting up...", total=None)
@@ -67,8 +39,8 @@ def fund_escrow(amount, network):
 
     print(f'account address: {account.address}')
 
-    contract_address = escrow_bridge_config[network]['address']
-    bridge_abi = escrow_bridge_config[network]['abi']
+    contract_address = get_bridge_config(network)["address"]
+    bridge_abi = get_bridge_config(network)["abi"]
 
     bridge = w3.eth.contract(address=contract_address, abi=bridge_abi)
 
@@ -80,7 +52,14 @@ def fund_escrow(amount, network):
     ]
     print_table(["Field", "Value"], rows, title="Connection Info")
 
-    onchain_reg_address = bridge.functions.settlementRegistry().call()
+    # All preflight reads go out as two JSON-RPC batches
+    params = read_bridge_params(
+        bridge,
+        ["settlementRegistry", "minPaymentAmount", "maxPaymentAmount", "fee"],
+        balances_of=[account.address],
+    )
+
+    onchain_reg_address = params["settlementRegistry"]
     print_status(f"Registry address: {onchain_reg_address[:20]}...", level="info")
 
     if REGISTRY_ADDRESS.lower() != onchain_reg_address.lower():
@@ -88,26 +67,20 @@ def fund_escrow(amount, network):
         raise click.ClickException("Registry address mismatch.")
 
     # Check limits
-    min_raw = bridge.functions.minPaymentAmount().call()
-    max_raw = bridge.functions.maxPaymentAmount().call()
-
-    # Fetch token details
-    try:
-        usdc_address = bridge.functions.usdcToken().call()
-        erc20 = w3.eth.contract(address=usdc_address, abi=erc20_abi)
-        token_decimals = erc20.functions.decimals().call()
-        symbol = "USDC"
-        token_address = usdc_address
-    except Exception as e:
-        print_status(f"Error fetching token details: {e}", level="warn")
-        token_decimals = 18
-        symbol = "BDAG"
-        token_address = ZERO_ADDRESS
-        erc20 = None
+    min_raw = params["minPaymentAmount"]
+    max_raw = params["maxPaymentAmount"]
+
+    # Token details
+    erc20 = params["erc20"]
+    token_decimals = params["token_decimals"]
+    symbol = params["symbol"]
+    token_address = params["token_address"]
+    if erc20 is None:
+        print_status("No ERC20 payment token, using native currency", level="warn")
 
     print(f'token_address: {token_address}, symbol: {symbol}, decimals: {token_decimals}')
 
-    fee = bridge.functions.fee().call()
+    fee = params["fee"]
 
     min_human = min_raw / (10 ** token_decimals)
     max_human = max_raw / (10 ** token_decimals)
@@ -131,7 +104,7 @@ def fund_escrow(amount, network):
     print_status(f"Funding with {top_up / (10**token_decimals):.6f} {symbol}", level="info")
 
     # Check EOA balance
-    owner_raw_balance = erc20.functions.balanceOf(account.address).call() if erc20 else w3.eth.get_balance(account.address)
+    owner_raw_balance = params["balances"][0]
     owner_human_balance = owner_raw_balance / (10 ** token_decimals)
     print_status(f"EOA balance: {owner_human_balance:.6f} {symbol}", level="info")
 
@@ -268,8 +241,8 @@ def check_exchange_rate(network):
         task = progress.add_task("Fetching rate...", total=None)
         w3, account = network_func(network=network)
 
-        contract_address = escrow_bridge_config[network]['address']
-        bridge_abi = escrow_bridge_config[network]['abi']
+        contract_address = get_bridge_config(network)["address"]
+        bridge_abi = get_bridge_config(network)["abi"]
 
         bridge = w3.eth.contract(address=contract_address, abi=bridge_abi)
         current_rate = get_exchange_rate(bridge)
@@ -287,8 +260,8 @@ def update_exchange_rate(network, exchange_rate):
         task = progress.add_task("Setting up...", total=None)
         w3, account = network_func(network=network)
 
-    contract_address = escrow_bridge_config[network]['address']
-    bridge_abi = escrow_bridge_config[network]['abi']
+    contract_address = get_bridge_config(network)["address"]
+    bridge_abi = get_bridge_config(network)["abi"]
 
     bridge = w3.eth.contract(address=contract_address, abi=bridge_abi)
 
@@ -333,9 +306,116 @@ def update_exchange_rate(network, exchange_rate):
     new_rate = get_exchange_rate(bridge)
     print_status(f"Verified new rate: {new_rate:.6f} USD", level="success")
 
+@click.command()
+@click.option("--out", default=None, type=click.Path(dir_okay=False), help="Output path (defaults to the packaged bundle location).")
+def build_abi_bundle(out):
+    """Build the compact ABI/deployment bundle from Foundry artifacts."""
+    from escrow_bridge.abi_bundle import build_bundle, BUNDLE_PATH
+
+    out = out or BUNDLE_PATH
+    bundle = build_bundle(out)
+    print_status(f"Wrote {out} ({os.path.getsize(out) / 1024:.1f} KB)", level="success")
+    print_json({"contracts": sorted(bundle["contracts"]), "deployments": sorted(bundle["deployments"])})
+
+@click.command()
+@click.option("--network", default="base-sepolia", type=click.Choice(SUPPORTED_NETWORKS), help="Blockchain network to use.")
+@click.option("--from-block", type=int, default=None, help="First block to scan (default: the saved checkpoint, else the deployment block).")
+@click.option("--to-block", type=int, default=None, help="Last block to scan (default: latest).")
+@click.option("--workers", default=4, type=int, show_default=True, help="Concurrent eth_getLogs requests.")
+@click.option("--chunk-size", default=2000, type=int, show_default=True, help="Initial block range per request; adapts as the scan runs.")
+@click.option("--max-chunk-size", default=100_000, type=int, show_default=True, help="Largest block range per request.")
+@click.option("--dry-run", is_flag=True, help="Scan and report without writing to the database.")
+def backfill(network, from_block, to_block, workers, chunk_size, max_chunk_size, dry_run):
+    """Rebuild settled_events and escrows from the bridge's event history."""
+    from escrow_bridge import make_web3
+    from escrow_bridge.abi_bundle import get_deployment, get_topic
+    from escrow_bridge.backfill import AdaptiveRange, backfill_logs, block_timestamps, save_settled_events
+    from escrow_bridge.db import SyncCheckpoint, get_session
+    from escrow_bridge.escrows import LIFECYCLE_EVENTS, record_escrow_events
+    from escrow_bridge.reconcile import deployment_block
+
+    print_panel("Backfill Events", tone="info")
+
+    w3, _ = make_web3(network)
+    config = get_bridge_config(network)
+    bridge = w3.eth.contract(address=config["address"], abi=config["abi"])
+    contract_name = get_deployment(network)["contract"]
+    # topic0 -> event, so one OR-filtered eth_getLogs returns every lifecycle log
+    events_by_topic = {
+        get_topic(contract_name, name).lower(): getattr(bridge.events, name)() for name in LIFECYCLE_EVENTS
+    }
+    topics = [list(events_by_topic)]
+    checkpoint_name = "backfill:lifecycle"
+
+    def load_checkpoint():
+        session = get_session()
+        try:
+            return SyncCheckpoint.get(session, network, checkpoint_name)
+        finally:
+            session.close()
+
+    def save_checkpoint(next_block):
+        session = get_session()
+        try:
+            SyncCheckpoint.set(session, network, checkpoint_name, next_block)
+        finally:
+            session.close()
+
+    start = from_block
+    if start is None:
+        start = (0 if dry_run else load_checkpoint()) or deployment_block(w3, network)
+    end = to_block if to_block is not None else w3.eth.block_number
+    if start > end:
+        print_status(f"Nothing to scan: block {start} is past {end}", level="success")
+        return
+    print_status(f"Scanning {network} blocks {start}-{end} with {workers} workers", level="info")
+
+    added = 0
+    last_report = time.monotonic()
+
+    def handle(logs):
+        nonlocal added
+        events = [events_by_topic[_hex(log["topics"][0]).lower()].process_log(log) for log in logs]
+        if events and not dry_run:
+            timestamps = block_timestamps(w3, [ev["blockNumber"] for ev in events])
+            added += save_settled_events(network, [ev for ev in events if ev["event"] == "PaymentSettled"], timestamps)
+            record_escrow_events(network, events, timestamps)
+
+    def progress(stats):
+        nonlocal last_report
+        if time.monotonic() - last_report >= 5:
+            last_report = time.monotonic()
+            report = stats.as_dict()
+            print_status(
+                f"{report['blocks']}/{end - start + 1} blocks, {report['events']} events "
+                f"({report['blocks_per_sec']} blocks/s, {report['events_per_sec']} events/s)",
+                level="info",
+            )
+
+    ranges = AdaptiveRange(size=chunk_size, max_size=max_chunk_size)
+    stats = backfill_logs(
+        w3, config["address"], topics, start, end, handle, workers=workers, ranges=ranges,
+        checkpoint=None if dry_run else save_checkpoint, progress=progress,
+    )
+
+    report = stats.as_dict()
+    rows = [
+        ("Blocks", f"{start}-{end} ({report['blocks']})"),
+        ("Events", str(report["events"])),
+        ("Settled events added", "-" if dry_run else str(added)),
+        ("Requests", f"{report['requests']} ({report['splits']} splits, {report['retries']} retries)"),
+        ("Final range", f"{ranges.size} blocks"),
+        ("Elapsed", f"{report['seconds']}s"),
+        ("Blocks/sec", str(report["blocks_per_sec"])),
+        ("Events/sec", str(report["events_per_sec"])),
+    ]
+    print_table(["Field", "Value"], rows, title="Backfill")
+
 cli.add_command(fund_escrow)
 cli.add_command(check_exchange_rate)
 cli.add_command(update_exchange_rate)
+cli.add_command(build_abi_bundle)
+cli.add_command(backfill)
 
 if __name__ == "__main__":
     cli()
@@ -1,6 +1,12 @@
 import click
 from escrow_bridge import (network_func, get_exchange_rate, generate_salt, get_payment,
-                           ZERO_ADDRESS, SUPPORTED_NETWORKS, get_decimals, erc20_abi)
+                           ZERO_ADDRESS, SUPPORTED_NETWORKS, get_decimals,
+                           make_provider, extra_rpc_urls, read_bridge_params)
+from escrow_bridge.config import SERVER_ROLES
+from escrow_bridge.abi_bundle import get_bridge_config
+from escrow_bridge.resolver import EscrowResolver
+from escrow_bridge.batching import RpcBatch
+from escrow_bridge.middleware import BlockCacheMiddleware
 from escrow_bridge.cli import (
     console, print_status, print_panel, progress_bar, print_json, print_table, symbol_map
 )
@@ -29,61 +35,43 @@ STATUS_MAP = {
     4:'failed'
 }
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# Go up from escrow_bridge/cli to project root, then to contracts
-CONTRACTS_DIR = os.path.join(BASE_DIR, "..", "..", "..", "contracts")
-# Using EscrowBridge (USDC version) for Base Sepolia
-escrow_bridge_artifact_path = os.path.join(CONTRACTS_DIR, "out", "EscrowBridge.sol", "EscrowBridge.json")
-
-bdag_address_path = os.path.join(CONTRACTS_DIR, "deployments", "blockdag-escrow-bridge.json")
-base_address_path = os.path.join(CONTRACTS_DIR, "deployments", "base-escrow-bridge.json")
-
 PRIVATE_KEY = os.getenv('PRIVATE_KEY')
 BLOCKDAG_TESTNET_GATEWAY_URL = os.getenv('BLOCKDAG_TESTNET_GATEWAY_URL', 'https://rpc.primordial.bdagscan.com/')
 BASE_SEPOLIA_GATEWAY_URL = os.getenv('BASE_SEPOLIA_GATEWAY_URL', "https://sepolia.base.org/")
 CHAINSETTLE_API_URL = os.getenv('CHAINSETTLE_API_URL', "https://api.chainsettle.tech")
 
-with open(bdag_address_path, 'r') as f:
-    ESCROW_BRIDGE_ADDRESS_BDAG = json.load(f)['deployedTo']
-
-with open(base_address_path, 'r') as f:
-    ESCROW_BRIDGE_ADDRESS_BASE = json.load(f)['deployedTo']
-
-with open(escrow_bridge_artifact_path, 'r') as f:
-    escrow_bridge_abi = json.load(f)['abi']
-
-# Network configuration with gateway URLs and explorer URLs
+# Network configuration with gateway URLs and explorer URLs.
+# Addresses/ABIs are resolved from the ABI bundle when a command first needs them.
 NETWORK_CONFIG = {
     # "blockdag-testnet": {
-    #     "address": ESCROW_BRIDGE_ADDRESS_BDAG,
-    #     "abi": escrow_bridge_abi,
     #     "gateway": BLOCKDAG_TESTNET_GATEWAY_URL,
     #     "explorer": "https://primordial.bdagscan.com/tx/"
     # },
     "base-sepolia": {
-        "address": ESCROW_BRIDGE_ADDRESS_BASE,
-        "abi": escrow_bridge_abi,
         "gateway": BASE_SEPOLIA_GATEWAY_URL,
         "explorer": "https://sepolia.basescan.org/tx/"
     },
 }
 
-# Keep old name for compatibility
-escrow_bridge_config = {net: {"address": cfg["address"], "abi": cfg["abi"]} for net, cfg in NETWORK_CONFIG.items()}
+_base_w3 = None
 
-base_w3 = Web3(Web3.HTTPProvider(BASE_SEPOLIA_GATEWAY_URL))
-base_contract = base_w3.eth.contract(address=ESCROW_BRIDGE_ADDRESS_BASE, abi=escrow_bridge_abi)
+def get_w3(network):
+    """Web3 client for a network: the CLI gateway plus any ``<NETWORK>_RPC_URLS`` fallbacks."""
+    w3 = Web3(make_provider([NETWORK_CONFIG[network]["gateway"]] + extra_rpc_urls(network)))
+    w3.middleware_onion.inject(BlockCacheMiddleware, name="block_cache", layer=0)
+    return w3
 
-# Fetch max escrow time with fallback
-try:
-    max_escrow_time = base_contract.functions.maxEscrowTime().call()
-except Exception as e:
-    print_status(f"Warning: Could not fetch maxEscrowTime: {e}", level="warn")
-    max_escrow_time = 3600  # Default 1 hour
+def get_base_w3():
+    """Shared read-only Web3 client for lookups (created on first use)."""
+    global _base_w3
+    if _base_w3 is None:
+        _base_w3 = get_w3("base-sepolia")
+    return _base_w3
 
 cache = Cache("network_lookup_cache")
 
-TTL_SECONDS = 3600  # 1 hour
+# Same escrow id -> network store the API uses; network assignments never change
+escrow_index = EscrowResolver("escrow_index")
 
 def is_chainsettle_api_running():
     try:
@@ -96,8 +84,11 @@ def is_chainsettle_api_running():
 def poll_status_func(escrowId, bridge, max_attempts=60, delay=5):
 
     escrow_id_bytes = Web3.to_bytes(hexstr=escrowId)
-    created_at = bridge.functions.payments(escrow_id_bytes).call()[8]
-    max_escrow_time = bridge.functions.maxEscrowTime().call()
+    with RpcBatch(bridge.w3) as batch:
+        payment = batch.call(bridge.functions.payments(escrow_id_bytes))
+        escrow_time = batch.call(bridge.functions.maxEscrowTime())
+    created_at = payment.value[8]
+    max_escrow_time = escrow_time.value
 
     for attempt in range(1, max_attempts + 1):
         elapsed_time = time.time() - created_at
@@ -111,10 +102,16 @@ def poll_status_func(escrowId, bridge, max_attempts=60, delay=5):
 
         if escrowId.startswith("0x"):
             escrowId = escrowId[2:]
-        completed_escrows = bridge.functions.getCompletedEscrows().call()
-        pending_escrows = bridge.functions.getPendingEscrows().call()
-        isSettled = bridge.functions.isSettled(escrow_id_bytes).call()
-        status_enum = bridge.functions.getSettlementStatus(escrow_id_bytes).call()
+        # One round trip per poll instead of four
+        with RpcBatch(bridge.w3) as batch:
+            completed = batch.call(bridge.functions.getCompletedEscrows())
+            pending = batch.call(bridge.functions.getPendingEscrows())
+            settled = batch.call(bridge.functions.isSettled(escrow_id_bytes))
+            status_call = batch.call(bridge.functions.getSettlementStatus(escrow_id_bytes))
+        completed_escrows = completed.value
+        pending_escrows = pending.value
+        isSettled = settled.value
+        status_enum = status_call.value
         status = STATUS_MAP.get(status_enum, "unknown")
         print_status(f"Oracle status: {status.upper()}", level="info")
 
@@ -136,28 +133,23 @@ def poll_status_func(escrowId, bridge, max_attempts=60, delay=5):
 def find_network_for_settlement(settlement_id):
     """
     Look for the network and registry type that contains the given settlement_id.
-    First checks cache, then falls back to RPC calls if not cached.
+    First checks the shared escrow index, then falls back to RPC calls if not indexed.
     Returns (network, contract) on success, else (None, None).
     """
 
     if isinstance(settlement_id, str):
         settlement_id = Web3.to_bytes(hexstr=settlement_id)
 
-    cached_result = cache.get(settlement_id.hex())
-    if cached_result:
-        network = cached_result["network"]
-        address = cached_result["address"]
-        abi = escrow_bridge_config[network]["abi"]
-        contract = base_w3.eth.contract(address=address, abi=abi)
+    network = escrow_index.get(settlement_id)
+    if network:
+        contract = get_base_w3().eth.contract(**get_bridge_config(network))
         return network, contract
 
     for net in SUPPORTED_NETWORKS:
-        w3 = base_w3
-        address = escrow_bridge_config[net]["address"]
-        abi = escrow_bridge_config[net]["abi"]
+        w3 = get_base_w3()
 
         try:
-            contract = w3.eth.contract(address=address, abi=abi)
+            contract = w3.eth.contract(**get_bridge_config(net))
         except Exception as e:
             print_status(f"Error loading contract for {net}: {e}", level="error")
             continue
@@ -167,14 +159,8 @@ def find_network_for_settlement(settlement_id):
                 payment = contract.functions.payments(settlement_id).call()
 
                 # if escrow was never initialized, payer will be address(0)
-                if payment[0] != "0x0000000000000000000000000000000000000000":
-                    entry = {
-                        "network": net,
-                        "address": address,
-                    }
-                    contract = w3.eth.contract(address=address, abi=abi)
-                    # Store in cache with TTL
-                    cache.set(settlement_id.hex(), entry, expire=TTL_SECONDS)
+                if payment[0] != ZERO_ADDRESS:
+                    escrow_index.record(settlement_id, net)
                     return net, contract
 
                 break  # stop retry loop if not found
@@ -209,7 +195,7 @@ def config():
 
     config_display = {}
     for net in SUPPORTED_NETWORKS:
-        config_display[net] = {"address": escrow_bridge_config[net]["address"]}
+        config_display[net] = {"address": get_bridge_config(net)["address"]}
 
     print_json(config_display)
 
@@ -290,11 +276,10 @@ def pay(amount, network, recipient, private_key, force, verbose, gas_estimate_fa
     print_panel("Initialize Escrow", tone="info")
     print_status(f"Initializing escrow on {network} for amount: {amount}...", level="info")
 
-    GATEWAY = NETWORK_CONFIG[network]["gateway"]
     EXPL_URL = NETWORK_CONFIG[network]["explorer"]
 
     try:
-        w3 = Web3(Web3.HTTPProvider(GATEWAY))
+        w3 = get_w3(network)
         account = w3.eth.account.from_key(private_key)
     except Exception as e:
         print_status(f"Error setting up Web3 or account: {e}", level="error")
@@ -310,13 +295,20 @@ def pay(amount, network, recipient, private_key, force, verbose, gas_estimate_fa
     if not recipient:
         recipient = account.address
 
-    contract_address = escrow_bridge_config[network]['address']
-    bridge_abi = escrow_bridge_config[network]['abi']
+    contract_address = get_bridge_config(network)["address"]
+    bridge_abi = get_bridge_config(network)["abi"]
 
     bridge = w3.eth.contract(address=contract_address, abi=bridge_abi)
-    max_escrow_time = bridge.functions.maxEscrowTime().call()
 
-    recipient_email = bridge.functions.recipientEmail().call()
+    # All preflight reads go out as two JSON-RPC batches
+    params = read_bridge_params(
+        bridge,
+        ["maxEscrowTime", "recipientEmail", "minPaymentAmount", "maxPaymentAmount",
+         "fee", "FEE_DENOMINATOR", "getFreeBalance"],
+        balances_of=[contract_address],
+    )
+    max_escrow_time = params["maxEscrowTime"]
+    recipient_email = params["recipientEmail"]
 
     # Display contract info
     rows = [
@@ -327,23 +319,16 @@ def pay(amount, network, recipient, private_key, force, verbose, gas_estimate_fa
     print_table(["Field", "Value"], rows, title="Contract Info")
 
     # Check limits
-    min_raw = bridge.functions.minPaymentAmount().call()
-    max_raw = bridge.functions.maxPaymentAmount().call()
+    min_raw = params["minPaymentAmount"]
+    max_raw = params["maxPaymentAmount"]
 
-    try:
-        usdc_address = bridge.functions.usdcToken().call()
-        erc20 = w3.eth.contract(address=usdc_address, abi=erc20_abi)
-        token_decimals = erc20.functions.decimals().call()
-        symbol = "USDC"
-        token_address = usdc_address
-    except Exception as e:
-        token_decimals = 18
-        symbol = "BDAG"
-        token_address = ZERO_ADDRESS
-        erc20 = None
+    erc20 = params["erc20"]
+    token_decimals = params["token_decimals"]
+    symbol = params["symbol"]
+    token_address = params["token_address"]
 
-    fee = bridge.functions.fee().call()
-    FEE_DENOMINATOR = bridge.functions.FEE_DENOMINATOR().call()
+    fee = params["fee"]
+    FEE_DENOMINATOR = params["FEE_DENOMINATOR"]
     fee_percent = fee / FEE_DENOMINATOR
 
     min_human = min_raw / (10 ** token_decimals)
@@ -355,8 +340,8 @@ def pay(amount, network, recipient, private_key, force, verbose, gas_estimate_fa
 
     amount_raw = int(amount * (10 ** token_decimals))
 
-    bridge_raw_balance = erc20.functions.balanceOf(contract_address).call() if erc20 else w3.eth.get_balance(contract_address)
-    ramp_usdc_balance = bridge.functions.getFreeBalance().call()
+    bridge_raw_balance = params["balances"][0]
+    ramp_usdc_balance = params["getFreeBalance"]
     human_ramp_balance = ramp_usdc_balance / (10 ** token_decimals)
 
     if amount > human_ramp_balance:
@@ -485,6 +470,7 @@ def pay(amount, network, recipient, private_key, force, verbose, gas_estimate_fa
     cache.set("last_salt", salt)
     cache.set("last_settlement_id", settlement_id)
     cache.set("last_escrow_id", escrow_id)
+    escrow_index.record(escrow_id_bytes, network)
 
     print_json(escrow)
     print_status("Payment complete.", level="success")
@@ -506,13 +492,12 @@ def init_escrow(amount, network, recipient, private_key, gas_estimate_factor, fo
     """Initialize an escrow payment on-chain only (no oracle registration)."""
     print_panel("Initialize Escrow (On-chain Only)", tone="info")
 
-    GATEWAY = NETWORK_CONFIG[network]["gateway"]
     EXPL_URL = NETWORK_CONFIG[network]["explorer"]
 
     print_status(f"Initializing escrow on {network} for amount: {amount}...", level="info")
 
     try:
-        w3 = Web3(Web3.HTTPProvider(GATEWAY))
+        w3 = get_w3(network)
         account = w3.eth.account.from_key(private_key)
         print_status(f"Using account: {account.address[:20]}...", level="info")
     except Exception as e:
@@ -525,31 +510,31 @@ def init_escrow(amount, network, recipient, private_key, gas_estimate_factor, fo
     if not recipient:
         recipient = account.address
 
-    contract_address = escrow_bridge_config[network]['address']
-    bridge_abi = escrow_bridge_config[network]['abi']
+    contract_address = get_bridge_config(network)["address"]
+    bridge_abi = get_bridge_config(network)["abi"]
 
     bridge = w3.eth.contract(address=contract_address, abi=bridge_abi)
 
-    recipient_email = bridge.functions.recipientEmail().call()
+    # All preflight reads go out as two JSON-RPC batches
+    params = read_bridge_params(
+        bridge,
+        ["recipientEmail", "minPaymentAmount", "maxPaymentAmount", "fee", "FEE_DENOMINATOR", "getFreeBalance"],
+        balances_of=[contract_address],
+    )
+
+    recipient_email = params["recipientEmail"]
     print_status(f"Recipient Email: {recipient_email}", level="info")
 
-    min_raw = bridge.functions.minPaymentAmount().call()
-    max_raw = bridge.functions.maxPaymentAmount().call()
+    min_raw = params["minPaymentAmount"]
+    max_raw = params["maxPaymentAmount"]
 
-    try:
-        usdc_address = bridge.functions.usdcToken().call()
-        erc20 = w3.eth.contract(address=usdc_address, abi=erc20_abi)
-        token_decimals = erc20.functions.decimals().call()
-        symbol = "USDC"
-        token_address = usdc_address
-    except Exception as e:
-        token_decimals = 18
-        symbol = "BDAG"
-        token_address = ZERO_ADDRESS
-        erc20 = None
+    erc20 = params["erc20"]
+    token_decimals = params["token_decimals"]
+    symbol = params["symbol"]
+    token_address = params["token_address"]
 
-    fee = bridge.functions.fee().call()
-    FEE_DENOMINATOR = bridge.functions.FEE_DENOMINATOR().call()
+    fee = params["fee"]
+    FEE_DENOMINATOR = params["FEE_DENOMINATOR"]
     fee_percent = fee / FEE_DENOMINATOR
     print_status(f"Fee: {fee_percent * 100:.2f}%", level="info")
 
@@ -562,8 +547,8 @@ def init_escrow(amount, network, recipient, private_key, gas_estimate_factor, fo
 
     amount_raw = int(amount * (10 ** token_decimals))
 
-    bridge_raw_balance = erc20.functions.balanceOf(contract_address).call() if erc20 else w3.eth.get_balance(contract_address)
-    ramp_usdc_balance = bridge.functions.getFreeBalance().call()
+    bridge_raw_balance = params["balances"][0]
+    ramp_usdc_balance = params["getFreeBalance"]
     human_ramp_balance = ramp_usdc_balance / (10 ** token_decimals)
 
     if amount > human_ramp_balance:
@@ -648,6 +633,7 @@ def init_escrow(amount, network, recipient, private_key, gas_estimate_factor, fo
     cache.set("last_salt", salt)
     cache.set("last_settlement_id", settlement_id)
     cache.set("last_escrow_id", escrow_id)
+    escrow_index.record(escrow_id_bytes, network)
 
     print_status("Escrow initialized successfully.", level="success")
     print_json(info)
@@ -730,13 +716,12 @@ def settle(escrow_id, private_key, gas_estimate_factor):
         print_status(f"Escrow ID {escrow_id[:20]}... is already settled on {network}.", level="warn")
         return
 
-    GATEWAY = NETWORK_CONFIG[network]["gateway"]
     EXPL_URL = NETWORK_CONFIG[network]["explorer"]
 
     print_status(f"Settling escrow ID: {escrow_id[:20]}... on {network}", level="info")
 
     try:
-        w3 = Web3(Web3.HTTPProvider(GATEWAY))
+        w3 = get_w3(network)
         account = w3.eth.account.from_key(private_key)
     except Exception as e:
         print_status(f"Error setting up Web3 or account: {e}", level="error")
@@ -777,6 +762,23 @@ def settle(escrow_id, private_key, gas_estimate_factor):
     else:
         print_status(f"Transaction failed {symbol_map['arrow']} {EXPL_URL}0x{tx_hash.hex()}", level="error")
 
+@click.command()
+@click.option("--role", default=lambda: os.getenv("ESCROW_BRIDGE_ROLE", "all"), type=click.Choice(SERVER_ROLES),
+              help="Background work to run: api (HTTP only), listener (persist events), settler (expire/settle), or all.")
+@click.option("--host", default="0.0.0.0", help="Interface to bind.")
+@click.option("--port", default=4284, type=int, help="Port to listen on.")
+@click.option("--app", "app_path", default="main:app", help="ASGI app to serve (backend.main:app from the repo root).")
+@click.option("--workers", default=1, type=int, help="Uvicorn worker processes (api role only; writers should run one).")
+def serve(role, host, port, app_path, workers):
+    """Run the Escrow Bridge API server in a given process role."""
+    import uvicorn
+
+    if workers > 1 and role != "api":
+        print_status(f"Role '{role}' runs background writers; use --workers 1 and scale with more replicas.", level="warn")
+    os.environ["ESCROW_BRIDGE_ROLE"] = role  # read by the app at import, inherited by workers
+    print_status(f"Serving {app_path} on {host}:{port} (role: {role})", level="info")
+    uvicorn.run(app_path, host=host, port=port, workers=workers)
+
 cli.add_command(pay)
 cli.add_command(init_escrow)
 cli.add_command(register_settlement)
@@ -785,6 +787,7 @@ cli.add_command(poll_status)
 cli.add_command(payment_info)
 cli.add_command(health)
 cli.add_command(config)
+cli.add_command(serve)
 
 if __name__ == "__main__":
     cli()
@@ -16,3 +16,22 @@ CONTRACTS_DIR = os.path.join(BASE_DIR, "..", "..", "contracts", "deployments")
 test_usdc_path = os.path.join(CONTRACTS_DIR, "TestUSDC.json")
 with open(test_usdc_path, 'r') as f:
     TEST_USDC_ADDRESS = json.load(f)['deployedTo']
+
+# Multicall3 is deployed at the same address on Base Sepolia and most EVM chains
+MULTICALL3_ADDRESS = os.getenv("MULTICALL3_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
+
+# Seconds before a slow RPC read is also sent to a second endpoint (0 disables hedging)
+RPC_HEDGE_AFTER = float(os.getenv("RPC_HEDGE_AFTER", "0")) or None
+
+# Keyless public endpoints appended to each network's provider pool as a last resort
+PUBLIC_RPC_URLS = {
+    "base-sepolia": ["https://sepolia.base.org"],
+    "ethereum-sepolia": ["https://eth-sepolia.public.blastapi.io"],
+}
+
+# Process roles for `escrow-bridge serve --role ...` (ESCROW_BRIDGE_ROLE):
+#   api      - HTTP only, no background writers
+#   listener - persists contract events to the database
+#   settler  - expires and settles escrows (the only role that sends background transactions)
+#   all      - everything in one process
+SERVER_ROLES = ("api", "listener", "settler", "all")
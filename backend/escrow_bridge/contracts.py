@@ -0,0 +1,52 @@
+"""
+Process-wide registry of prebuilt contract instances.
+
+``w3.eth.contract(address=..., abi=...)`` processes the whole ABI every time it
+is called. Hot paths (status lookups, log polling, settlement) ask the registry
+instead, which builds each (network, address) contract once and hands back the
+same instance afterwards.
+"""
+from threading import Lock
+
+from escrow_bridge.abi_bundle import get_abi, get_deployment
+
+
+class ContractRegistry:
+    """
+    Cache of contract objects keyed by (network, address).
+
+    :param w3_for_network: callable returning the Web3 client for a network
+    """
+
+    def __init__(self, w3_for_network):
+        self._w3_for_network = w3_for_network
+        self._contracts = {}
+        self._lock = Lock()
+
+    def get(self, network, address, abi_name="EscrowBridge"):
+        key = (network, address.lower())
+        contract = self._contracts.get(key)
+        if contract is None:
+            with self._lock:
+                contract = self._contracts.get(key)
+                if contract is None:
+                    w3 = self._w3_for_network(network)
+                    contract = w3.eth.contract(address=address, abi=get_abi(abi_name))
+                    self._contracts[key] = contract
+        return contract
+
+    def bridge(self, network):
+        """The EscrowBridge deployed on ``network``."""
+        deployment = get_deployment(network)
+        return self.get(network, deployment["address"], deployment["contract"])
+
+    def erc20(self, network, address):
+        return self.get(network, address, "ERC20")
+
+    def clear(self, network=None):
+        """Drop cached contracts, e.g. after a network's Web3 client is rebuilt."""
+        with self._lock:
+            if network is None:
+                self._contracts = {}
+            else:
+                self._contracts = {k: v for k, v in self._contracts.items() if k[0] != network}
@@ -1,7 +1,10 @@
 import os
 from web3 import Web3
 from dotenv import load_dotenv
-from escrow_bridge.config import BLOCKDAG_RPC_URL
+from escrow_bridge.config import BLOCKDAG_RPC_URL, RPC_HEDGE_AFTER, PUBLIC_RPC_URLS, ZERO_ADDRESS
+from escrow_bridge.providers import ProviderPool
+from escrow_bridge.batching import RpcBatch
+from escrow_bridge.middleware import BlockCacheMiddleware
 load_dotenv()
 
 erc20_abi = [
@@ -51,39 +54,64 @@ erc20_abi = [
     }
 ]
 
-def network_func(network='blockdag-testnet'):
-
+def get_gateway(network):
+    """Compose the RPC gateway URL for a network from the environment."""
     ALCHEMY_API_KEY = os.getenv('ALCHEMY_API_KEY')
-    TENDERLY_API_KEY = os.getenv('TENDERLY_API_KEY')
-    PRIVATE_KEY = os.getenv('EVM_PRIVATE_KEY')
 
-    # Compose Gateway URLs
     if network == 'ethereum-sepolia':
         if ALCHEMY_API_KEY is None:
-            GATEWAY = 'https://eth-sepolia.public.blastapi.io'
-        else:
-            try:
-                GATEWAY = f"https://eth-sepolia.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-            except Exception as e:
-                print(f"Failed to connect to Alchemy (Ethereum): {e}")
-                GATEWAY = 'https://eth-sepolia.public.blastapi.io'
+            return 'https://eth-sepolia.public.blastapi.io'
+        return f"https://eth-sepolia.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
 
     elif network == 'base-sepolia':
-        
-        GATEWAY = f'https://base-sepolia.g.alchemy.com/v2/{ALCHEMY_API_KEY}'
+        if ALCHEMY_API_KEY is None:
+            return 'https://sepolia.base.org'
+        return f'https://base-sepolia.g.alchemy.com/v2/{ALCHEMY_API_KEY}'
 
     elif network == 'blockdag-testnet':
-        GATEWAY = BLOCKDAG_RPC_URL
+        return BLOCKDAG_RPC_URL
 
-    w3 = Web3(Web3.HTTPProvider(GATEWAY))
+    raise ValueError(f"Unsupported network: {network}")
 
-    print(f"Connecting to {network} at {GATEWAY}...")
+def extra_rpc_urls(network):
+    """Additional RPC URLs for a network from ``<NETWORK>_RPC_URLS`` (comma separated)."""
+    env_name = network.upper().replace('-', '_') + '_RPC_URLS'
+    return [u.strip() for u in os.getenv(env_name, '').split(',') if u.strip()]
+
+def get_gateways(network):
+    """All RPC URLs for a network, preferred first: primary gateway, extras, public fallbacks."""
+    return [get_gateway(network)] + extra_rpc_urls(network) + PUBLIC_RPC_URLS.get(network, [])
 
+def make_provider(urls, fallback_urls=()):
+    """Provider pool over ``urls`` (``fallback_urls`` last) with failover and optional read hedging."""
+    return ProviderPool(urls, hedge_after=RPC_HEDGE_AFTER, fallback_urls=fallback_urls)
+
+def make_web3(network='blockdag-testnet'):
+    """
+    Build the Web3 client and signer for a network without touching the RPC.
+    Providers connect lazily on the first request.
+    """
+    PRIVATE_KEY = os.getenv('EVM_PRIVATE_KEY')
+
+    w3 = Web3(make_provider([get_gateway(network)] + extra_rpc_urls(network), PUBLIC_RPC_URLS.get(network, [])))
+    # Innermost, so it sees requests exactly as they go to the provider
+    w3.middleware_onion.inject(BlockCacheMiddleware, name="block_cache", layer=0)
     account = None
+    try:
+        account = w3.eth.account.from_key(PRIVATE_KEY)
+    except Exception as e:
+        print(f"Could not load signer for {network}: {e}")
+    return w3, account
+
+def network_func(network='blockdag-testnet'):
+
+    GATEWAY = get_gateway(network)
+    w3, account = make_web3(network)
+
+    print(f"Connecting to {network} at {GATEWAY}...")
 
     if w3.is_connected():
         try:
-            account = w3.eth.account.from_key(PRIVATE_KEY)
             try:
                 latest_block = w3.eth.get_block('latest')['number']
             except:
@@ -114,33 +142,39 @@ def get_exchange_rate(contract) -> float:
         print(f"Error fetching exchange rate: {e}")
         return 0.0
     
-def get_payment(escrow_id: bytes, bridge):
+def get_payment(escrow_id: bytes, bridge, block_identifier="latest"):
     """
     Calls EscrowBridge.payments(escrowId) and returns the Payment struct as a dict.
     
     :param escrow_id: bytes32 escrowId (hex string, e.g. '0xabc123...')
+    :param block_identifier: block to read at (defaults to latest)
     :return: dict with Payment data
     """
     try:
-        p = bridge.functions.payments(escrow_id).call()
-        is_settled = bridge.functions.isSettled(escrow_id).call()
-
-        return {
-            "payer": p[0],
-            "recipient": p[1],
-            "requestedAmount": p[2],
-            "requestedAmountUsd": p[3],
-            "postedAmount": p[4],
-            "postedAmountUsd": p[5],
-            "lastCheckTimestamp": p[6],
-            "checkCount": p[7],
-            "createdAt": p[8],
-            "isSettled": is_settled
-        }
+        # Both reads go out in one JSON-RPC batch
+        with RpcBatch(bridge.w3, block_identifier) as batch:
+            payment = batch.call(bridge.functions.payments(escrow_id))
+            settled = batch.call(bridge.functions.isSettled(escrow_id))
+        return payment_to_dict(payment.value, settled.value)
 
     except Exception as e:
         print(f"Error fetching payment: {e}")
         return None
+
+def payment_to_dict(p, is_settled):
+    """Map a raw ``payments(id)`` tuple plus ``isSettled(id)`` to the Payment dict."""
+    return {
+        "payer": p[0],
+        "recipient": p[1],
+        "requestedAmount": p[2],
+        "requestedAmountUsd": p[3],
+        "postedAmount": p[4],
+        "postedAmountUsd": p[5],
+        "lastCheckTimestamp": p[6],
+        "checkCount": p[7],
+        "createdAt": p[8],
+        "isSettled": is_settled
+    }
     
 def get_decimals(w3, contract):
     try:
@@ -152,4 +186,34 @@ def get_decimals(w3, contract):
     except Exception as e:
         print("❌ Error fetching token details:", e)
         token_decimals = 18
-    return token_decimals
\ No newline at end of file
+    return token_decimals
+
+def read_bridge_params(bridge, names, balances_of=()):
+    """
+    Read no-argument EscrowBridge getters plus the payment token details in
+    two JSON-RPC batches instead of one round trip per call.
+
+    :param names: getter names, e.g. ``["fee", "minPaymentAmount"]``
+    :param balances_of: addresses whose token (or native) balance to include
+    :return: dict of getter results plus ``token_address``, ``symbol``,
+        ``token_decimals``, ``erc20`` (None for native) and ``balances``
+    """
+    w3 = bridge.w3
+    with RpcBatch(w3) as batch:
+        reads = {name: batch.call(bridge.functions[name]()) for name in names}
+        token = batch.call(bridge.functions.usdcToken())
+    params = {name: read.value for name, read in reads.items()}
+
+    try:
+        erc20 = w3.eth.contract(address=token.value, abi=erc20_abi)
+        with RpcBatch(w3) as batch:
+            decimals = batch.call(erc20.functions.decimals())
+            balances = [batch.call(erc20.functions.balanceOf(a)) for a in balances_of]
+        params.update(token_address=token.value, symbol="USDC", token_decimals=decimals.value, erc20=erc20)
+    except Exception:
+        with RpcBatch(w3) as batch:
+            balances = [batch.balance(a) for a in balances_of]
+        params.update(token_address=ZERO_ADDRESS, symbol="BDAG", token_decimals=18, erc20=None)
+
+    params["balances"] = [b.value for b in balances]
+    return params
@@ -1,4 +1,6 @@
 """Database models and utilities for Escrow Bridge."""
-from .models import SettledEvent, APIKey, init_db, get_session, get_session_maker, Base
+from .models import SettledEvent, TerminalPayment, Escrow, OutboxTransaction, SyncCheckpoint, APIKey, init_db, get_engine, get_session, get_session_maker, Base
+from .leases import Lease, LeaseManager, advisory_lock, shard_of
 
-__all__ = ['SettledEvent', 'APIKey', 'init_db', 'get_session', 'get_session_maker', 'Base']
+__all__ = ['SettledEvent', 'TerminalPayment', 'Escrow', 'OutboxTransaction', 'SyncCheckpoint', 'APIKey', 'init_db', 'get_engine', 'get_session', 'get_session_maker', 'Base',
+           'Lease', 'LeaseManager', 'advisory_lock', 'shard_of']
@@ -0,0 +1,196 @@
+"""
+Leases for background workers that write to the chain.
+
+Several API replicas may run the same app, but only one process per shard
+should send settlement/expiry transactions. A lease is a Postgres session-level
+advisory lock held on a dedicated connection: it is released explicitly, or by
+Postgres itself when the holding process dies and its connection drops, so a
+standby replica picks it up on its next attempt.
+
+Escrow ids can be split across ``shards`` leases; the holder of shard ``k``
+handles the escrows with ``shard_of(escrow_id, shards) == k``. One process may
+hold several shards (all of them, when it is the only one running).
+
+Without Postgres (no ``DATABASE_URL``, or SQLite in development) there is no
+way to coordinate, so every lease is granted locally and the process is
+assumed to be the only instance.
+"""
+import asyncio
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from .models import get_engine
+
+DEFAULT_RENEW_INTERVAL = 10  # seconds between lease health checks / acquisition attempts
+
+
+def shard_of(escrow_id, shards):
+    """Shard index of an escrow id (bytes or hex string)."""
+    if shards <= 1:
+        return 0
+    if isinstance(escrow_id, str):
+        escrow_id = bytes.fromhex(escrow_id.removeprefix("0x"))
+    return int.from_bytes(bytes(escrow_id), "big") % shards
+
+
+def lock_key(name):
+    """Signed 64-bit advisory lock key for a lease name."""
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+
+@contextmanager
+def advisory_lock(name, engine=None):
+    """
+    Block until the lock ``name`` is held by this caller alone, across every
+    process sharing the Postgres database; released when the block exits. It
+    is a transaction-level advisory lock, so a crashed holder releases it too.
+    Without Postgres it is a process-local lock.
+    """
+    try:
+        engine = engine or get_engine()
+    except ValueError:
+        engine = None  # no DATABASE_URL
+    if engine is None or engine.dialect.name != "postgresql":
+        with _local_locks_guard:
+            lock = _local_locks.setdefault(name, threading.Lock())
+        with lock:
+            yield
+    else:
+        with engine.connect() as conn, conn.begin():
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": lock_key(name)})
+            yield
+
+
+class Lease:
+    """One advisory lock, held on its own autocommit connection while acquired."""
+
+    def __init__(self, name, engine=None):
+        self.name = name
+        self.key = lock_key(name)
+        self._engine = engine
+        self._conn = None
+        self.local = False  # granted without Postgres
+
+    def _get_engine(self):
+        if self._engine is None:
+            self._engine = get_engine()
+        return self._engine
+
+    @property
+    def held(self):
+        return self.local or self._conn is not None
+
+    def try_acquire(self):
+        """Take the lock if nobody else holds it; never blocks. Returns whether it is held."""
+        if self.held:
+            return True
+        try:
+            engine = self._get_engine()
+        except ValueError:
+            engine = None  # no DATABASE_URL
+        if engine is None or engine.dialect.name != "postgresql":
+            self.local = True
+            return True
+
+        conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def check(self):
+        """Verify the holding connection is still alive; a dropped connection means the lock is gone."""
+        if self._conn is None:
+            return self.local
+        try:
+            self._conn.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            self._drop()
+            return False
+
+    def release(self):
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            except Exception:
+                pass
+            self._drop()
+        self.local = False
+
+    def _drop(self):
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+class LeaseManager:
+    """
+    Keeps trying to hold the ``shards`` leases of one worker group (e.g.
+    ``settler``) and reports which escrow ids this process owns.
+
+    ``run()`` is meant to be a background task; ``owns(escrow_id)`` is cheap
+    and can be called from anywhere.
+    """
+
+    def __init__(self, name, shards=1, renew_interval=DEFAULT_RENEW_INTERVAL, engine=None):
+        self.name = name
+        self.shards = max(1, int(shards))
+        self.renew_interval = renew_interval
+        self.leases = [Lease(f"{name}:{k}/{self.shards}", engine) for k in range(self.shards)]
+        self.owned = set()
+
+    def owns(self, escrow_id):
+        return shard_of(escrow_id, self.shards) in self.owned
+
+    def owns_any(self):
+        return bool(self.owned)
+
+    def renew(self):
+        """Health-check held leases and try to take free ones. Returns the owned shard set."""
+        for k, lease in enumerate(self.leases):
+            was_held = k in self.owned
+            try:
+                held = lease.check() if was_held else lease.try_acquire()
+            except Exception as e:
+                print(f"[lease] {lease.name}: {e}")
+                held = False
+            if held and not was_held:
+                print(f"[lease] Acquired {lease.name}" + (" (local, no Postgres)" if lease.local else ""))
+                self.owned.add(k)
+            elif was_held and not held:
+                print(f"[lease] Lost {lease.name}")
+                self.owned.discard(k)
+        return set(self.owned)
+
+    def release_all(self):
+        for k in list(self.owned):
+            self.leases[k].release()
+            self.owned.discard(k)
+
+    async def run(self):
+        try:
+            while True:
+                await asyncio.to_thread(self.renew)
+                await asyncio.sleep(self.renew_interval)
+        finally:
+            self.release_all()
+
+    def stats(self):
+        return {"name": self.name, "shards": self.shards, "owned": sorted(self.owned)}
@@ -1,10 +1,11 @@
 """
 Database models for Escrow Bridge.
 """
-from sqlalchemy import Column, String, Float, DateTime, Integer, Boolean, create_engine
+from sqlalchemy import Column, String, Float, DateTime, Integer, BigInteger, Numeric, Boolean, Text, Index, UniqueConstraint, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import json
 import os
 import secrets
 import hashlib
@@ -17,6 +18,12 @@ class SettledEvent(Base):
     """Model for tracking PaymentSettled events."""
 
     __tablename__ = 'settled_events'
+    # Keyset pagination walks (settled_at, id), optionally within one network or payer
+    __table_args__ = (
+        Index('ix_settled_events_settled_at_id', 'settled_at', 'id'),
+        Index('ix_settled_events_network_settled_at_id', 'network', 'settled_at', 'id'),
+        Index('ix_settled_events_payer_settled_at_id', 'payer', 'settled_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     escrow_id = Column(String(66), unique=True, nullable=False, index=True)
@@ -29,6 +36,233 @@ class SettledEvent(Base):
     def __repr__(self):
         return f"<SettledEvent(escrow_id='{self.escrow_id[:16]}...', usd=${self.amount_settled_usd:.2f})>"
 
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "escrow_id": self.escrow_id,
+            "network": self.network,
+            "payer": self.payer,
+            "settled_at": self.settled_at.isoformat(),
+            "amount_settled_tokens": self.amount_settled_tokens,
+            "amount_settled_usd": self.amount_settled_usd,
+        }
+
+
+class TerminalPayment(Base):
+    """
+    Final Payment struct of a settled or expired escrow.
+
+    Once an escrow is terminal its on-chain record never changes, so it is
+    stored once and served from here instead of re-reading the contract.
+    """
+
+    __tablename__ = 'terminal_payments'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    escrow_id = Column(String(66), unique=True, nullable=False, index=True)
+    network = Column(String(50), nullable=False)
+    outcome = Column(String(16), nullable=False)  # "settled" or "expired"
+    payer = Column(String(42), nullable=False)
+    recipient = Column(String(42), nullable=False)
+    # Raw uint256 values, exactly as returned by EscrowBridge.payments()
+    requested_amount = Column(Numeric(78, 0), nullable=False)
+    requested_amount_usd = Column(Numeric(78, 0), nullable=False)
+    posted_amount = Column(Numeric(78, 0), nullable=False)
+    posted_amount_usd = Column(Numeric(78, 0), nullable=False)
+    last_check_timestamp = Column(BigInteger, nullable=False)
+    check_count = Column(BigInteger, nullable=False)
+    created_at = Column(BigInteger, nullable=False)
+    tx_hash = Column(String(66), nullable=True)
+    block_number = Column(BigInteger, nullable=True)
+    recorded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<TerminalPayment(escrow_id='{self.escrow_id[:16]}...', outcome='{self.outcome}')>"
+
+    @classmethod
+    def from_payment(cls, escrow_id, network, outcome, payment, tx_hash=None, block_number=None):
+        """Build a record from a ``get_payment`` dict."""
+        return cls(
+            escrow_id=escrow_id,
+            network=network,
+            outcome=outcome,
+            payer=payment["payer"],
+            recipient=payment["recipient"],
+            requested_amount=payment["requestedAmount"],
+            requested_amount_usd=payment["requestedAmountUsd"],
+            posted_amount=payment["postedAmount"],
+            posted_amount_usd=payment["postedAmountUsd"],
+            last_check_timestamp=payment["lastCheckTimestamp"],
+            check_count=payment["checkCount"],
+            created_at=payment["createdAt"],
+            tx_hash=tx_hash,
+            block_number=block_number,
+        )
+
+    def to_payment(self):
+        """The stored record in the same shape ``get_payment`` returns."""
+        return {
+            "payer": self.payer,
+            "recipient": self.recipient,
+            "requestedAmount": int(self.requested_amount),
+            "requestedAmountUsd": int(self.requested_amount_usd),
+            "postedAmount": int(self.posted_amount),
+            "postedAmountUsd": int(self.posted_amount_usd),
+            "lastCheckTimestamp": self.last_check_timestamp,
+            "checkCount": self.check_count,
+            "createdAt": self.created_at,
+            "isSettled": True,
+        }
+
+
+class Escrow(Base):
+    """
+    Lifecycle of one escrow, built from its PaymentInitialized, PaymentSettled
+    and EscrowExpired logs (see ``escrow_bridge.escrows``).
+
+    Logs may be stored in any order (a backfill finishes ranges out of order),
+    so a settled or expired row can exist before its init fields are known.
+    ``settle_seconds`` is filled in once both ends of a settlement are.
+    """
+
+    __tablename__ = 'escrows'
+    __table_args__ = (
+        Index('ix_escrows_network_initialized_at', 'network', 'initialized_at'),
+        Index('ix_escrows_network_settled_at', 'network', 'settled_at'),
+        Index('ix_escrows_network_expired_at', 'network', 'expired_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    escrow_id = Column(String(66), unique=True, nullable=False, index=True)
+    network = Column(String(50), nullable=False)
+    status = Column(String(16), nullable=False, index=True)  # "pending", "settled" or "expired"
+    payer = Column(String(42), nullable=True, index=True)
+    # Raw uint256 values from the event args
+    requested_amount = Column(Numeric(78, 0), nullable=True)
+    requested_amount_usd = Column(Numeric(78, 0), nullable=True)
+    settled_amount = Column(Numeric(78, 0), nullable=True)  # payout after the desk fee
+    settled_amount_usd = Column(Numeric(78, 0), nullable=True)
+    reserved_amount = Column(Numeric(78, 0), nullable=True)  # released on expiry
+    init_block = Column(BigInteger, nullable=True)
+    init_tx = Column(String(66), nullable=True)
+    initialized_at = Column(DateTime, nullable=True, index=True)
+    settle_block = Column(BigInteger, nullable=True)
+    settle_tx = Column(String(66), nullable=True)
+    settled_at = Column(DateTime, nullable=True, index=True)
+    expire_block = Column(BigInteger, nullable=True)
+    expire_tx = Column(String(66), nullable=True)
+    expired_at = Column(DateTime, nullable=True, index=True)
+    settle_seconds = Column(Float, nullable=True, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<Escrow(escrow_id='{self.escrow_id[:16]}...', status='{self.status}')>"
+
+    def to_dict(self):
+        return {
+            "escrow_id": self.escrow_id,
+            "network": self.network,
+            "status": self.status,
+            "payer": self.payer,
+            "requested_amount": int(self.requested_amount) if self.requested_amount is not None else None,
+            "requested_amount_usd": int(self.requested_amount_usd) if self.requested_amount_usd is not None else None,
+            "settled_amount": int(self.settled_amount) if self.settled_amount is not None else None,
+            "settled_amount_usd": int(self.settled_amount_usd) if self.settled_amount_usd is not None else None,
+            "reserved_amount": int(self.reserved_amount) if self.reserved_amount is not None else None,
+            "init_block": self.init_block,
+            "initialized_at": self.initialized_at.isoformat() if self.initialized_at else None,
+            "settle_block": self.settle_block,
+            "settled_at": self.settled_at.isoformat() if self.settled_at else None,
+            "expire_block": self.expire_block,
+            "expired_at": self.expired_at.isoformat() if self.expired_at else None,
+            "settle_seconds": self.settle_seconds,
+        }
+
+
+class OutboxTransaction(Base):
+    """
+    Journal entry for one transaction the server sends (see ``escrow_bridge.outbox``).
+
+    The signed raw transaction is stored before it is broadcast, so a restart
+    can re-broadcast or confirm it instead of sending a second one.
+    """
+
+    __tablename__ = 'tx_outbox'
+    # Next-nonce lookups per sender (see Outbox.next_nonce)
+    __table_args__ = (Index('ix_tx_outbox_network_sender_nonce', 'network', 'sender', 'nonce'),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    network = Column(String(50), nullable=False)
+    kind = Column(String(16), nullable=False)  # "settle", "expire" or "init"
+    escrow_id = Column(String(66), nullable=False, index=True)
+    sender = Column(String(42), nullable=False)
+    state = Column(String(16), nullable=False, index=True)  # intent, signed, broadcast, mined, failed
+    nonce = Column(BigInteger, nullable=True)
+    raw_tx = Column(Text, nullable=True)
+    tx_hash = Column(String(66), nullable=True, index=True)  # latest broadcast (or the one that mined)
+    tx_params = Column(Text, nullable=True)  # JSON of the unsigned tx, for fee-bumped replacements
+    replaced_hashes = Column(Text, nullable=True)  # JSON list of earlier hashes at the same nonce
+    receipt_status = Column(Integer, nullable=True)
+    block_number = Column(BigInteger, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<OutboxTransaction(kind='{self.kind}', escrow_id='{self.escrow_id[:16]}...', state='{self.state}')>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "network": self.network,
+            "kind": self.kind,
+            "escrow_id": self.escrow_id,
+            "sender": self.sender,
+            "state": self.state,
+            "nonce": self.nonce,
+            "raw_tx": self.raw_tx,
+            "tx_hash": self.tx_hash,
+            "tx": json.loads(self.tx_params) if self.tx_params else None,
+            "replaced_hashes": json.loads(self.replaced_hashes) if self.replaced_hashes else [],
+            "receipt_status": self.receipt_status,
+            "block_number": self.block_number,
+            "error": self.error,
+        }
+
+
+class SyncCheckpoint(Base):
+    """
+    Resume position of an incremental chain sync, e.g. the next index of an
+    on-chain array to reconcile, or the next block of a log backfill.
+    """
+
+    __tablename__ = 'sync_checkpoints'
+    __table_args__ = (UniqueConstraint('network', 'name'),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    network = Column(String(50), nullable=False)
+    name = Column(String(100), nullable=False)
+    position = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SyncCheckpoint(network='{self.network}', name='{self.name}', position={self.position})>"
+
+    @classmethod
+    def get(cls, session, network, name):
+        """Stored position, or 0 if this sync has never run."""
+        row = session.query(cls).filter_by(network=network, name=name).first()
+        return row.position if row else 0
+
+    @classmethod
+    def set(cls, session, network, name, position):
+        row = session.query(cls).filter_by(network=network, name=name).first()
+        if row is None:
+            session.add(cls(network=network, name=name, position=position))
+        else:
+            row.position = position
+        session.commit()
+
 
 class APIKey(Base):
     """Model for storing API keys for authentication."""
@@ -112,10 +346,21 @@ def init_db(database_url=None):
         raise ValueError("DATABASE_URL environment variable is not set")
     _engine = create_engine(url, echo=False, pool_pre_ping=True)
     Base.metadata.create_all(_engine)
+    # create_all skips existing tables, so indexes added to them later are created here
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(_engine, checkfirst=True)
     _SessionMaker = sessionmaker(bind=_engine)
     return _engine
 
 
+def get_engine():
+    """The shared engine, initializing the database on first use."""
+    if _engine is None:
+        init_db()
+    return _engine
+
+
 def get_session():
     """Get a database session."""
     global _SessionMaker
@@ -0,0 +1,155 @@
+"""
+The ``escrows`` lifecycle table: writes from lifecycle logs, and the analytics
+read from it.
+
+``record_escrow_events`` upserts one row per escrow from decoded
+PaymentInitialized / PaymentSettled / EscrowExpired logs. It is used by the
+listener, the reconciler and ``escrow-bridge-admin backfill``. The analytics
+helpers run as aggregate SQL over indexed columns, so their cost does not
+depend on how many rows have to be loaded into Python.
+"""
+import math
+from datetime import datetime
+
+from sqlalchemy import func
+
+from escrow_bridge.db import Escrow, get_session
+
+LIFECYCLE_EVENTS = ("PaymentInitialized", "PaymentSettled", "EscrowExpired")
+
+PENDING = "pending"
+SETTLED = "settled"
+EXPIRED = "expired"
+
+
+def _hex(value):
+    value = value.hex() if isinstance(value, (bytes, bytearray)) else str(value)
+    return value if value.startswith("0x") else "0x" + value
+
+
+def _apply(row, event, when):
+    """Copy one lifecycle log onto its escrows row."""
+    args = event['args']
+    block, tx_hash = event['blockNumber'], _hex(event['transactionHash'])
+    row.payer = row.payer or args['payer']
+    if event['event'] == "PaymentInitialized":
+        row.requested_amount = args['amountRequestedTokens']
+        row.requested_amount_usd = args['amountRequestedUsd']
+        row.init_block, row.init_tx, row.initialized_at = block, tx_hash, when
+        if row.status is None:
+            row.status = PENDING
+    elif event['event'] == "PaymentSettled":
+        row.settled_amount = args['payoutTokensAfterDeskFee']
+        row.settled_amount_usd = args['postedUsdFromRegistry']
+        row.settle_block, row.settle_tx, row.settled_at = block, tx_hash, when
+        row.status = SETTLED
+    elif event['event'] == "EscrowExpired":
+        row.reserved_amount = args['amountReservedTokens']
+        row.expire_block, row.expire_tx, row.expired_at = block, tx_hash, when
+        row.status = EXPIRED
+    if row.initialized_at is not None and row.settled_at is not None:
+        row.settle_seconds = (row.settled_at - row.initialized_at).total_seconds()
+
+
+def record_escrow_events(network, events, timestamps=None, session_factory=get_session):
+    """
+    Upsert ``escrows`` rows from decoded lifecycle logs, in any order;
+    replaying a log is harmless. ``timestamps`` maps block number to block
+    timestamp. Returns the number of logs applied.
+    """
+    events = [ev for ev in events if ev['event'] in LIFECYCLE_EVENTS]
+    if not events:
+        return 0
+    timestamps = timestamps or {}
+    session = session_factory()
+    try:
+        ids = list({ev['args']['escrowId'].hex() for ev in events})
+        rows = {row.escrow_id: row for row in session.query(Escrow).filter(Escrow.escrow_id.in_(ids)).all()}
+        for ev in events:
+            escrow_id = ev['args']['escrowId'].hex()
+            row = rows.get(escrow_id)
+            if row is None:
+                row = rows[escrow_id] = Escrow(escrow_id=escrow_id, network=network)
+                session.add(row)
+            timestamp = timestamps.get(ev['blockNumber'])
+            _apply(row, ev, datetime.utcfromtimestamp(timestamp) if timestamp else None)
+        session.commit()
+        return len(events)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _filtered(query, column, network=None, since=None):
+    if network is not None:
+        query = query.filter(Escrow.network == network)
+    if since is not None:
+        query = query.filter(column >= since)
+    return query
+
+
+def settle_latency(session, network=None, since=None, percentiles=(50, 90, 95, 99)):
+    """
+    Time from PaymentInitialized to PaymentSettled, in seconds, for escrows
+    settled since ``since``. Percentiles are nearest-rank, read with one
+    indexed ``ORDER BY settle_seconds OFFSET k LIMIT 1`` each.
+    """
+    query = _filtered(
+        session.query(Escrow.settle_seconds).filter(Escrow.settle_seconds.isnot(None)),
+        Escrow.settled_at, network, since,
+    )
+    count, mean, fastest, slowest = _filtered(
+        session.query(
+            func.count(Escrow.id), func.avg(Escrow.settle_seconds),
+            func.min(Escrow.settle_seconds), func.max(Escrow.settle_seconds),
+        ).filter(Escrow.settle_seconds.isnot(None)),
+        Escrow.settled_at, network, since,
+    ).one()
+    result = {"count": count, "mean": mean, "min": fastest, "max": slowest, "percentiles": {}}
+    for p in percentiles:
+        if count:
+            rank = max(math.ceil(p / 100 * count) - 1, 0)
+            result["percentiles"][f"p{p}"] = query.order_by(Escrow.settle_seconds).offset(rank).limit(1).scalar()
+        else:
+            result["percentiles"][f"p{p}"] = None
+    return result
+
+
+def expiry_ratio(session, network=None, since=None):
+    """Escrows settled vs. expired since ``since``, plus the currently pending count."""
+    settled = _filtered(session.query(func.count(Escrow.id)).filter(Escrow.status == SETTLED),
+                        Escrow.settled_at, network, since).scalar()
+    expired = _filtered(session.query(func.count(Escrow.id)).filter(Escrow.status == EXPIRED),
+                        Escrow.expired_at, network, since).scalar()
+    pending = _filtered(session.query(func.count(Escrow.id)).filter(Escrow.status == PENDING),
+                        Escrow.initialized_at, network).scalar()
+    finished = settled + expired
+    return {
+        "settled": settled,
+        "expired": expired,
+        "pending": pending,
+        "expiry_ratio": expired / finished if finished else None,
+    }
+
+
+def _hour_bucket(session, column):
+    if session.get_bind().dialect.name == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime("%Y-%m-%d %H:00:00", column)
+
+
+def hourly_throughput(session, network=None, since=None):
+    """Initialized / settled / expired counts per UTC hour since ``since``, oldest first."""
+    hours = {}
+    for label, column in (("initialized", Escrow.initialized_at), ("settled", Escrow.settled_at),
+                          ("expired", Escrow.expired_at)):
+        bucket = _hour_bucket(session, column)
+        query = _filtered(session.query(bucket, func.count(Escrow.id)).filter(column.isnot(None)),
+                          column, network, since)
+        for hour, count in query.group_by(bucket).all():
+            if isinstance(hour, datetime):
+                hour = hour.strftime("%Y-%m-%d %H:00:00")
+            hours.setdefault(hour, {"hour": hour, "initialized": 0, "settled": 0, "expired": 0})[label] = count
+    return [hours[hour] for hour in sorted(hours)]
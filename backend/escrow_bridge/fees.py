@@ -0,0 +1,70 @@
+"""
+EIP-1559 fee policy for server-sent transactions, including replacement bumps.
+
+A transaction priced for the base fee at signing time can sit in the mempool
+indefinitely once the base fee rises, and every later nonce from the same
+account queues behind it. ``FeePolicy.bump`` prices a same-nonce replacement:
+both fee fields go up by ``bump_percent`` (nodes reject replacements that
+raise them by less than 10%), ``maxFeePerGas`` always covers the current base
+fee, and nothing is ever priced above ``max_fee_per_gas``.
+"""
+import math
+import os
+
+from web3 import Web3
+
+# Minimum increase nodes (geth, reth, op-geth) accept for a same-nonce replacement
+MIN_REPLACEMENT_BUMP_PERCENT = 10
+
+DEFAULT_PRIORITY_FEE = Web3.to_wei(2, "gwei")
+DEFAULT_FALLBACK_BASE_FEE = Web3.to_wei(15, "gwei")
+
+
+def _scaled(value, percent):
+    return math.ceil(value * (100 + percent) / 100)
+
+
+class FeePolicy:
+    """
+    :param priority_fee: tip for the first broadcast, in wei
+    :param bump_after_blocks: blocks a broadcast may stay unmined before it is replaced
+    :param bump_percent: fee increase per replacement (at least 10)
+    :param max_fee_per_gas: hard cap on ``maxFeePerGas`` in wei; ``None`` for no cap
+    """
+
+    def __init__(self, priority_fee=DEFAULT_PRIORITY_FEE, bump_after_blocks=3, bump_percent=25, max_fee_per_gas=None):
+        self.priority_fee = priority_fee
+        self.bump_after_blocks = bump_after_blocks
+        self.bump_percent = max(bump_percent, MIN_REPLACEMENT_BUMP_PERCENT)
+        self.max_fee_per_gas = max_fee_per_gas
+
+    @classmethod
+    def from_env(cls):
+        """``TX_BUMP_AFTER_BLOCKS``, ``TX_BUMP_PERCENT`` and ``TX_MAX_FEE_GWEI`` (unset or 0 means no cap)."""
+        max_fee_gwei = float(os.getenv("TX_MAX_FEE_GWEI", "0"))
+        return cls(
+            bump_after_blocks=int(os.getenv("TX_BUMP_AFTER_BLOCKS", "3")),
+            bump_percent=int(os.getenv("TX_BUMP_PERCENT", "25")),
+            max_fee_per_gas=Web3.to_wei(max_fee_gwei, "gwei") if max_fee_gwei else None,
+        )
+
+    def _cap(self, value):
+        return value if self.max_fee_per_gas is None else min(value, self.max_fee_per_gas)
+
+    def initial(self, base_fee):
+        """Fee fields for a first broadcast at the given base fee."""
+        max_fee = self._cap(base_fee + self.priority_fee)
+        return {"maxPriorityFeePerGas": min(self.priority_fee, max_fee), "maxFeePerGas": max_fee}
+
+    def bump(self, tx, base_fee):
+        """
+        Fee fields for a replacement of ``tx`` at the given base fee, or None if
+        the cap leaves no room for a replacement nodes would accept.
+        """
+        old_tip, old_max = tx["maxPriorityFeePerGas"], tx["maxFeePerGas"]
+        tip = _scaled(old_tip, self.bump_percent)
+        max_fee = self._cap(max(_scaled(old_max, self.bump_percent), base_fee + tip))
+        tip = min(tip, max_fee)
+        if tip < _scaled(old_tip, MIN_REPLACEMENT_BUMP_PERCENT) or max_fee < _scaled(old_max, MIN_REPLACEMENT_BUMP_PERCENT):
+            return None
+        return {"maxPriorityFeePerGas": tip, "maxFeePerGas": max_fee}
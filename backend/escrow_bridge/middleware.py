@@ -0,0 +1,236 @@
+"""
+Block-scoped ``eth_call`` cache.
+
+The same view calls (``getExchangeRate``, ``getFreeBalance``, ``payments(id)``,
+``isFinalized(id)``, ...) are issued over and over by API handlers and the
+background loops, but their answer can only change when a new block arrives.
+``BlockCacheMiddleware`` pins ``latest`` reads to a known head block and caches
+results keyed by (to, from, calldata, block number); when a newer head is seen
+the cache is dropped. The head is the highest block seen from any endpoint of
+a ``ProviderPool``, so a pinned call can still reach an endpoint that is a
+block behind; if the block is rejected as unknown, the call is retried once
+against plain ``latest`` and the answer is not cached.
+
+The head is refreshed with ``eth_blockNumber`` at most every ``head_ttl``
+seconds, and is also advanced for free from any ``eth_blockNumber`` or
+transaction receipt passing through, so a read issued right after a mined
+transaction always sees that transaction's block.
+
+``eth_chainId`` is answered from memory after the first request: web3's
+validation middleware asks for it before every ``eth_call``, and it cannot
+change for a client.
+"""
+import time
+import weakref
+from collections import OrderedDict
+from threading import Lock
+
+from web3.middleware import Web3Middleware
+
+from escrow_bridge.providers import is_unknown_block
+
+DEFAULT_HEAD_TTL = 2.0  # seconds; roughly one Base block
+DEFAULT_MAX_ENTRIES = 10_000
+
+# Block tags that are pinned to the cached head; anything else ("pending",
+# "safe", "finalized", hashes) bypasses the cache
+_PINNABLE_TAGS = {None, "latest"}
+
+
+class BlockCache:
+    """Per-client cache state shared by every middleware instance for a Web3."""
+
+    def __init__(self, head_ttl=DEFAULT_HEAD_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.head_ttl = head_ttl
+        self.max_entries = max_entries
+        self.head = None
+        self.head_checked_at = 0.0
+        self.entries = OrderedDict()
+        self.chain_id_response = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def observe_head(self, block_number):
+        """Advance the head; a newer block invalidates every cached result."""
+        with self.lock:
+            self.head_checked_at = time.monotonic()
+            if self.head is None or block_number > self.head:
+                self.head = block_number
+                self.entries.clear()
+
+    def head_is_fresh(self):
+        return self.head is not None and time.monotonic() - self.head_checked_at < self.head_ttl
+
+    def get(self, key):
+        with self.lock:
+            response = self.entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key, response):
+        with self.lock:
+            # Drop results computed against a head that has since moved on
+            if key[-1] is not None and self.head is not None and key[-1] < self.head:
+                return
+            self.entries[key] = response
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        return {"head": self.head, "entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+_caches = weakref.WeakKeyDictionary()
+
+
+def block_cache_for(w3):
+    """The ``BlockCache`` used by ``BlockCacheMiddleware`` on ``w3``."""
+    cache = _caches.get(w3)
+    if cache is None:
+        cache = BlockCache()
+        _caches[w3] = cache
+    return cache
+
+
+def _to_int(value):
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+class BlockCacheMiddleware(Web3Middleware):
+    """Caches ``eth_call`` results per block and pins ``latest`` to the cached head."""
+
+    def _cache(self):
+        return block_cache_for(self._w3)
+
+    def _refresh_head(self, cache, make_request):
+        if cache.head_is_fresh():
+            return
+        response = make_request("eth_blockNumber", [])
+        if "result" in response:
+            cache.observe_head(_to_int(response["result"]))
+
+    def _pin(self, cache, params):
+        """Return (pinned params, cache key) for a cacheable eth_call, else (params, None)."""
+        if len(params) > 2:  # state overrides are never cached
+            return params, None
+        tx = params[0]
+        block = params[1] if len(params) > 1 else None
+        if block in _PINNABLE_TAGS:
+            if cache.head is None:
+                return params, None
+            block_number = cache.head
+        elif isinstance(block, str) and block.startswith("0x") and len(block) < 66:
+            block_number = int(block, 16)
+        elif isinstance(block, int):
+            block_number = block
+        else:
+            return params, None
+        key = (str(tx.get("to", "")).lower(), str(tx.get("from", "")).lower(), tx.get("data"), block_number)
+        return [tx, hex(block_number)], key
+
+    @staticmethod
+    def _was_latest(params):
+        return len(params) <= 2 and (params[1] if len(params) > 1 else None) in _PINNABLE_TAGS
+
+    def _observe(self, cache, method, response):
+        result = response.get("result") if isinstance(response, dict) else None
+        if result is None:
+            return
+        if method == "eth_blockNumber":
+            cache.observe_head(_to_int(result))
+        elif method == "eth_getTransactionReceipt" and result.get("blockNumber") is not None:
+            cache.observe_head(_to_int(result["blockNumber"]))
+
+    def wrap_make_request(self, make_request):
+        def middleware(method, params):
+            cache = self._cache()
+            if method == "eth_chainId":
+                if cache.chain_id_response is None:
+                    response = make_request(method, params)
+                    if "error" in response:
+                        return response
+                    cache.chain_id_response = response
+                return dict(cache.chain_id_response)
+            if method != "eth_call":
+                response = make_request(method, params)
+                self._observe(cache, method, response)
+                return response
+
+            self._refresh_head(cache, make_request)
+            pinned, key = self._pin(cache, params)
+            if key is None:
+                return make_request(method, pinned)
+            cached = cache.get(key)
+            if cached is not None:
+                return dict(cached)
+            response = make_request(method, pinned)
+            if is_unknown_block(response) and self._was_latest(params):
+                return make_request(method, params)
+            if "error" not in response:
+                cache.put(key, response)
+            return response
+
+        return middleware
+
+    def wrap_make_batch_request(self, make_batch_request):
+        def middleware(requests_info):
+            cache = self._cache()
+            if any(method == "eth_call" for method, _ in requests_info) and not cache.head_is_fresh():
+                # Fold the head refresh into the batch itself
+                response = make_batch_request([("eth_blockNumber", [])] + list(requests_info))
+                if not isinstance(response, list):
+                    return response
+                self._observe(cache, "eth_blockNumber", response[0])
+                return self._store_batch(cache, requests_info, response[1:])
+
+            responses = [None] * len(requests_info)
+            to_send = []  # (index, method, params, key)
+            for i, (method, params) in enumerate(requests_info):
+                key = None
+                if method == "eth_call":
+                    params, key = self._pin(cache, params)
+                    if key is not None:
+                        cached = cache.get(key)
+                        if cached is not None:
+                            responses[i] = dict(cached)
+                            continue
+                to_send.append((i, method, params, key))
+
+            if to_send:
+                response = make_batch_request([(method, params) for _, method, params, _ in to_send])
+                if not isinstance(response, list):
+                    return response
+                unpinned = []  # pinned reads the endpoint didn't have the block for
+                for (i, method, _, key), resp in zip(to_send, response):
+                    responses[i] = resp
+                    self._observe(cache, method, resp)
+                    if key is not None and is_unknown_block(resp) and self._was_latest(requests_info[i][1]):
+                        unpinned.append(i)
+                    elif key is not None and "error" not in resp:
+                        cache.put(key, resp)
+                if unpinned:
+                    retried = make_batch_request([requests_info[i] for i in unpinned])
+                    if isinstance(retried, list):
+                        for i, resp in zip(unpinned, retried):
+                            responses[i] = resp
+            return responses
+
+        return middleware
+
+    def _store_batch(self, cache, requests_info, responses):
+        # Requests in this batch went out unpinned; cache eth_calls at the head
+        # block that was fetched alongside them
+        for (method, params), resp in zip(requests_info, responses):
+            self._observe(cache, method, resp)
+            if method == "eth_call" and "error" not in resp:
+                block = params[1] if len(params) > 1 else None
+                if block in _PINNABLE_TAGS and len(params) <= 2:
+                    _, key = self._pin(cache, params)
+                    if key is not None:
+                        cache.put(key, resp)
+        return responses
@@ -0,0 +1,155 @@
+"""
+Multicall3 helpers for aggregating independent view calls into one eth_call.
+"""
+import weakref
+from web3 import Web3
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+from eth_utils.abi import get_abi_output_types
+from escrow_bridge.config import MULTICALL3_ADDRESS
+
+multicall3_abi = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getChainId",
+        "outputs": [{"name": "chainid", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getBlockNumber",
+        "outputs": [{"name": "blockNumber", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# Keep batches well under typical eth_call gas / response size limits
+MAX_CALLS_PER_BATCH = 500
+
+
+# One Multicall3 contract object per Web3 client, so aggregate() does no ABI work per call
+_multicall_contracts = weakref.WeakKeyDictionary()
+
+
+def multicall_contract(w3):
+    """Return the Multicall3 contract bound to ``w3``."""
+    contract = _multicall_contracts.get(w3)
+    if contract is None:
+        contract = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=multicall3_abi)
+        _multicall_contracts[w3] = contract
+    return contract
+
+
+def decode_result(w3, fn, data):
+    """Decode raw ``eth_call`` return data for a bound contract function; single outputs are unwrapped."""
+    output_types = get_abi_output_types(fn.abi)
+    values = w3.codec.decode(output_types, data)
+    values = [
+        Web3.to_checksum_address(v) if t == "address" else v
+        for t, v in zip(output_types, values)
+    ]
+    return values[0] if len(values) == 1 else list(values)
+
+
+def _call_each(calls, block_identifier):
+    results = []
+    for fn in calls:
+        try:
+            results.append(fn.call(block_identifier=block_identifier))
+        except Exception as e:
+            print(f"[multicall] {fn.fn_name} failed: {e}")
+            results.append(None)
+    return results
+
+
+def aggregate(w3, calls, block_identifier="latest"):
+    """
+    Execute bound contract function calls (e.g. ``bridge.functions.fee()``) in
+    a single Multicall3 ``aggregate3`` eth_call.
+
+    Returns a list of decoded results in the same order as ``calls``; a call
+    that reverts yields ``None``. If Multicall3 is not deployed on the chain,
+    falls back to issuing the calls one by one; transport errors propagate.
+    """
+    if not calls:
+        return []
+
+    mc = multicall_contract(w3)
+    results = []
+    try:
+        for start in range(0, len(calls), MAX_CALLS_PER_BATCH):
+            chunk = calls[start:start + MAX_CALLS_PER_BATCH]
+            packed = [(fn.address, True, fn._encode_transaction_data()) for fn in chunk]
+            raw = mc.functions.aggregate3(packed).call(block_identifier=block_identifier)
+            for fn, (success, data) in zip(chunk, raw):
+                if not success or not data:
+                    results.append(None)
+                    continue
+                try:
+                    results.append(decode_result(w3, fn, data))
+                except Exception as e:
+                    print(f"[multicall] Could not decode {fn.fn_name}: {e}")
+                    results.append(None)
+    except (BadFunctionCallOutput, ContractLogicError) as e:
+        print(f"[multicall] aggregate3 unavailable, falling back to single calls: {e}")
+        return _call_each(calls, block_identifier)
+
+    return results
+
+
+def array_length_is(w3, getter, length, block_identifier="latest"):
+    """
+    Whether a public array has exactly ``length`` items, checked with one
+    aggregate call: ``getter(length - 1)`` must succeed and ``getter(length)``
+    must revert. ``getter`` is e.g. ``bridge.functions.pendingEscrows``.
+    """
+    probes = [getter(length)] if length == 0 else [getter(length - 1), getter(length)]
+    results = aggregate(w3, probes, block_identifier)
+    return results[-1] is None and all(r is not None for r in results[:-1])
+
+
+def read_array(w3, getter, start=0, page_size=MAX_CALLS_PER_BATCH, block_identifier="latest", limit=None):
+    """
+    Read a public array through its index getter, ``page_size`` indexes per
+    aggregate call, from ``start`` until the first index that reverts (the
+    end of the array) or ``limit`` items. Unlike a ``getX()`` array return,
+    response size stays bounded however long the array grows.
+    """
+    items = []
+    index = start
+    while limit is None or len(items) < limit:
+        size = page_size if limit is None else min(page_size, limit - len(items))
+        page = aggregate(w3, [getter(i) for i in range(index, index + size)], block_identifier)
+        for value in page:
+            if value is None:
+                return items
+            items.append(value)
+        index += size
+    return items
@@ -0,0 +1,285 @@
+"""
+Durable journal for the transactions the server sends.
+
+Every settle/expire/init send moves through::
+
+    intent -> signed -> broadcast -> mined
+                                  \\-> failed
+
+and the signed raw transaction and its nonce are written *before* they are
+broadcast. If the process dies anywhere along the way, ``Outbox.resume`` on
+the next boot re-broadcasts the same raw bytes (a no-op if a node already has
+them) and waits for the receipt, instead of building a second transaction for
+the same escrow. ``Outbox.open`` refuses to start a new send while one for the
+same (network, kind, escrow) is unfinished or has already succeeded.
+
+While waiting, a transaction left unmined for ``FeePolicy.bump_after_blocks``
+is replaced at the same nonce with bumped fees; every replaced hash is kept on
+the entry, and whichever of them mines completes it.
+"""
+import json
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+from escrow_bridge.db import OutboxTransaction, get_session
+from escrow_bridge.fees import DEFAULT_FALLBACK_BASE_FEE
+
+INTENT = "intent"
+SIGNED = "signed"
+BROADCAST = "broadcast"
+MINED = "mined"
+FAILED = "failed"
+UNFINISHED = (INTENT, SIGNED, BROADCAST)
+
+# Node responses meaning "this exact transaction (or its nonce) is already in"
+_KNOWN_TX_ERRORS = ("already known", "known transaction", "already imported", "alreadyknown")
+_NONCE_USED_ERRORS = ("nonce too low", "nonce has already been used")
+# Some transaction is pending at the same nonce: when re-broadcasting an entry that is
+# a bumped replacement of our own; on a first broadcast, someone else's transaction
+_NONCE_PENDING_ERRORS = ("replacement transaction underpriced", "replacement fee too low")
+
+
+def _hex(value):
+    value = value.hex() if isinstance(value, (bytes, bytearray)) else str(value)
+    return value if value.startswith("0x") else "0x" + value
+
+
+class Outbox:
+    """Transaction journal backed by the ``tx_outbox`` table."""
+
+    def __init__(self, session_factory=get_session):
+        self._session_factory = session_factory
+
+    def _update(self, entry_id, **fields):
+        session = self._session_factory()
+        try:
+            session.query(OutboxTransaction).filter_by(id=entry_id).update(fields)
+            session.commit()
+        finally:
+            session.close()
+
+    def open(self, network, kind, escrow_id, sender):
+        """
+        Start a send. Returns ``(entry_id, None)`` for a new intent, or
+        ``(None, existing)`` when a send for this escrow is already in flight or
+        has succeeded, in which case the caller should ``confirm`` it instead.
+        """
+        session = self._session_factory()
+        try:
+            existing = (
+                session.query(OutboxTransaction)
+                .filter_by(network=network, kind=kind, escrow_id=escrow_id)
+                .filter(
+                    OutboxTransaction.state.in_(UNFINISHED)
+                    | ((OutboxTransaction.state == MINED) & (OutboxTransaction.receipt_status == 1))
+                )
+                .order_by(OutboxTransaction.id.desc())
+                .first()
+            )
+            if existing is not None:
+                return None, existing.to_dict()
+            entry = OutboxTransaction(network=network, kind=kind, escrow_id=escrow_id, sender=sender, state=INTENT)
+            session.add(entry)
+            session.commit()
+            return entry.id, None
+        finally:
+            session.close()
+
+    def get(self, entry_id):
+        session = self._session_factory()
+        try:
+            entry = session.query(OutboxTransaction).filter_by(id=entry_id).first()
+            return entry.to_dict() if entry else None
+        finally:
+            session.close()
+
+    def next_nonce(self, network, sender):
+        """
+        One past the highest nonce journaled for ``sender`` by any process
+        (failed sends excluded, their nonces were never broadcast), or None.
+        """
+        session = self._session_factory()
+        try:
+            highest = (
+                session.query(func.max(OutboxTransaction.nonce))
+                .filter_by(network=network, sender=sender)
+                .filter(OutboxTransaction.state.in_((SIGNED, BROADCAST, MINED)))
+                .scalar()
+            )
+            return None if highest is None else highest + 1
+        finally:
+            session.close()
+
+    def signed(self, entry_id, nonce, raw_tx, tx_hash, tx=None):
+        self._update(
+            entry_id, state=SIGNED, nonce=nonce, raw_tx=_hex(raw_tx), tx_hash=_hex(tx_hash),
+            tx_params=json.dumps(tx) if tx is not None else None,
+        )
+
+    def broadcast(self, entry_id):
+        self._update(entry_id, state=BROADCAST)
+
+    def replaced(self, entry, raw_tx, tx_hash, tx):
+        """Record a same-nonce replacement; ``entry`` is updated in place."""
+        entry["replaced_hashes"] = entry["replaced_hashes"] + [entry["tx_hash"]]
+        entry.update(raw_tx=_hex(raw_tx), tx_hash=_hex(tx_hash), tx=tx)
+        self._update(
+            entry["id"], raw_tx=entry["raw_tx"], tx_hash=entry["tx_hash"], tx_params=json.dumps(tx),
+            replaced_hashes=json.dumps(entry["replaced_hashes"]),
+        )
+
+    def mined(self, entry_id, receipt):
+        self._update(
+            entry_id, state=MINED, tx_hash=_hex(receipt["transactionHash"]),
+            receipt_status=receipt["status"], block_number=receipt["blockNumber"],
+        )
+
+    def failed(self, entry_id, error):
+        self._update(entry_id, state=FAILED, error=str(error)[:2000])
+
+    def unfinished(self, network=None, idle_for=None):
+        """
+        Entries left in intent/signed/broadcast, oldest first. With ``idle_for``,
+        only those not updated for that many seconds (no sender is still waiting on them).
+        """
+        session = self._session_factory()
+        try:
+            query = session.query(OutboxTransaction).filter(OutboxTransaction.state.in_(UNFINISHED))
+            if network is not None:
+                query = query.filter_by(network=network)
+            if idle_for is not None:
+                query = query.filter(OutboxTransaction.updated_at <= datetime.utcnow() - timedelta(seconds=idle_for))
+            return [entry.to_dict() for entry in query.order_by(OutboxTransaction.id).all()]
+        finally:
+            session.close()
+
+    def send_raw(self, w3, entry_id, raw_tx, rebroadcast=False):
+        """
+        Broadcast signed bytes, treating "already known" as success. Returns
+        False if the nonce was taken. A transaction pending at the same nonce
+        only counts as ours when ``rebroadcast``-ing an entry that may have been
+        fee-bumped; on a first broadcast it is a nonce conflict.
+        """
+        try:
+            w3.eth.send_raw_transaction(raw_tx)
+        except Exception as e:
+            message = str(e).lower()
+            if any(s in message for s in _NONCE_USED_ERRORS):
+                return False
+            if any(s in message for s in _NONCE_PENDING_ERRORS):
+                if not rebroadcast:
+                    return False
+            elif not any(s in message for s in _KNOWN_TX_ERRORS):
+                raise
+        self.broadcast(entry_id)
+        return True
+
+    def _find_receipt(self, w3, entry):
+        """Receipt of whichever of the entry's hashes (latest or replaced) was mined, if any."""
+        for tx_hash in [entry["tx_hash"]] + list(reversed(entry["replaced_hashes"])):
+            try:
+                receipt = w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+            if receipt is not None:
+                return receipt
+        return None
+
+    def _replace(self, w3, entry, sign, policy):
+        """Re-sign the entry's tx at the same nonce with bumped fees and broadcast it."""
+        base_fee = w3.eth.get_block("latest").get("baseFeePerGas", DEFAULT_FALLBACK_BASE_FEE)
+        fees = policy.bump(entry["tx"], base_fee)
+        if fees is None:
+            if not entry.get("at_fee_cap"):
+                entry["at_fee_cap"] = True
+                print(f"[outbox] {entry['kind']} {entry['escrow_id'][:16]}... stuck at the fee cap ({entry['tx']['maxFeePerGas']} wei)")
+            return False
+        tx = dict(entry["tx"], **fees)
+        signed_tx = sign(tx)
+        old_hash = entry["tx_hash"]
+        # Journal the replacement before broadcasting it, like the original
+        self.replaced(entry, signed_tx.raw_transaction, signed_tx.hash, tx)
+        try:
+            w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            message = str(e).lower()
+            if any(s in message for s in _NONCE_USED_ERRORS + _NONCE_PENDING_ERRORS + _KNOWN_TX_ERRORS):
+                return False  # an earlier version was mined (or is being); the next poll will tell
+            raise
+        print(f"[outbox] Replaced stuck {entry['kind']} {old_hash} -> {entry['tx_hash']} "
+              f"(maxFeePerGas {fees['maxFeePerGas']}, tip {fees['maxPriorityFeePerGas']})")
+        return True
+
+    def wait(self, w3, entry, timeout=120, sign=None, policy=None, poll_interval=2):
+        """
+        Wait for any of the entry's hashes to mine. With ``sign`` (a callable
+        returning a signed tx) and a ``FeePolicy``, the tx is replaced with
+        bumped fees each time it stays unmined for ``policy.bump_after_blocks``.
+        Raises ``TimeExhausted`` after ``timeout`` seconds; the entry stays
+        broadcast and can be confirmed later.
+        """
+        give_up_at = time.monotonic() + timeout
+        can_bump = sign is not None and policy is not None and entry.get("tx") is not None
+        sent_at_block = w3.eth.block_number if can_bump else None
+        while True:
+            receipt = self._find_receipt(w3, entry)
+            if receipt is not None:
+                self.mined(entry["id"], receipt)
+                return receipt
+            if time.monotonic() >= give_up_at:
+                raise TimeExhausted(f"{entry['tx_hash']} not mined after {timeout}s")
+            if can_bump:
+                head = w3.eth.block_number
+                if head - sent_at_block >= policy.bump_after_blocks:
+                    self._replace(w3, entry, sign, policy)
+                    sent_at_block = head
+            time.sleep(poll_interval)
+
+    def confirm(self, w3, entry, timeout=120, sign=None, policy=None):
+        """
+        Drive an unfinished (or already mined) entry to a receipt, re-broadcasting
+        its latest raw transaction if needed (and fee-bumping it, see ``wait``).
+        Returns the receipt, or None if the entry can no longer land (never
+        signed, or its nonce went to another tx).
+        """
+        if entry["state"] == MINED:
+            return self._find_receipt(w3, entry)
+        if entry["state"] == INTENT:
+            # Nothing was signed, so nothing can be on chain
+            self.failed(entry["id"], "interrupted before signing")
+            return None
+
+        receipt = self._find_receipt(w3, entry)
+        if receipt is None and not self.send_raw(w3, entry["id"], entry["raw_tx"], rebroadcast=True):
+            receipt = self._find_receipt(w3, entry)
+            if receipt is None:
+                self.failed(entry["id"], f"nonce {entry['nonce']} used by another transaction")
+                return None
+        if receipt is None:
+            return self.wait(w3, entry, timeout, sign, policy)
+        self.mined(entry["id"], receipt)
+        return receipt
+
+    def resume(self, get_w3, accept=None, signer_for=None, policy=None, idle_for=None):
+        """
+        Confirm every unfinished entry (on boot, and periodically with
+        ``idle_for`` for sends whose ``wait`` gave up). ``get_w3(network)``
+        returns a client; ``accept(entry)`` can skip entries owned by another
+        process; ``signer_for(entry)`` returns a signing callable (or None) so
+        stuck entries can still be fee-bumped. Returns [(entry, receipt or None)].
+        """
+        results = []
+        for entry in self.unfinished(idle_for=idle_for):
+            if accept is not None and not accept(entry):
+                continue
+            sign = signer_for(entry) if signer_for is not None else None
+            try:
+                receipt = self.confirm(get_w3(entry["network"]), entry, sign=sign, policy=policy)
+            except Exception as e:
+                print(f"[outbox] Could not confirm {entry['kind']} {entry['escrow_id'][:16]}... ({entry['tx_hash']}): {e}")
+                continue
+            results.append((entry, receipt))
+        return results
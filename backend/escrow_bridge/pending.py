@@ -0,0 +1,40 @@
+"""
+Pending escrow ids per network, kept current from contract logs.
+
+The listener adds an id on ``PaymentInitialized`` and removes it on
+``PaymentSettled`` / ``EscrowExpired``, so the set follows the chain at block
+latency with O(events) work. A full read of the contract's ``pendingEscrows``
+array is only needed at startup, or when the periodic length check
+(``escrow_bridge.multicall.array_length_is``) finds the two out of step.
+"""
+from threading import Lock
+
+
+class PendingIndex:
+    """Thread-safe network -> set of pending escrow ids (bare hex, as in ``bytes.hex()``)."""
+
+    def __init__(self):
+        self._by_network = {}
+        self._lock = Lock()
+
+    def add(self, network, id_hash):
+        with self._lock:
+            self._by_network.setdefault(network, set()).add(id_hash)
+
+    def discard(self, network, id_hash):
+        with self._lock:
+            self._by_network.get(network, set()).discard(id_hash)
+
+    def replace(self, network, id_hashes):
+        """Swap in a freshly read on-chain set for a network."""
+        with self._lock:
+            self._by_network[network] = set(id_hashes)
+
+    def count(self, network):
+        with self._lock:
+            return len(self._by_network.get(network, ()))
+
+    def as_dict(self):
+        """{id_hash: network} copy, safe to iterate while the listener updates the index."""
+        with self._lock:
+            return {id_hash: net for net, ids in self._by_network.items() for id_hash in ids}
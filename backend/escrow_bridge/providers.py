@@ -0,0 +1,262 @@
+"""
+Multi-endpoint RPC provider pool.
+
+``ProviderPool`` is a drop-in web3 provider that spreads requests over several
+RPC URLs for the same chain. Each endpoint keeps a running latency average
+and error rate; requests go to the healthiest preferred endpoint first
+(fallback URLs only once every preferred one is cooling down) and fail over to
+the next on transport errors, rate limiting, or an "unknown block" answer from
+an endpoint that hasn't caught up with the block being asked for. Slow read calls can optionally
+be hedged: if the primary hasn't answered within ``hedge_after`` seconds the
+same request is sent to the next endpoint and whichever answers first wins.
+"""
+import time
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+
+# JSON-RPC error codes providers use for throttling / capacity problems
+RATE_LIMIT_ERROR_CODES = {-32005, -32016, 429}
+
+# Provider errors meaning "ask for fewer blocks" (geth/erigon, Alchemy, Infura, QuickNode, public RPCs).
+# Infura reports these with -32005 too, so they are checked before the code.
+TOO_MANY_RESULTS_ERRORS = (
+    "query returned more than", "too many results", "response size", "log response size exceeded",
+    "block range", "range is too large", "range too large", "range is too wide", "query timeout",
+)
+
+# Errors from an endpoint that is behind the block a request names
+UNKNOWN_BLOCK_ERRORS = ("header not found", "unknown block", "block not found", "missing trie node")
+
+# Only idempotent reads are ever hedged
+HEDGEABLE_METHODS = {
+    "eth_call",
+    "eth_blockNumber",
+    "eth_chainId",
+    "eth_getBalance",
+    "eth_getBlockByNumber",
+    "eth_getCode",
+    "eth_getLogs",
+    "eth_getTransactionByHash",
+    "eth_getTransactionCount",
+    "eth_getTransactionReceipt",
+    "eth_estimateGas",
+    "eth_feeHistory",
+    "eth_maxPriorityFeePerGas",
+    "eth_gasPrice",
+}
+
+LATENCY_ALPHA = 0.2  # weight of the newest sample in the moving averages
+FAILURES_BEFORE_COOLDOWN = 3
+COOLDOWN_SECONDS = 30
+
+
+class EndpointUnavailable(Exception):
+    """Raised when an endpoint answers with a throttling / capacity error."""
+
+
+class EndpointBehind(EndpointUnavailable):
+    """Raised when an endpoint doesn't have the requested block yet; carries its response."""
+
+    def __init__(self, message, response):
+        super().__init__(message)
+        self.response = response
+
+
+class Endpoint:
+    """One RPC URL plus its health statistics."""
+
+    def __init__(self, url, request_kwargs=None, tier=0):
+        self.url = url
+        self.tier = tier  # 0 for preferred URLs, 1 for last-resort fallbacks
+        # Retries are handled by the pool (by failing over), not per endpoint
+        self.provider = Web3.HTTPProvider(url, request_kwargs=request_kwargs, exception_retry_configuration=None)
+        self.latency = None  # seconds, EWMA
+        self.error_rate = 0.0  # EWMA of 0/1 outcomes
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def record_success(self, elapsed):
+        with self._lock:
+            self.requests += 1
+            self.latency = elapsed if self.latency is None else (1 - LATENCY_ALPHA) * self.latency + LATENCY_ALPHA * elapsed
+            self.error_rate = (1 - LATENCY_ALPHA) * self.error_rate
+            self.consecutive_failures = 0
+            self.cooldown_until = 0.0
+
+    def record_failure(self):
+        with self._lock:
+            self.requests += 1
+            self.error_rate = (1 - LATENCY_ALPHA) * self.error_rate + LATENCY_ALPHA
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= FAILURES_BEFORE_COOLDOWN:
+                self.cooldown_until = time.monotonic() + COOLDOWN_SECONDS
+
+    def cooling_down(self):
+        return self.cooldown_until > time.monotonic()
+
+    def score(self):
+        """Lower is better. Untried endpoints get a neutral latency so they are explored."""
+        latency = self.latency if self.latency is not None else 0.5
+        penalty = 1000.0 if self.cooling_down() else 0.0
+        return latency * (1 + 10 * self.error_rate) + penalty
+
+    def stats(self):
+        return {
+            # Host only: provider URLs often embed API keys in the path
+            "host": urlparse(self.url).netloc,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "cooling_down": self.cooling_down(),
+            "fallback": self.tier > 0,
+        }
+
+
+def is_too_many_results(error):
+    message = str(error).lower()
+    return any(s in message for s in TOO_MANY_RESULTS_ERRORS)
+
+
+def _is_rate_limited(response):
+    error = response.get("error") if isinstance(response, dict) else None
+    if not isinstance(error, dict):
+        return False
+    message = str(error.get("message", "")).lower()
+    if is_too_many_results(message):
+        return False  # an oversized query, not a throttled endpoint
+    return error.get("code") in RATE_LIMIT_ERROR_CODES or "rate limit" in message or "too many requests" in message
+
+
+def is_unknown_block(response):
+    if isinstance(response, list):
+        return any(is_unknown_block(item) for item in response)
+    error = response.get("error") if isinstance(response, dict) else None
+    if not isinstance(error, dict):
+        return False
+    message = str(error.get("message", "")).lower()
+    return any(s in message for s in UNKNOWN_BLOCK_ERRORS)
+
+
+class ProviderPool(JSONBaseProvider):
+    """
+    Health-scored, failover-capable provider over several RPC URLs.
+
+    :param urls: RPC endpoint URLs for one chain (duplicates are dropped)
+    :param hedge_after: seconds to wait before hedging a read to a second
+        endpoint; ``None`` or 0 disables hedging
+    :param fallback_urls: last-resort URLs (e.g. keyless public RPCs), used
+        only while every endpoint in ``urls`` is cooling down, or when a
+        request has failed on all of them
+    """
+
+    def __init__(self, urls, hedge_after=None, request_kwargs=None, fallback_urls=(), **kwargs):
+        super().__init__(**kwargs)
+        urls = list(dict.fromkeys(u for u in urls if u))
+        fallback_urls = [u for u in dict.fromkeys(u for u in fallback_urls if u) if u not in urls]
+        if not urls and not fallback_urls:
+            raise ValueError("ProviderPool needs at least one RPC URL")
+        self.endpoints = [Endpoint(url, request_kwargs) for url in urls]
+        self.endpoints += [Endpoint(url, request_kwargs, tier=1) for url in fallback_urls]
+        self.hedge_after = hedge_after or None
+        self._executor = ThreadPoolExecutor(max_workers=max(2, len(self.endpoints) * 2), thread_name_prefix="rpc-hedge")
+
+    def __str__(self):
+        return f"ProviderPool({', '.join(urlparse(e.url).netloc for e in self.endpoints)})"
+
+    def ranked(self):
+        """Healthy preferred endpoints, then healthy fallbacks, then those cooling down; best score first."""
+        return sorted(self.endpoints, key=lambda e: (e.cooling_down(), e.tier, e.score()))
+
+    def stats(self):
+        return [e.stats() for e in self.ranked()]
+
+    def _send(self, endpoint, method, params):
+        start = time.monotonic()
+        try:
+            response = endpoint.provider.make_request(method, params)
+        except Exception:
+            endpoint.record_failure()
+            raise
+        if _is_rate_limited(response):
+            endpoint.record_failure()
+            raise EndpointUnavailable(f"{urlparse(endpoint.url).netloc} throttled: {response['error']}")
+        endpoint.record_success(time.monotonic() - start)
+        if is_unknown_block(response):
+            # Healthy but lagging: try an endpoint that has the block
+            raise EndpointBehind(f"{urlparse(endpoint.url).netloc} is behind the requested block", response)
+        return response
+
+    def _send_batch(self, endpoint, requests):
+        start = time.monotonic()
+        try:
+            response = endpoint.provider.make_batch_request(requests)
+        except Exception:
+            endpoint.record_failure()
+            raise
+        if _is_rate_limited(response):
+            endpoint.record_failure()
+            raise EndpointUnavailable(f"{urlparse(endpoint.url).netloc} throttled: {response['error']}")
+        endpoint.record_success(time.monotonic() - start)
+        if is_unknown_block(response):
+            # Healthy but lagging: try an endpoint that has the block
+            raise EndpointBehind(f"{urlparse(endpoint.url).netloc} is behind the requested block", response)
+        return response
+
+    def _with_failover(self, send, *args):
+        last_error = None
+        for endpoint in self.ranked():
+            try:
+                return send(endpoint, *args)
+            except Exception as e:
+                last_error = e
+                print(f"[rpc] {urlparse(endpoint.url).netloc} failed ({e}), failing over")
+        return self._give_up(last_error)
+
+    @staticmethod
+    def _give_up(last_error):
+        # If no endpoint has the block, hand the JSON error back to the caller
+        if isinstance(last_error, EndpointBehind):
+            return last_error.response
+        raise last_error
+
+    def _hedged(self, method, params):
+        queue = self.ranked()
+        primary = queue.pop(0)
+        futures = {self._executor.submit(self._send, primary, method, params)}
+        hedged = False
+        last_error = None
+        while futures:
+            # A slow primary is raced against an endpoint of its own tier, never a fallback
+            can_hedge = not hedged and queue and queue[0].tier <= primary.tier
+            timeout = self.hedge_after if can_hedge else None
+            done, futures = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary is slow: race it against the next-best endpoint
+                futures.add(self._executor.submit(self._send, queue.pop(0), method, params))
+                hedged = True
+                continue
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+            if not futures and queue:
+                futures.add(self._executor.submit(self._send, queue.pop(0), method, params))
+        return self._give_up(last_error)
+
+    def make_request(self, method, params):
+        if self.hedge_after and method in HEDGEABLE_METHODS and len(self.endpoints) > 1:
+            return self._hedged(method, params)
+        return self._with_failover(self._send, method, params)
+
+    def make_batch_request(self, requests):
+        return self._with_failover(self._send_batch, requests)
+
+    def is_connected(self, show_traceback=False):
+        return any(e.provider.is_connected(show_traceback=False) for e in self.ranked())
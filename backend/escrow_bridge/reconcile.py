@@ -0,0 +1,95 @@
+"""
+Incremental reconciliation of the database against the contract's arrays.
+
+``escrowIds``, ``completedEscrows`` and ``expiredEscrows`` only ever grow, so
+each can be walked once: a ``SyncCheckpoint`` per (network, array) stores the
+next index to read, and every pass pages only the items appended since the
+last one through the public ``array(i)`` getters (see
+``escrow_bridge.multicall.read_array``). New ids are then diffed against the
+database and any gaps are backfilled from their logs.
+
+A second checkpoint records the block at which an array was last read to its
+end: items past that point were appended after it, so their logs are only
+searched from there on, with the adaptive ranges of ``escrow_bridge.backfill``.
+"""
+from escrow_bridge.abi_bundle import get_deployment, get_topic
+from escrow_bridge.backfill import AdaptiveRange, backfill_logs
+from escrow_bridge.db import SyncCheckpoint, get_session
+from escrow_bridge.multicall import read_array, MAX_CALLS_PER_BATCH
+
+_deployment_blocks = {}
+
+
+def deployment_block(w3, network):
+    """Block the bridge was deployed in (from its deployment tx receipt), or 0 if unknown."""
+    if network not in _deployment_blocks:
+        tx_hash = get_deployment(network).get("transactionHash")
+        block = 0
+        if tx_hash:
+            try:
+                block = w3.eth.get_transaction_receipt(tx_hash)["blockNumber"]
+            except Exception as e:
+                print(f"[reconcile] Could not find the {network} deployment block: {e}")
+                return 0
+        _deployment_blocks[network] = block
+    return _deployment_blocks[network]
+
+
+class ArrayReconciler:
+    """Checkpointed reader of one append-only on-chain array."""
+
+    def __init__(self, network, array, session_factory=get_session, page_size=MAX_CALLS_PER_BATCH):
+        self.network = network
+        self.array = array
+        self.name = f"array:{array}"
+        self._session_factory = session_factory
+        self.page_size = page_size
+
+    def position(self):
+        session = self._session_factory()
+        try:
+            return SyncCheckpoint.get(session, self.network, self.name)
+        finally:
+            session.close()
+
+    def synced_block(self):
+        """Block the array was last read to its end at (0 if never): later items were appended after it."""
+        session = self._session_factory()
+        try:
+            return SyncCheckpoint.get(session, self.network, f"{self.name}:block")
+        finally:
+            session.close()
+
+    def advance(self, position, synced_block=None):
+        """Store the next index; pass ``synced_block`` when that index is the array's length at that block."""
+        session = self._session_factory()
+        try:
+            SyncCheckpoint.set(session, self.network, self.name, position)
+            if synced_block is not None:
+                SyncCheckpoint.set(session, self.network, f"{self.name}:block", synced_block)
+        finally:
+            session.close()
+
+    def new_items(self, bridge, block_identifier="latest", limit=None):
+        """(start index, ids appended since the checkpoint) as of ``block_identifier``."""
+        start = self.position()
+        getter = getattr(bridge.functions, self.array)
+        items = read_array(bridge.w3, getter, start, self.page_size, block_identifier, limit)
+        return start, items
+
+
+def logs_for_ids(bridge, network, event_name, escrow_ids, from_block, to_block, workers=2):
+    """
+    Decoded ``event_name`` logs for specific escrow ids (indexed topic 1) in
+    [from_block, to_block], fetched in adaptive ranges that split whenever the
+    provider rejects a span as too large.
+    """
+    if not escrow_ids:
+        return []
+    contract_name = get_deployment(network)["contract"]
+    topics = [get_topic(contract_name, event_name), ["0x" + bytes(i).hex() for i in escrow_ids]]
+    raw = []
+    backfill_logs(bridge.w3, bridge.address, topics, from_block, to_block, raw.extend,
+                  workers=workers, ranges=AdaptiveRange(size=10_000, max_size=1_000_000))
+    event = getattr(bridge.events, event_name)()
+    return [event.process_log(log) for log in raw]
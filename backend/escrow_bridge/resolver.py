@@ -0,0 +1,118 @@
+"""
+Escrow id -> network resolution shared by the API and the CLI.
+
+Lookups hit an in-memory LRU first, then a small persistent store keyed by the
+raw 32-byte escrow id (values are just the network name, so neither side needs
+JSON encoding). The listener records ids as it sees ``PaymentInitialized``
+logs, so resolving a live escrow normally never touches the RPC.
+
+Ids that were probed and found on no network go into a short-lived negative
+cache so bursts of unknown ids don't each trigger a fresh round of probes.
+The negative cache lives in process memory: ``record`` clears it only in the
+process that calls it. Lookups consult the persistent store first, so a record
+made by another process sharing the same directory still wins; a replica with
+its own directory keeps answering "absent" for up to ``negative_ttl`` after the
+escrow is created. The API records the escrows it initializes itself.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from diskcache import Cache
+from hexbytes import HexBytes
+
+DEFAULT_MEMORY_SIZE = 100_000
+DEFAULT_DISK_SIZE_LIMIT = 64 * 1024 * 1024  # bytes
+# Ids confirmed absent on every network are remembered briefly, since they may
+# simply not be mined yet
+DEFAULT_NEGATIVE_TTL = 30  # seconds
+DEFAULT_NEGATIVE_SIZE = 50_000
+
+
+def to_escrow_key(escrow_id) -> bytes:
+    """Normalize an escrow id (hex string, bytes or HexBytes) to 32 raw bytes."""
+    if isinstance(escrow_id, str):
+        escrow_id = HexBytes(escrow_id if escrow_id.startswith("0x") else "0x" + escrow_id)
+    key = bytes(escrow_id)
+    if len(key) != 32:
+        raise ValueError(f"escrow id must be 32 bytes, got {len(key)}")
+    return key
+
+
+class EscrowResolver:
+    """
+    Two-level escrow id -> network map.
+
+    :param directory: diskcache directory for the persistent store
+    :param memory_size: max entries kept in the in-memory LRU
+    :param ttl: optional expiry (seconds) for persisted entries
+    :param negative_ttl: how long an id confirmed absent stays negatively cached
+        in this process
+    """
+
+    def __init__(self, directory, memory_size=DEFAULT_MEMORY_SIZE, ttl=None,
+                 disk_size_limit=DEFAULT_DISK_SIZE_LIMIT, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 negative_size=DEFAULT_NEGATIVE_SIZE):
+        self._memory = OrderedDict()
+        self._memory_size = memory_size
+        self._lock = Lock()
+        self._ttl = ttl
+        self._store = Cache(directory, size_limit=disk_size_limit)
+        self._absent = OrderedDict()  # key -> expiry timestamp
+        self._negative_ttl = negative_ttl
+        self._negative_size = negative_size
+
+    def _remember(self, key, network):
+        with self._lock:
+            self._memory[key] = network
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, escrow_id) -> Optional[str]:
+        """Network for an escrow id, or None if it has not been recorded."""
+        key = to_escrow_key(escrow_id)
+        with self._lock:
+            network = self._memory.get(key)
+            if network is not None:
+                self._memory.move_to_end(key)
+                return network
+
+        network = self._store.get(key)
+        if network is not None:
+            self._remember(key, network)
+        return network
+
+    def record(self, escrow_id, network):
+        """Record where an escrow lives (idempotent)."""
+        key = to_escrow_key(escrow_id)
+        with self._lock:
+            self._absent.pop(key, None)
+        self._remember(key, network)
+        self._store.set(key, network, expire=self._ttl)
+
+    def mark_absent(self, escrow_id, ttl=None):
+        """Remember that an id was found on no network, for ``ttl`` seconds."""
+        key = to_escrow_key(escrow_id)
+        expires = time.monotonic() + (self._negative_ttl if ttl is None else ttl)
+        with self._lock:
+            self._absent[key] = expires
+            self._absent.move_to_end(key)
+            while len(self._absent) > self._negative_size:
+                self._absent.popitem(last=False)
+
+    def is_absent(self, escrow_id) -> bool:
+        """True while an id is negatively cached."""
+        key = to_escrow_key(escrow_id)
+        with self._lock:
+            expires = self._absent.get(key)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._absent[key]
+                return False
+            return True
+
+    def close(self):
+        self._store.close()
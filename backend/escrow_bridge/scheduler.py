@@ -0,0 +1,79 @@
+"""
+Deadline queue for pending escrows.
+
+Every pending escrow expires at ``createdAt + maxEscrowTime``. ``DeadlineQueue``
+keeps them in a heap ordered by that deadline so the settler can expire
+escrows the moment they become expirable, work on the most urgent settlements
+first, and sleep exactly until the next deadline instead of rescanning.
+"""
+import asyncio
+import heapq
+import time
+
+
+class DeadlineQueue:
+    """
+    Min-heap of (deadline, escrow id, network) with O(log n) add and lazy removal.
+
+    Escrow ids are opaque hashable keys (the settler uses hex strings).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}  # escrow id -> (deadline, network)
+        self._wakeup = asyncio.Event()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, escrow_id):
+        return escrow_id in self._entries
+
+    def add(self, escrow_id, network, deadline):
+        """Schedule (or reschedule) an escrow's deadline."""
+        self._entries[escrow_id] = (deadline, network)
+        heapq.heappush(self._heap, (deadline, escrow_id, network))
+        self._wakeup.set()
+
+    def remove(self, escrow_id):
+        """Forget an escrow (settled, expired or gone); its heap entry is dropped lazily."""
+        self._entries.pop(escrow_id, None)
+
+    def deadline(self, escrow_id):
+        entry = self._entries.get(escrow_id)
+        return entry[0] if entry else None
+
+    def _discard_stale(self):
+        while self._heap:
+            deadline, escrow_id, network = self._heap[0]
+            if self._entries.get(escrow_id) == (deadline, network):
+                return
+            heapq.heappop(self._heap)
+
+    def next_deadline(self):
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now=None):
+        """Remove and return [(escrow id, network, deadline)] whose deadline has passed."""
+        now = time.time() if now is None else now
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            deadline, escrow_id, network = heapq.heappop(self._heap)
+            del self._entries[escrow_id]
+            due.append((escrow_id, network, deadline))
+
+    def by_urgency(self):
+        """Scheduled escrows as [(escrow id, network, deadline)], closest to expiry first."""
+        return [(i, n, d) for d, i, n in sorted((d, i, n) for i, (d, n) in self._entries.items())]
+
+    async def wait(self, timeout):
+        """Sleep up to ``timeout`` seconds, returning early if a new deadline is added."""
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0))
+        except asyncio.TimeoutError:
+            pass
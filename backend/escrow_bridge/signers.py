@@ -0,0 +1,153 @@
+"""
+Pool of signer accounts for server-sent transactions.
+
+With a single key every settlement and expiry waits for the previous nonce,
+so at most a handful land per block. ``SignerPool`` spreads sends over several
+accounts (``EVM_PRIVATE_KEYS``) and tracks balances so an account running out
+of gas is skipped before its sends start failing.
+
+The same keys are used by every process (API replicas send ``init`` with the
+primary key, settlers send settlements and expiries), so nonces can't come
+from a per-process counter. ``nonce_for`` holds a lock shared across processes
+(``lock_for``) while a transaction is signed and broadcast, and assigns the
+higher of the node's pending count and the next nonce in the shared journal
+(``journaled_nonce``). One signer can still have several transactions in
+flight; only the sign-and-broadcast step is serialized.
+
+``expireEscrow`` can be called by any account. ``settlePayment`` needs
+``msg.sender`` to be an authorized attester (or the payer), so pool keys must
+be added with ``addAuthorizedAttester`` to settle; a signer whose settlement
+is rejected as unauthorized is taken off settlement work.
+"""
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+
+from web3 import Web3
+
+from escrow_bridge.batching import RpcBatch
+
+# Work any extra pool signer may do; the primary key (EVM_PRIVATE_KEY) may do anything
+POOL_KINDS = ("settle", "expire")
+
+DEFAULT_MIN_BALANCE = Web3.to_wei(0.0005, "ether")
+
+
+def load_signer_keys():
+    """``EVM_PRIVATE_KEY`` first, then any comma-separated ``EVM_PRIVATE_KEYS`` (duplicates dropped)."""
+    keys = [os.getenv("EVM_PRIVATE_KEY")] + os.getenv("EVM_PRIVATE_KEYS", "").split(",")
+    return list(dict.fromkeys(k.strip() for k in keys if k and k.strip()))
+
+
+class Signer:
+    """One account plus its local nonce counter and health."""
+
+    def __init__(self, account, kinds=None):
+        self.account = account
+        self.address = account.address
+        self.kinds = set(kinds) if kinds is not None else None  # None: any kind
+        self.last_nonce = None
+        self.in_flight = 0
+        self.balance = None
+        self.lock = threading.Lock()
+
+    def can(self, kind):
+        return self.kinds is None or kind in self.kinds
+
+    def stats(self, min_balance):
+        return {
+            "address": self.address,
+            "in_flight": self.in_flight,
+            "last_nonce": self.last_nonce,
+            "balance": self.balance,
+            "low_balance": self.balance is not None and self.balance < min_balance,
+            "kinds": sorted(self.kinds) if self.kinds is not None else "all",
+        }
+
+
+class SignerPool:
+    """
+    Signers for one network. ``acquire(kind)`` picks the least busy eligible
+    signer; pair it with ``release``. Nonces come from ``nonce_for``.
+
+    :param journaled_nonce: ``journaled_nonce(address)`` -> next nonce recorded in a shared journal, or None
+    :param lock_for: ``lock_for(address)`` -> context manager held across processes while a nonce is used
+    """
+
+    def __init__(self, w3, accounts, min_balance=DEFAULT_MIN_BALANCE, journaled_nonce=None, lock_for=None):
+        if not accounts:
+            raise ValueError("SignerPool needs at least one account")
+        self.w3 = w3
+        self.min_balance = min_balance
+        self._journaled_nonce = journaled_nonce
+        self._lock_for = lock_for
+        # The first account is the primary signer and is not restricted
+        self.signers = [Signer(accounts[0])] + [Signer(a, POOL_KINDS) for a in accounts[1:]]
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self):
+        return self.signers[0]
+
+    def _funded(self, signer):
+        return signer.balance is None or signer.balance >= self.min_balance
+
+    def acquire(self, kind):
+        with self._lock:
+            eligible = [s for s in self.signers if s.can(kind)]
+            if not eligible:
+                raise RuntimeError(f"No signer may send {kind} transactions")
+            funded = [s for s in eligible if self._funded(s)] or eligible
+            signer = min(funded, key=lambda s: s.in_flight)
+            signer.in_flight += 1
+            return signer
+
+    def release(self, signer):
+        with self._lock:
+            signer.in_flight -= 1
+
+    @contextmanager
+    def nonce_for(self, signer):
+        """
+        Yield the next free nonce for ``signer`` while holding its send lock.
+        Sign *and* broadcast (or journal) inside the block, so whoever takes the
+        lock next sees the nonce as used.
+        """
+        with signer.lock, (self._lock_for(signer.address) if self._lock_for else nullcontext()):
+            nonce = self.w3.eth.get_transaction_count(signer.address, "pending")
+            if self._journaled_nonce is not None:
+                journaled = self._journaled_nonce(signer.address)
+                if journaled is not None:
+                    nonce = max(nonce, journaled)
+            signer.last_nonce = nonce
+            yield nonce
+
+    def disallow(self, signer, kind):
+        """Stop using a signer for ``kind`` (e.g. it is not an authorized attester)."""
+        with self._lock:
+            if signer.kinds is None:
+                signer.kinds = set(POOL_KINDS + ("init",))
+            signer.kinds.discard(kind)
+        print(f"[signers] {signer.address} can no longer send {kind} transactions")
+
+    def account_for(self, address):
+        for signer in self.signers:
+            if signer.address == address:
+                return signer.account
+        return None
+
+    def refresh_balances(self):
+        """Read every signer's balance in one batch and warn about low ones."""
+        with RpcBatch(self.w3) as batch:
+            pending = [(s, batch.balance(s.address)) for s in self.signers]
+        for signer, balance in pending:
+            if balance.error is not None:
+                continue
+            was_funded = self._funded(signer)
+            signer.balance = balance.value
+            if was_funded and not self._funded(signer):
+                print(f"[signers] {signer.address} is low on gas ({Web3.from_wei(signer.balance, 'ether')} ETH), skipping it")
+        return {s.address: s.balance for s in self.signers}
+
+    def stats(self):
+        return [s.stats(self.min_balance) for s in self.signers]
@@ -0,0 +1,44 @@
+"""
+Single-flight deduplication for concurrent identical async lookups.
+
+When many callers ask for the same key at once (e.g. a burst of status
+requests and webhooks for one popular escrow), only the first starts the
+underlying coroutine; the rest await the same in-flight task and share its
+result or exception. Nothing is cached once the task finishes - the next
+caller starts a fresh computation.
+"""
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one shared task."""
+
+    def __init__(self):
+        self._inflight = {}
+        self.started = 0
+        self.shared = 0
+
+    async def do(self, key, fn, *args, **kwargs):
+        """
+        Await ``fn(*args, **kwargs)``, or the already running call for ``key``.
+
+        Callers should treat the result as read-only, since every waiter
+        receives the same object.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.started += 1
+        else:
+            self.shared += 1
+        # Shielded so one caller disconnecting does not cancel the shared work
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self):
+        return {"in_flight": len(self._inflight), "started": self.started, "shared": self.shared}
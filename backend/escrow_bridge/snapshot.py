@@ -0,0 +1,144 @@
+"""
+Contract configuration snapshots.
+
+All EscrowBridge parameters the API needs (fee, maxEscrowTime, token, exchange
+rate, ...) are loaded in one Multicall3 round trip per network and published
+as an immutable object. Readers just grab the current reference, so request
+handlers never block on RPC or locks; refreshes swap the reference atomically.
+"""
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Optional
+
+from escrow_bridge.config import ZERO_ADDRESS
+from escrow_bridge.core import erc20_abi
+from escrow_bridge.multicall import aggregate, multicall_contract
+
+# Events that change values held in a snapshot
+CONFIG_EVENTS = ("ExchangeRateUpdated", "FeeRecipientUpdated")
+
+
+@dataclass(frozen=True)
+class ContractSnapshot:
+    """Point-in-time view of an EscrowBridge deployment's configuration."""
+    network: str
+    address: str
+    chain_id: int
+    recipient_email: str
+    token_address: str
+    token_decimals: int
+    symbol: str
+    max_escrow_time: int
+    fee: int
+    fee_denominator: int
+    exchange_rate: float
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def fee_pct(self) -> str:
+        return f"{self.fee / self.fee_denominator * 100:.2f}%"
+
+    def exchange_rate_entry(self) -> dict:
+        """Shape used by the /exchange_rates endpoint."""
+        return {
+            "chain_id": self.chain_id,
+            "rate": self.exchange_rate,
+            "token": {
+                "address": self.token_address,
+                "decimals": self.token_decimals,
+                "symbol": self.symbol
+            }
+        }
+
+
+def load_snapshot(w3, bridge, network, previous: Optional[ContractSnapshot] = None) -> ContractSnapshot:
+    """
+    Read every configuration value for ``bridge`` in one aggregated call.
+
+    ``usdcToken`` and the token's ``decimals`` are immutable, so once a
+    previous snapshot is known they are reused instead of re-read.
+    """
+    fns = bridge.functions
+    calls = [
+        fns.recipientEmail(),
+        fns.maxEscrowTime(),
+        fns.fee(),
+        fns.FEE_DENOMINATOR(),
+        fns.getExchangeRate(),
+        multicall_contract(w3).functions.getChainId(),
+    ]
+    if previous is None:
+        calls.append(fns.usdcToken())
+
+    results = aggregate(w3, calls)
+    recipient_email, max_escrow_time, fee, fee_denominator, raw_rate, chain_id = results[:6]
+
+    if previous is not None:
+        token_address, token_decimals, symbol = previous.token_address, previous.token_decimals, previous.symbol
+    else:
+        token_address = results[6]
+        token_decimals = None
+        if token_address:
+            erc20 = w3.eth.contract(address=token_address, abi=erc20_abi)
+            token_decimals = aggregate(w3, [erc20.functions.decimals()])[0]
+        if token_address and token_decimals is not None:
+            symbol = "USDC"
+        else:
+            # Native-token bridge (no ERC20 behind it)
+            token_address, token_decimals, symbol = ZERO_ADDRESS, 18, "BDAG"
+
+    if chain_id is None:
+        chain_id = previous.chain_id if previous else w3.eth.chain_id
+
+    def pick(value, attr, default):
+        if value is not None:
+            return value
+        return getattr(previous, attr) if previous else default
+
+    return ContractSnapshot(
+        network=network,
+        address=bridge.address,
+        chain_id=chain_id,
+        recipient_email=pick(recipient_email, "recipient_email", ""),
+        token_address=token_address,
+        token_decimals=token_decimals,
+        symbol=symbol,
+        max_escrow_time=pick(max_escrow_time, "max_escrow_time", 3600),
+        fee=pick(fee, "fee", 100),
+        fee_denominator=pick(fee_denominator, "fee_denominator", 10000),
+        exchange_rate=raw_rate / 1e6 if raw_rate is not None else pick(None, "exchange_rate", 0.0),
+    )
+
+
+class SnapshotStore:
+    """
+    Holds the latest ContractSnapshot per network.
+
+    ``get`` is lock-free; ``refresh`` serializes writers so concurrent triggers
+    (timer + event) don't issue duplicate RPC work.
+    """
+
+    def __init__(self):
+        self._snapshots = {}
+        self._refresh_lock = Lock()
+
+    def get(self, network) -> Optional[ContractSnapshot]:
+        return self._snapshots.get(network)
+
+    def all(self) -> dict:
+        return dict(self._snapshots)
+
+    def refresh(self, network, w3, bridge) -> Optional[ContractSnapshot]:
+        with self._refresh_lock:
+            try:
+                snap = load_snapshot(w3, bridge, network, previous=self._snapshots.get(network))
+            except Exception as e:
+                print(f"[snapshot] Failed to refresh {network}: {e}")
+                return self._snapshots.get(network)
+            # Copy-on-write so readers never see a partially updated mapping
+            snapshots = dict(self._snapshots)
+            snapshots[network] = snap
+            self._snapshots = snapshots
+            print(f"[snapshot] {network}: maxEscrowTime={snap.max_escrow_time}s, fee={snap.fee_pct}, rate={snap.exchange_rate}")
+            return snap
@@ -0,0 +1,108 @@
+"""
+In-process event bus for escrow lifecycle transitions.
+
+The listener publishes ``initialized``, ``finalized``, ``settled`` and
+``expired`` events as it sees them; each SSE client holds a ``Subscription``
+that receives the events for the escrow ids it asked for (or all of them).
+Publishing never blocks: a subscriber that falls behind loses its oldest
+events and is told so via ``dropped``.
+"""
+import asyncio
+import itertools
+import json
+import time
+
+from escrow_bridge.resolver import to_escrow_key
+
+LIFECYCLE_EVENTS = ("initialized", "finalized", "settled", "expired")
+TERMINAL_EVENTS = ("settled", "expired")
+
+DEFAULT_QUEUE_SIZE = 1000
+
+
+def normalize_escrow_id(escrow_id):
+    """Canonical ``0x``-prefixed lowercase hex form used in stream payloads."""
+    return "0x" + to_escrow_key(escrow_id).hex()
+
+
+class Subscription:
+    """One consumer's view of the bus, optionally filtered to a set of escrow ids."""
+
+    def __init__(self, bus, escrow_ids=None, queue_size=DEFAULT_QUEUE_SIZE):
+        self._bus = bus
+        self.escrow_ids = {normalize_escrow_id(i) for i in escrow_ids} if escrow_ids else None
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def wants(self, escrow_id):
+        return self.escrow_ids is None or escrow_id in self.escrow_ids
+
+    def _offer(self, message):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Next event, or None if ``timeout`` seconds pass first."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self._bus._subscribers.discard(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class EventBus:
+    """
+    Fan-out of lifecycle events to subscribers.
+
+    ``publish`` must be called from the event loop thread (the listener loops
+    run there); worker threads should use ``loop.call_soon_threadsafe``.
+    """
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
+        self._subscribers = set()
+        self._queue_size = queue_size
+        self._ids = itertools.count(1)
+
+    def subscribe(self, escrow_ids=None):
+        sub = Subscription(self, escrow_ids, self._queue_size)
+        self._subscribers.add(sub)
+        return sub
+
+    def publish(self, event, escrow_id, network=None, **fields):
+        escrow_id = normalize_escrow_id(escrow_id)
+        message = {
+            "id": next(self._ids),
+            "event": event,
+            "escrowId": escrow_id,
+            "network": network,
+            "timestamp": int(time.time()),
+            **fields,
+        }
+        for sub in list(self._subscribers):
+            if sub.wants(escrow_id):
+                sub._offer(message)
+        return message
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+def format_sse(message, event=None):
+    """Encode a message as one Server-Sent Events frame."""
+    lines = []
+    if "id" in message:
+        lines.append(f"id: {message['id']}")
+    lines.append(f"event: {event or message.get('event', 'message')}")
+    lines.append(f"data: {json.dumps(message)}")
+    return "\n".join(lines) + "\n\n"
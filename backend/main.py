@@ -1,19 +1,37 @@
 from email.mime import base
 from web3 import Web3
+from web3.exceptions import ContractLogicError
 import threading, queue
 import time
 import os
 import json
 from dotenv import load_dotenv
-from diskcache import Cache
 import httpx
-from escrow_bridge import network_func, get_payment, get_exchange_rate, SUPPORTED_NETWORKS, ZERO_ADDRESS
-from escrow_bridge.db import SettledEvent, APIKey, init_db, get_session
+from escrow_bridge import make_web3, get_payment, payment_to_dict, get_exchange_rate, SUPPORTED_NETWORKS, ZERO_ADDRESS
+from escrow_bridge.config import SERVER_ROLES
+from escrow_bridge.snapshot import SnapshotStore, CONFIG_EVENTS
+from escrow_bridge.abi_bundle import get_bridge_config, get_deployment, get_topic
+from escrow_bridge.contracts import ContractRegistry
+from escrow_bridge.resolver import EscrowResolver, to_escrow_key
+from escrow_bridge.singleflight import SingleFlight
+from escrow_bridge.streams import EventBus, format_sse
+from escrow_bridge.scheduler import DeadlineQueue
+from escrow_bridge.outbox import Outbox
+from escrow_bridge.fees import FeePolicy, DEFAULT_FALLBACK_BASE_FEE
+from escrow_bridge.signers import SignerPool, load_signer_keys
+from escrow_bridge.batching import coalescer_for
+from escrow_bridge.middleware import block_cache_for
+from escrow_bridge.multicall import aggregate, array_length_is, read_array
+from escrow_bridge.pending import PendingIndex
+from escrow_bridge.reconcile import ArrayReconciler, deployment_block, logs_for_ids
+from escrow_bridge.escrows import record_escrow_events, settle_latency, expiry_ratio, hourly_throughput
+from escrow_bridge.backfill import block_timestamps, save_settled_events
+from escrow_bridge.db import SettledEvent, TerminalPayment, APIKey, LeaseManager, advisory_lock, init_db, get_session
 from threading import Thread, Lock
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import asyncio
 from contextlib import asynccontextmanager
 from Crypto.Hash import keccak
@@ -22,12 +40,11 @@ from apscheduler.schedulers.background import BackgroundScheduler
 import json
 import base64
 import hashlib
-import pandas as pd
-from chartengineer import ChartMaker
-from plotly.utils import PlotlyJSONEncoder
 from pydantic import BaseModel
 import secrets
-from typing import Optional
+from typing import Optional, List
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_, func
 import requests
 
 load_dotenv()
@@ -36,19 +53,102 @@ def generate_salt():
     """Generate a random bytes32 salt as hex string."""
     return secrets.token_hex(32)
 
-cache = Cache("cache")
+# escrow id -> network, populated from PaymentInitialized logs
+escrow_index = EscrowResolver("escrow_index")
+
+# Shared in-flight lookups, keyed by (kind, escrow id)
+flights = SingleFlight()
+
+# Lifecycle events from the listener, fanned out to /status/stream clients
+event_bus = EventBus()
+STREAM_KEEPALIVE = 15  # seconds between SSE comment frames
+
+# Settled/expired escrow records never change
+TERMINAL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Seconds between batched isFinalized checks of all pending escrows
+FINALITY_POLL_INTERVAL = 5
+# Registry Status.Confirmed: settlePayment reverts ("Not confirmed") for any other finalized status
+SETTLEMENT_CONFIRMED = 3
+# Escrows whose settlement reverted; they are left to the expiry path instead of being re-sent
+unsettleable = set()
+
+# Pending escrows ordered by createdAt + maxEscrowTime; drives expiry and settlement priority
+deadlines = DeadlineQueue()
+# expireEscrow needs block.timestamp > deadline; wait about one block past it
+EXPIRY_GRACE = 2
+# Don't start a settlement with less time than this left: it would land after expiry
+SETTLE_MIN_LEAD = int(os.getenv("SETTLE_MIN_LEAD", "20"))
+
+# Only the process holding an escrow's shard lease sends its settle/expire
+# transactions; every replica must use the same SETTLER_SHARDS
+SETTLER_SHARDS = int(os.getenv("SETTLER_SHARDS", "1"))
+leases = LeaseManager("settler", shards=SETTLER_SHARDS)
+
+# Journal of sent transactions, so a restart confirms in-flight sends instead of repeating them
+outbox = Outbox()
+
+# Tip, replacement bumps and fee cap for every transaction the server sends
+fee_policy = FeePolicy.from_env()
+
+# Upper bound on ids per /status/batch or /escrow_info/batch request
+MAX_BATCH_IDS = int(os.getenv("MAX_BATCH_IDS", "200"))
+
+# Which background work this process runs (see SERVER_ROLES); every role serves HTTP.
+# The log tail runs in every role to keep caches and /status/stream current.
+ROLE = os.getenv("ESCROW_BRIDGE_ROLE", "all")
+if ROLE not in SERVER_ROLES:
+    raise ValueError(f"ESCROW_BRIDGE_ROLE must be one of {', '.join(SERVER_ROLES)}, got {ROLE!r}")
+
+def has_role(role):
+    return ROLE in ("all", role)
+
+# Readiness: the app is live as soon as it is imported, ready once chain state is warm
+readiness = {
+    "database": False,
+    "snapshots": False,
+    "pending_ids": False,
+}
+background_tasks = []
+
+def is_ready():
+    return readiness["snapshots"]
+
+async def warm_up():
+    """Load chain state off the event loop, then start the background loops."""
+    readiness["database"] = await asyncio.to_thread(init_events_table)
+
+    while not readiness["snapshots"]:
+        await asyncio.to_thread(refresh_snapshots)
+        readiness["snapshots"] = all(snapshots.get(net) for net in SUPPORTED_NETWORKS)
+        if not readiness["snapshots"]:
+            print("[startup] Contract snapshot unavailable, retrying in 5s")
+            await asyncio.sleep(5)
+
+    readiness["pending_ids"] = await asyncio.to_thread(update_pending_contract_ids)
+
+    background_tasks.append(asyncio.create_task(main_log_loop()))
+    if has_role("settler"):
+        await asyncio.to_thread(refresh_signer_balances)
+        await asyncio.to_thread(leases.renew)
+        background_tasks.append(asyncio.create_task(resume_outbox()))
+        background_tasks.append(asyncio.create_task(sweep_outbox()))
+        background_tasks.append(asyncio.create_task(leases.run()))
+        background_tasks.append(asyncio.create_task(run_escrow_scheduler()))
+    print(f"[startup] Chain state warm, background loops started (role: {ROLE})")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup event
-    asyncio.create_task(main_log_loop())
-    asyncio.create_task(poll_pending_settlements_async())
-    asyncio.create_task(poll_and_expire_escrows(interval=60*5))  # every 5 minutes
-    update_exchange_rates()
-    init_events_table()
-    update_pending_contract_ids()
+    # Startup event: nothing here blocks on the RPC
+    start_scheduler()
+    if has_role("listener"):
+        threading.Thread(target=escrow_worker, daemon=True).start()
+    background_tasks.append(asyncio.create_task(warm_up()))
     yield
-    # Shutdown event (if needed)
+    # Shutdown event
+    for task in background_tasks:
+        task.cancel()
+    scheduler.shutdown(wait=False)
 
 app = FastAPI(
     title="Escrow Bridge Listener API",
@@ -79,6 +179,9 @@ class RequestPaymentPayload(BaseModel):
     receiver: str
     network: str = "base-sepolia"  # default network
 
+class EscrowIdsPayload(BaseModel):
+    escrowIds: List[str]
+
 class APIKeyCreateRequest(BaseModel):
     name: str  # User-friendly name for the key
 
@@ -96,50 +199,8 @@ class APIKeyGenerateResponse(BaseModel):
 active_threads = set()
 lock = Lock()
 
-# Load ABI and config
-
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# Using EscrowBridge (USDC version) for Base
-escrow_bridge_artifact_path = os.path.join(BASE_DIR, "..", "contracts", "out", "EscrowBridge.sol", "EscrowBridge.json")
-native_bridge_artifact_path = os.path.join(BASE_DIR, "..", "contracts", "out", "EscrowBridgeETH.sol", "EscrowBridgeETH.json")
-
-bdag_address_path = os.path.join(BASE_DIR, "..", "contracts", "deployments", "blockdag-escrow-bridge.json")
-base_address_path = os.path.join(BASE_DIR, "..", "contracts", "deployments", "base-escrow-bridge.json")
-
-print(f'Loading ABI from {escrow_bridge_artifact_path}')
-
-# Load EscrowBridge ABI (USDC version)
-with open(escrow_bridge_artifact_path, 'r') as f:
-    escrow_bridge_abi = json.load(f)['abi']
-
-with open(native_bridge_artifact_path, 'r') as f:
-    native_bridge_abi = json.load(f)['abi']
-
-with open(base_address_path, 'r') as f:
-    ESCROW_BRIDGE_ADDRESS_BASE = json.load(f)['deployedTo']
-
-with open(bdag_address_path, 'r') as f:
-    ESCROW_BRIDGE_ADDRESS_BDAG = json.load(f)['deployedTo']
-
-erc20_abi_path = os.path.join(BASE_DIR, 'abi', 'erc20Abi.json')
-with open(erc20_abi_path, 'r') as f:
-    erc20_abi = json.load(f)
-
-CONFIG_PATH = os.path.join(BASE_DIR, 'chainsettle_config.json')
-with open(CONFIG_PATH, 'r') as f:
-    config = json.load(f)
-
-# EscrowBridge (USDC) on BlockDAG Testnet
-escrow_bridge_config = {
-    # "blockdag-testnet": {
-    #     "address": ESCROW_BRIDGE_ADDRESS_BDAG,
-    #     "abi": native_bridge_abi
-    # },
-    "base-sepolia": {
-        "address": ESCROW_BRIDGE_ADDRESS_BASE,
-        "abi": escrow_bridge_abi
-    }
-}
+# Contract ABIs and addresses come from the compact ABI bundle (see escrow_bridge.abi_bundle),
+# loaded on first use rather than at import
 
 event_queue = queue.Queue()
 
@@ -152,31 +213,78 @@ assert PRIVATE_KEY, "No EVM_PRIVATE_KEY in env"
 
 assert ADMIN_KEY, "No ADMIN_KEY in env"
 
-base_w3, base_account = network_func(
-    network='base-sepolia',
-)
+# Web3 clients are built on first use; constructing them performs no network I/O
+_chains = {}
+_chains_lock = Lock()
+
+def get_chain(network):
+    """Return (w3, account) for a network, creating the client lazily."""
+    chain = _chains.get(network)
+    if chain is None:
+        with _chains_lock:
+            chain = _chains.get(network)
+            if chain is None:
+                chain = make_web3(network)
+                _chains[network] = chain
+    return chain
+
+def _journaled_nonce(network, address):
+    try:
+        return outbox.next_nonce(network, address)
+    except Exception as e:
+        print(f"[signers] Could not read journaled nonces for {address}: {e}")
+        return None
+
+# Settlement/expiry signers (EVM_PRIVATE_KEY plus EVM_PRIVATE_KEYS), one pool per network.
+# Nonces are assigned under a per-key advisory lock from the node's pending count and
+# the shared outbox journal, so API replicas and settlers can share keys safely.
+SIGNER_MIN_BALANCE = Web3.to_wei(float(os.getenv("SIGNER_MIN_BALANCE_ETH", "0.0005")), "ether")
+_signer_pools = {}
+
+def get_signer_pool(network):
+    pool = _signer_pools.get(network)
+    if pool is None:
+        w3, _ = get_chain(network)
+        with _chains_lock:
+            pool = _signer_pools.get(network)
+            if pool is None:
+                accounts = [w3.eth.account.from_key(key) for key in load_signer_keys()]
+                pool = SignerPool(
+                    w3, accounts, min_balance=SIGNER_MIN_BALANCE,
+                    journaled_nonce=lambda address, network=network: _journaled_nonce(network, address),
+                    lock_for=lambda address, network=network: advisory_lock(f"nonce:{network}:{address}"),
+                )
+                _signer_pools[network] = pool
+    return pool
 
-base_contract = base_w3.eth.contract(address=ESCROW_BRIDGE_ADDRESS_BASE, abi=escrow_bridge_abi)
-# Initialize contract parameters with defaults (will be updated on first successful call)
-max_escrow_time = 3600  # Default 1 hour
-fee = 100  # Default 1%
-FEE_DENOMINATOR = 10000
-fee_pct = "1.00%"
-recipient_email = base_contract.functions.recipientEmail().call()
-usdc_address = base_contract.functions.usdcToken().call()
-
-erc20 = base_w3.eth.contract(address=usdc_address, abi=erc20_abi)
-token_decimals = erc20.functions.decimals().call()
-
-# Try to fetch actual values from contract
-try:
-    max_escrow_time = base_contract.functions.maxEscrowTime().call()
-    fee = base_contract.functions.fee().call()
-    FEE_DENOMINATOR = base_contract.functions.FEE_DENOMINATOR().call()
-    fee_pct = f"{fee / FEE_DENOMINATOR * 100:.2f}%"
-    print(f"Contract parameters loaded: maxEscrowTime={max_escrow_time}s, fee={fee_pct}")
-except Exception as e:
-    print(f"Warning: Could not fetch contract parameters, using defaults: {e}")
+def refresh_signer_balances():
+    for net in SUPPORTED_NETWORKS:
+        try:
+            get_signer_pool(net).refresh_balances()
+        except Exception as e:
+            print(f"[signers] Balance check failed on {net}: {e}")
+
+# Contract objects are built once per (network, address) and shared by all callers
+contracts = ContractRegistry(lambda network: get_chain(network)[0])
+
+def get_snapshot(network):
+    """Current contract snapshot for a network, or 503 while still warming up."""
+    snap = snapshots.get(network)
+    if snap is None:
+        raise HTTPException(status_code=503, detail="Service is starting up, contract state not loaded yet")
+    return snap
+
+# Contract parameters (recipientEmail, usdcToken, decimals, maxEscrowTime, fee, ...)
+# are read in one multicall per network and refreshed on config events / timer
+snapshots = SnapshotStore()
+
+def refresh_snapshot(network):
+    w3, account = get_chain(network)
+    return snapshots.refresh(network, w3, contracts.bridge(network))
+
+def refresh_snapshots():
+    for net in SUPPORTED_NETWORKS:
+        refresh_snapshot(net)
 
 webhook_db_path = "webhooks.db"
 pending_ids = set()
@@ -242,67 +350,20 @@ async def require_api_key(
 
 def escrow_worker():
     while True:
-        event = event_queue.get()  # blocks until new event
+        handler, args = event_queue.get()  # blocks until new event
         try:
-            add_event(event)  # existing function
+            handler(*args)
         except Exception as e:
             print("Escrow worker error:", e)
         finally:
             event_queue.task_done()
 
-threading.Thread(target=escrow_worker, daemon=True).start()
-
-async def poll_and_expire_escrows(interval=60):
-    while True:
-        for net in SUPPORTED_NETWORKS:
-            w3, account = base_w3, base_account
-
-            contract_address = escrow_bridge_config[net]['address']
-            abi = escrow_bridge_config[net]['abi']
-            contract = w3.eth.contract(address=contract_address, abi=abi)
-
-            pending = contract.functions.getPendingEscrows().call()
-
-            for escrow_id in pending:
-                payment = contract.functions.payments(escrow_id).call()
-                created_at = payment[8]  # Payment.createdAt
-                if time.time() > created_at + max_escrow_time:
-                    try:
-                        base_tx = contract.functions.expireEscrow(escrow_id).build_transaction({
-                            'from': account.address,
-                            'nonce': w3.eth.get_transaction_count(account.address, 'pending'),
-                        })
-                        try:
-                            gas_est = w3.eth.estimate_gas(base_tx)
-                        except Exception as e:
-                            gas_est = 200000
-                            print("❌ Error estimating gas:", e)
-
-                        latest_block = w3.eth.get_block("latest")
-                        base_fee = latest_block.get("baseFeePerGas", w3.to_wei(15, "gwei"))
-                        priority_fee = w3.to_wei(2, "gwei")
-                        max_fee = base_fee + priority_fee
-
-                        base_tx.update({
-                            "gas": int(gas_est * 2),
-                            "maxPriorityFeePerGas": priority_fee,
-                            "maxFeePerGas": max_fee,
-                            "type": 2
-                        })
-
-                        signed_tx = account.sign_transaction(base_tx)
-                        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-
-                        if receipt.status == 1:
-                            print(f"✅ Escrow expired: {tx_hash.hex()}")
-                        else:
-                            print(f"❌ Transaction failed: {tx_hash.hex()}")
-                    except Exception as e:
-                        print(f"❌ Failed to expire {escrow_id.hex()}: {e}")
-        await asyncio.sleep(interval)
-
 def create_charts():
+    # Analytics stack is heavy; only pay for it when a chart is requested
+    import pandas as pd
+    from chartengineer import ChartMaker
+    from plotly.utils import PlotlyJSONEncoder
+
     df = events_to_df()
     if df.empty:
         print("No settled events yet; returning empty charts")
@@ -336,8 +397,10 @@ def init_events_table():
     try:
         init_db()
         print('[OK] Database initialized')
+        return True
     except Exception as e:
         print(f'[WARNING] Database initialization failed: {e}')
+        return False
 
 def add_event(event):
     """Track PaymentSettled events for volume analytics."""
@@ -380,8 +443,154 @@ def add_event(event):
         if session:
             session.close()
 
+def save_terminal_payment(escrow_id, network, outcome, payment, tx_hash=None, block_number=None):
+    """
+    Store a terminal escrow's final Payment struct (no-op if already stored).
+    Returns True if the row exists afterwards.
+    """
+    session = None
+    try:
+        session = get_session()
+        if session.query(TerminalPayment).filter_by(escrow_id=escrow_id).first():
+            return True
+        session.add(TerminalPayment.from_payment(escrow_id, network, outcome, payment, tx_hash, block_number))
+        session.commit()
+        print(f"[terminal] Stored {outcome} escrow {escrow_id[:16]}...")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Failed to store terminal payment: {e}")
+        if session:
+            session.rollback()
+        return False
+    finally:
+        if session:
+            session.close()
+
+def record_escrow_event(event, network):
+    """Apply a lifecycle log to the escrows table, dated by its block timestamp."""
+    try:
+        w3, _ = get_chain(network)
+        timestamp = w3.eth.get_block(event['blockNumber'])['timestamp']
+        record_escrow_events(network, [event], {event['blockNumber']: timestamp})
+    except Exception as e:
+        print(f"[escrows] Could not record {event['event']} for {event['args']['escrowId'].hex()[:16]}...: {e}")
+
+def record_terminal_payment(event, network, outcome):
+    """
+    Read a terminal escrow's Payment struct and store it; returns True if the
+    row is stored. A settled/expired struct never changes, so it is read at
+    latest (no archive state needed for old logs), and as of the event's block
+    only if the node doesn't show it as terminal yet.
+    """
+    escrow_id_bytes = event['args']['escrowId']
+    bridge = contracts.bridge(network)
+    payment = get_payment(escrow_id_bytes, bridge)
+    if payment is None or not payment["isSettled"]:
+        payment = get_payment(escrow_id_bytes, bridge, block_identifier=event['blockNumber'])
+    if payment is None:
+        print(f"[terminal] Could not read {outcome} escrow {escrow_id_bytes.hex()[:16]}...")
+        return False
+    return save_terminal_payment(escrow_id_bytes.hex(), network, outcome, payment,
+                                 tx_hash=event['transactionHash'].hex(), block_number=event['blockNumber'])
+
+def get_terminal_payments(escrow_ids):
+    """Stored Payment dicts for many escrows in one query: {escrow_id: payment}."""
+    if not escrow_ids:
+        return {}
+    session = None
+    try:
+        session = get_session()
+        records = session.query(TerminalPayment).filter(TerminalPayment.escrow_id.in_(escrow_ids)).all()
+        return {record.escrow_id: record.to_payment() for record in records}
+    except Exception as e:
+        print(f"[terminal] Batch lookup failed: {e}")
+        return {}
+    finally:
+        if session:
+            session.close()
+
+def get_terminal_payment(escrow_id):
+    """Stored Payment dict for a settled/expired escrow, or None (also on DB errors)."""
+    session = None
+    try:
+        session = get_session()
+        record = session.query(TerminalPayment).filter_by(escrow_id=escrow_id).first()
+        return record.to_payment() if record else None
+    except Exception as e:
+        print(f"[terminal] Lookup failed: {e}")
+        return None
+    finally:
+        if session:
+            session.close()
+
+EVENTS_PAGE_MAX = 1000
+
+def encode_events_cursor(event):
+    """Opaque keyset cursor: the (settled_at, id) of the last event on a page."""
+    raw = f"{event.settled_at.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_events_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        settled_at, event_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(settled_at), int(event_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def page_settled_events(limit=100, cursor=None, since=None, network=None, payer=None, start=None, end=None):
+    """
+    One page of settled events, never more than ``limit`` rows in memory.
+
+    Without ``since``: newest first, keyset-paginated on (settled_at, id) with
+    ``cursor``. With ``since`` (an event id): only rows stored after it, oldest
+    first, for polling. ``latest_id`` is the id to pass as ``since`` next time.
+    """
+    session = get_session()
+    try:
+        query = session.query(SettledEvent)
+        if network is not None:
+            query = query.filter(SettledEvent.network == network)
+        if payer is not None:
+            query = query.filter(SettledEvent.payer == payer)
+        if start is not None:
+            query = query.filter(SettledEvent.settled_at >= start)
+        if end is not None:
+            query = query.filter(SettledEvent.settled_at < end)
+
+        if since is not None:
+            rows = query.filter(SettledEvent.id > since).order_by(SettledEvent.id).limit(limit + 1).all()
+            page = rows[:limit]
+            return {
+                "events": [row.to_dict() for row in page],
+                "latest_id": page[-1].id if page else since,
+                "has_more": len(rows) > limit,
+                "next_cursor": None,
+            }
+
+        # Read before the page so rows stored meanwhile are picked up by ``since``
+        latest_id = session.query(func.max(SettledEvent.id)).scalar() or 0
+        if cursor is not None:
+            settled_at, event_id = decode_events_cursor(cursor)
+            query = query.filter(or_(
+                SettledEvent.settled_at < settled_at,
+                and_(SettledEvent.settled_at == settled_at, SettledEvent.id < event_id),
+            ))
+        rows = query.order_by(SettledEvent.settled_at.desc(), SettledEvent.id.desc()).limit(limit + 1).all()
+        page = rows[:limit]
+        return {
+            "events": [row.to_dict() for row in page],
+            "latest_id": latest_id,
+            "has_more": len(rows) > limit,
+            "next_cursor": encode_events_cursor(page[-1]) if len(rows) > limit else None,
+        }
+    finally:
+        session.close()
+
 def events_to_df():
     """Load settled events as a pandas DataFrame."""
+    import pandas as pd
+
     session = None
     try:
         session = get_session()
@@ -437,172 +646,414 @@ def make_serializable(obj, preserve_base64_keys=None):
     else:
         return obj
     
+PROBE_ATTEMPTS = 3
+
+def _probe_network(net, settlement_id):
+    """
+    Check one network for an escrow id.
+    Returns True if found, False if confirmed absent, None on RPC error.
+    """
+    try:
+        payment = contracts.bridge(net).functions.payments(settlement_id).call()
+    except Exception as call_error:
+        print(f"[find_network] {net}: {call_error}")
+        return None
+    # if escrow was never initialized, payer will be address(0)
+    return payment[0] != ZERO_ADDRESS
+
+def _lookup_index(settlement_id):
+    """
+    Answer from the index alone. Returns (known, (network, contract)); known is
+    False when the id is neither indexed nor negatively cached and must be probed.
+    """
+    try:
+        net = escrow_index.get(settlement_id)
+        if net:
+            return True, (net, contracts.bridge(net))
+        if escrow_index.is_absent(settlement_id):
+            return True, (None, None)
+    except Exception as e:
+        print(f"[find_network] Index lookup failed for {settlement_id}: {e}")
+    return False, (None, None)
+
+def _finish_probe(settlement_id, results):
+    """Record the probe outcome and return (network, contract) or (None, None)."""
+    for net, found in results.items():
+        if found:
+            escrow_index.record(settlement_id, net)
+            return net, contracts.bridge(net)
+    # Only cache a negative answer when every network actually answered
+    if all(found is False for found in results.values()):
+        escrow_index.mark_absent(settlement_id)
+    return None, None
+
 def find_network_for_settlement(settlement_id):
     """
     Look for the network and registry type that contains the given settlement_id.
-    First checks cache, then falls back to RPC calls if not cached.
+    First checks the escrow index (fed by PaymentInitialized logs), then falls
+    back to RPC calls if the id has not been seen yet.
     Returns (network, contract) on success, else (None, None).
-    """
 
-    # --- Try cache first ---
-    try:
-        cached = cache.get(settlement_id)
-        if cached:
-            try:
-                entry = json.loads(cached)
-                lookup = entry.get("lookup", {})
-                net = lookup.get("network")
-                address = lookup.get("address")
-                if net and address:
-                    # print(f"[find_network] Found {settlement_id} in cache → {net}")
-
-                    # Rebuild contract from cached info
-                    w3, account = base_w3, base_account
-
-                    abi = escrow_bridge_config[net]["abi"]
-                    contract = w3.eth.contract(address=address, abi=abi)
-                    return net, contract 
-            except Exception as e:
-                print(f"[find_network] Cache decode error for {settlement_id}: {e}")
-    except Exception as e:
-        print(f"[find_network] Cache lookup failed for {settlement_id}: {e}")
+    Blocking; async handlers should use find_network_for_settlement_async.
+    """
+    known, result = _lookup_index(settlement_id)
+    if known:
+        return result
 
-    # --- Fallback: search on-chain ---
+    results = {}
     for net in SUPPORTED_NETWORKS:
-        w3, account = base_w3, base_account
+        for attempt in range(PROBE_ATTEMPTS):
+            results[net] = _probe_network(net, settlement_id)
+            if results[net] is not None:
+                break  # stop retry loop once the network answered
+            time.sleep(1)
 
-        address = escrow_bridge_config[net]["address"]
-        abi = escrow_bridge_config[net]["abi"]
+    return _finish_probe(settlement_id, results)
 
-        try:
-            contract = w3.eth.contract(address=address, abi=abi)
-        except Exception as e:
-            print(f"[find_network] Error loading contract for {net}: {e}")
-            continue
-
-        for attempt in range(3):
-            try:
-                # print(f"[find_network] Checking {net} (attempt {attempt+1})")
-                payment = contract.functions.payments(settlement_id).call()
-
-                # if escrow was never initialized, payer will be address(0)
-                if payment[0] != "0x0000000000000000000000000000000000000000":
-                    # print(f"[✓] Found settlement {settlement_id} on {net}")
-                    entry = {
-                        "lookup": {
-                            "id_hash": settlement_id,
-                            "network": net,
-                            "address": address,
-                        }
-                    }
-                    cache.set(settlement_id, json.dumps(make_serializable(entry)))
-                    return net, contract
-                break  # stop retry loop if not found
-            except Exception as call_error:
-                print(f"[find_network] {net}: {call_error}")
-                time.sleep(1)
+async def find_network_for_settlement_async(settlement_id):
+    """
+    Non-blocking find_network_for_settlement: unknown ids are probed on all
+    networks in parallel, in worker threads, with async backoff between retries.
+    Concurrent lookups of the same unknown id share one round of probes.
+    """
+    known, result = _lookup_index(settlement_id)
+    if known:
+        return result
 
-    return None, None
+    return await flights.do(("resolve", to_escrow_key(settlement_id)), _probe_networks_async, settlement_id)
 
-def get_all_exchange_rates():
-    struct = {}
-    for network in SUPPORTED_NETWORKS:
-        w3, account = base_w3, base_account
+async def _probe_networks_async(settlement_id):
 
-        address = escrow_bridge_config[network]['address']
-        abi = escrow_bridge_config[network]['abi']
+    async def probe(net):
+        for attempt in range(PROBE_ATTEMPTS):
+            found = await asyncio.to_thread(_probe_network, net, settlement_id)
+            if found is not None:
+                return found
+            await asyncio.sleep(1)
+        return None
 
-        try:
-            contract = w3.eth.contract(address=address, abi=abi)
-        except Exception as e:
-            print(f"[find_network] Error loading contract for {network}: {e}")
+    found = await asyncio.gather(*(probe(net) for net in SUPPORTED_NETWORKS))
+    return _finish_probe(settlement_id, dict(zip(SUPPORTED_NETWORKS, found)))
 
-        if contract:
-            rate = get_exchange_rate(contract)
+def resolve_networks_batch(keys):
+    """
+    Map many escrow ids (32-byte keys) to their network. Indexed ids are answered
+    locally; the rest are probed with one multicall of payments(id) per network.
+    """
+    networks = {}
+    unknown = []
+    for key in keys:
+        known, (net, _) = _lookup_index(key)
+        if known:
+            networks[key] = net
+        else:
+            unknown.append(key)
 
+    if unknown:
+        results = {key: {} for key in unknown}
+        for net in SUPPORTED_NETWORKS:
+            bridge = contracts.bridge(net)
             try:
+                found = aggregate(bridge.w3, [bridge.functions.payments(key) for key in unknown])
+            except Exception as e:
+                print(f"[find_network] {net}: batch probe failed: {e}")
+                found = [None] * len(unknown)
+            for key, payment in zip(unknown, found):
+                results[key][net] = None if payment is None else payment[0] != ZERO_ADDRESS
+        for key in unknown:
+            networks[key], _ = _finish_probe(key, results[key])
+
+    return networks
+
+def _group_by_network(networks):
+    groups = {}
+    for key, net in networks.items():
+        if net:
+            groups.setdefault(net, []).append(key)
+    return groups
+
+STATUS_PENDING = {"status": "pending", "message": "Pending settlement found."}
+STATUS_COMPLETED = {"status": "completed", "message": "Completed settlement found."}
+STATUS_EXPIRED = {"status": "expired", "message": "Expired settlement found."}
+
+def get_statuses_batch(keys):
+    """
+    get_status for many ids. Terminal escrows are answered from the database;
+    the rest with one payments/isSettled multicall per network, so the cost
+    grows with the ids asked for, not with the escrow arrays. A settled escrow
+    with no posted USD expired. Ids whose reads failed get an error rather
+    than "not found".
+    """
+    statuses = {key: {"error": "Settlement not found."} for key in keys}
+    stored = get_terminal_payments([key.hex() for key in keys])
+    live = []
+    for key in keys:
+        payment = stored.get(key.hex())
+        if payment is None:
+            live.append(key)
+        else:
+            statuses[key] = dict(STATUS_COMPLETED if payment["postedAmountUsd"] else STATUS_EXPIRED)
 
-                usdc_address = contract.functions.usdcToken().call()
-                erc20 = w3.eth.contract(address=usdc_address, abi=erc20_abi)
+    for net, net_keys in _group_by_network(resolve_networks_batch(live)).items():
+        bridge = contracts.bridge(net)
+        calls = []
+        for key in net_keys:
+            calls += [bridge.functions.payments(key), bridge.functions.isSettled(key)]
+        try:
+            values = aggregate(bridge.w3, calls)
+        except Exception as e:
+            print(f"[status] {net}: batch read failed: {e}")
+            values = [None] * len(calls)
+        for key, p, is_settled in zip(net_keys, values[0::2], values[1::2]):
+            if p is None or is_settled is None:
+                statuses[key] = {"error": f"Could not read escrow status on {net}."}
+            elif p[0] == ZERO_ADDRESS:
+                continue
+            elif not is_settled:
+                statuses[key] = dict(STATUS_PENDING)
+            else:
+                statuses[key] = dict(STATUS_COMPLETED if p[5] else STATUS_EXPIRED)  # Payment.postedAmountUsd
+    return statuses
 
-                # 4) Query the token’s decimals() (USDC is normally 6, but let’s be safe)
-                token_decimals = erc20.functions.decimals().call()
-                symbol = "USDC"
-                token_address = usdc_address
-            except Exception as e:
-                # print("❌ Error fetching token details:", e)
-                token_decimals = 18
-                symbol = "BDAG"
-                token_address = ZERO_ADDRESS
-
-            struct[network] = {
-                "chain_id": w3.eth.chain_id,
-                "rate": rate,
-                "token": {
-                    "address": token_address,
-                    "decimals": token_decimals,
-                    "symbol": symbol
-                }
-            }
+def get_escrow_infos_batch(keys):
+    """
+    load_escrow_info for many ids: terminal records come from the database in
+    one query, the rest from one payments/isSettled multicall per network.
+    Returns {key: payment or None}.
+    """
+    stored = get_terminal_payments([key.hex() for key in keys])
+    infos = {key: None for key in keys}
+    live = []
+    for key in keys:
+        if key.hex() in stored:
+            infos[key] = humanize_payment(stored[key.hex()])
+        else:
+            live.append(key)
+
+    for net, net_keys in _group_by_network(resolve_networks_batch(live)).items():
+        bridge = contracts.bridge(net)
+        calls = []
+        for key in net_keys:
+            calls += [bridge.functions.payments(key), bridge.functions.isSettled(key)]
+        values = aggregate(bridge.w3, calls)
+        for i, key in enumerate(net_keys):
+            p, is_settled = values[2 * i], values[2 * i + 1]
+            if p is None:
+                continue
+            data = payment_to_dict(p, bool(is_settled))
+            if data["isSettled"]:
+                outcome = "settled" if data["postedAmountUsd"] else "expired"
+                save_terminal_payment(key.hex(), net, outcome, data)
+            infos[key] = humanize_payment(data)
+    return infos
+
+def _parse_batch_ids(payload):
+    """Validate a batch payload; returns (ids as given, 32-byte keys) with duplicates dropped."""
+    if not payload.escrowIds:
+        raise HTTPException(status_code=400, detail="escrowIds must not be empty")
+    if len(payload.escrowIds) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} escrowIds per request")
+    ids, keys = [], []
+    for escrow_id in dict.fromkeys(payload.escrowIds):
+        try:
+            keys.append(to_escrow_key(escrow_id))
+        except Exception:
+            raise HTTPException(status_code=400, detail=f"Invalid escrowId: {escrow_id}")
+        ids.append(escrow_id)
+    return ids, keys
+
+def get_all_exchange_rates():
+    struct = {}
+    for network, snap in snapshots.all().items():
+        struct[network] = snap.exchange_rate_entry()
 
     return {"exchange_rate": struct}
 
-cached_exchange_rates = {}  # global cache
-cached_pending_contract_ids = {}
+# Pending escrow ids per network, maintained from logs (see escrow_bridge.pending)
+pending_index = PendingIndex()
+PENDING_CHECK_INTERVAL = 60  # seconds between on-chain length checks of the pending set
+
+def sync_pending_ids(network, block_identifier="latest"):
+    """Rebuild a network's pending set by paging the contract's pendingEscrows(i) getter."""
+    bridge = contracts.bridge(network)
+    ids = read_array(bridge.w3, bridge.functions.pendingEscrows, block_identifier=block_identifier)
+    pending_index.replace(network, [escrow_id.hex() for escrow_id in ids])
+    print(f"[cache] Synced pending escrows on {network}: {len(ids)} items")
+    if has_role("settler"):
+        for escrow_id in ids:
+            escrow_index.record(escrow_id, network)
+            pending_ids.add(escrow_id.hex())
 
-def update_exchange_rates():
-    global cached_exchange_rates
+def update_pending_contract_ids():
+    """Full pending-set read for every network (startup only; the listener keeps it current)."""
     try:
-        cached_exchange_rates = get_all_exchange_rates()
-        print("✅ Updated exchange rates:", cached_exchange_rates)
+        for net in SUPPORTED_NETWORKS:
+            sync_pending_ids(net)
+        return True
     except Exception as e:
-        print("❌ Error updating exchange rates:", e)
-
-def get_pending_contract_ids():
-    d = {}
-    for net in SUPPORTED_NETWORKS:
-        w3, account = base_w3, base_account
-
-        contract_address = escrow_bridge_config[net]['address']
-        abi = escrow_bridge_config[net]['abi']
-        contract = w3.eth.contract(address=contract_address, abi=abi)
+        print(f"[cache] Failed to update pending escrows: {e}")
+        return False
 
-        pending = contract.functions.getPendingEscrows().call()
+def check_pending_ids(network, block_number):
+    """
+    Cheap consistency check of the log-maintained set against the chain at
+    ``block_number`` (one aggregate call); resync by paging only on mismatch.
+    """
+    bridge = contracts.bridge(network)
+    count = pending_index.count(network)
+    if array_length_is(bridge.w3, bridge.functions.pendingEscrows, count, block_identifier=block_number):
+        return True
+    print(f"[cache] Pending set on {network} drifted from chain ({count} tracked), resyncing")
+    sync_pending_ids(network, block_identifier=block_number)
+    return False
+
+# Ids per array read by one reconciliation pass; a backlog is worked off over several passes
+RECONCILE_LIMIT = 2000
+RECONCILE_LOG_CHUNK = 100  # escrow ids per filtered eth_getLogs when backfilling
+
+def _settled_event_ids(escrow_ids):
+    session = get_session()
+    try:
+        rows = session.query(SettledEvent.escrow_id).filter(SettledEvent.escrow_id.in_(escrow_ids)).all()
+        return {row.escrow_id for row in rows}
+    finally:
+        session.close()
 
-        for escrow_id in pending:
-            id_hash = escrow_id.hex()
-            d[id_hash] = net
+def reconcile_network(network):
+    """
+    One incremental pass: page the escrowIds/completedEscrows/expiredEscrows
+    items appended since the stored checkpoints, backfill the escrow index and
+    any settled_events / terminal_payments rows the listener missed (from the
+    ids' own logs), then advance the checkpoints. A checkpoint stops at the
+    first id whose rows could not be stored, so the next pass retries it.
+    """
+    bridge = contracts.bridge(network)
+    w3 = bridge.w3
+    block = w3.eth.block_number
+    summary = []
+
+    ids_sync = ArrayReconciler(network, "escrowIds")
+    start, ids = ids_sync.new_items(bridge, block, RECONCILE_LIMIT)
+    for escrow_id in ids:
+        escrow_index.record(escrow_id, network)
+    ids_sync.advance(start + len(ids), block if len(ids) < RECONCILE_LIMIT else None)
+    summary.append(f"{len(ids)} new escrows")
+
+    for array, event_name, outcome in (
+        ("completedEscrows", "PaymentSettled", "settled"),
+        ("expiredEscrows", "EscrowExpired", "expired"),
+    ):
+        sync = ArrayReconciler(network, array)
+        # Items past the checkpoint were appended after the block it was synced at
+        from_block = sync.synced_block() or deployment_block(w3, network)
+        start, ids = sync.new_items(bridge, block, RECONCILE_LIMIT)
+        for escrow_id in ids:
+            escrow_index.record(escrow_id, network)
+        id_hashes = [escrow_id.hex() for escrow_id in ids]
+        missing_terminal = set(id_hashes) - set(get_terminal_payments(id_hashes))
+        missing_settled = set(id_hashes) - _settled_event_ids(id_hashes) if outcome == "settled" else set()
+        missing = sorted(missing_terminal | missing_settled)
+
+        for i in range(0, len(missing), RECONCILE_LOG_CHUNK):
+            chunk = [bytes.fromhex(h) for h in missing[i:i + RECONCILE_LOG_CHUNK]]
+            logs = logs_for_ids(bridge, network, event_name, chunk, from_block, block)
+            if not logs:
+                continue
+            # Backfilled rows are dated by their block, not by when this pass ran
+            timestamps = block_timestamps(w3, [ev['blockNumber'] for ev in logs])
+            record_escrow_events(network, logs, timestamps)
+            save_settled_events(network, [ev for ev in logs if ev['args']['escrowId'].hex() in missing_settled], timestamps)
+            for ev in logs:
+                id_hash = ev['args']['escrowId'].hex()
+                if id_hash in missing_terminal:
+                    record_terminal_payment(ev, network, outcome)
+
+        # Count rows actually stored, not logs seen: a log whose row failed to save is not recovered
+        unrecovered = set()
+        if missing_terminal:
+            unrecovered |= missing_terminal - set(get_terminal_payments(sorted(missing_terminal)))
+        if missing_settled:
+            unrecovered |= missing_settled - _settled_event_ids(sorted(missing_settled))
+        if unrecovered:
+            retry_from = min(id_hashes.index(h) for h in unrecovered)
+            print(f"[reconcile] {network}: {len(unrecovered)} {outcome} escrow(s) not recovered, "
+                  f"retrying from index {start + retry_from}")
+            sync.advance(start + retry_from)
+        else:
+            # A page cut short by RECONCILE_LIMIT leaves older items behind: keep the old block bound
+            sync.advance(start + len(ids), block if len(ids) < RECONCILE_LIMIT else None)
+        summary.append(f"{len(ids)} new {outcome} ({len(missing) - len(unrecovered)}/{len(missing)} backfilled)")
 
-    return d
+    print(f"[reconcile] {network} @ block {block}: " + ", ".join(summary))
 
-def update_pending_contract_ids():
-    global cached_pending_contract_ids
-    try:
-        new_cache = get_pending_contract_ids()
-        cached_pending_contract_ids = new_cache
-        print(f"[cache] Updated pending escrows: {len(cached_pending_contract_ids)} items")
-    except Exception as e:
-        print(f"[cache] Failed to update pending escrows: {e}")
+def reconcile_all():
+    for net in SUPPORTED_NETWORKS:
+        try:
+            reconcile_network(net)
+        except Exception as e:
+            print(f"[reconcile] Pass failed on {net}: {e}")
 
-# Run scheduler
+# Scheduler is started from lifespan, not at import
 scheduler = BackgroundScheduler()
-scheduler.add_job(update_exchange_rates, "interval", minutes=30)  # run every 30 minutes
-scheduler.add_job(update_pending_contract_ids, "interval", seconds=30)  # run every minute
-scheduler.start()
+scheduler.add_job(refresh_snapshots, "interval", minutes=30)  # run every 30 minutes
+if has_role("settler"):
+    scheduler.add_job(refresh_signer_balances, "interval", minutes=1)
+if has_role("listener"):
+    scheduler.add_job(reconcile_all, "interval", minutes=5)
+
+def start_scheduler():
+    if not scheduler.running:
+        scheduler.start()
+
+def publish_log_event(kind, event, network):
+    """Push a lifecycle log to /status/stream subscribers."""
+    args = {k: v for k, v in event['args'].items() if k != 'escrowId'}
+    event_bus.publish(
+        kind, event['args']['escrowId'], network,
+        txHash="0x" + event['transactionHash'].hex().removeprefix("0x"),
+        blockNumber=event['blockNumber'],
+        args=make_serializable(args),
+    )
 
-def handle_init_event(event):
+def handle_init_event(event, network):
     print(f"[handle_event] New event detected: {event.event}")
+    escrow_index.record(event['args']['escrowId'], network)
     id_hash = event['args']['escrowId'].hex()
     print(f"[handle_event] Detected PaymentInitialized event: {id_hash}")
-    pending_ids.add(id_hash)
-
-def handle_settle_event(event):
+    pending_index.add(network, id_hash)
+    if has_role("listener"):
+        event_queue.put((record_escrow_event, (event, network)))
+    if has_role("settler"):
+        pending_ids.add(id_hash)
+    # Deadline is scheduled on the scheduler's next pass, from one payments() multicall
+    publish_log_event("initialized", event, network)
+
+def handle_settle_event(event, network):
     print(f"[handle_event] Detected PaymentSettled event: {event['args']['escrowId'].hex()}")
-    event_queue.put(event)
+    if has_role("listener"):
+        event_queue.put((add_event, (event,)))
+        event_queue.put((record_terminal_payment, (event, network, "settled")))
+        event_queue.put((record_escrow_event, (event, network)))
+    pending_index.discard(network, event['args']['escrowId'].hex())
+    pending_ids.discard(event['args']['escrowId'].hex())
+    deadlines.remove(event['args']['escrowId'].hex())
+    publish_log_event("settled", event, network)
+
+def handle_expire_event(event, network):
+    print(f"[handle_event] Detected EscrowExpired event: {event['args']['escrowId'].hex()}")
+    if has_role("listener"):
+        event_queue.put((record_terminal_payment, (event, network, "expired")))
+        event_queue.put((record_escrow_event, (event, network)))
+    # An expired escrow can never finalize; stop checking it
+    pending_index.discard(network, event['args']['escrowId'].hex())
+    pending_ids.discard(event['args']['escrowId'].hex())
+    deadlines.remove(event['args']['escrowId'].hex())
+    unsettleable.discard(event['args']['escrowId'].hex())
+    publish_log_event("expired", event, network)
 
 async def watch_escrow_status(id_hash: str, webhook_url: str, interval: float = 5.0, max_attempts: int = 120):
     for attempt in range(1, max_attempts + 1):
-        status = get_status(id_hash)
+        status = await get_status(id_hash)
         if status.get("status") == "completed":
             try:
                 async with httpx.AsyncClient() as client:
@@ -622,89 +1073,351 @@ async def watch_escrow_status(id_hash: str, webhook_url: str, interval: float =
 
     print(f"⚠️ Webhook {id_hash} expired after {max_attempts} attempts")
 
-async def _poll_and_finalize_async(id_hash, max_attempts, delay):
+def schedule_pending_deadlines():
+    """
+    Deadlines (createdAt + maxEscrowTime) for pending ids that don't have one yet,
+    reading createdAt with one payments() multicall per network.
+    Returns [(id_hash, network, deadline)].
+    """
+    ids = [
+        id_hash for id_hash in list(pending_ids)
+        if id_hash not in deadlines and id_hash not in active_threads and leases.owns(id_hash)
+    ]
+    if not ids:
+        return []
+    keys = {to_escrow_key(id_hash): id_hash for id_hash in ids}
+    networks = resolve_networks_batch(list(keys))
+
+    for key, net in networks.items():
+        if net is None:
+            print(f"Escrow {keys[key]} not found on any network")
+            pending_ids.discard(keys[key])
+
+    scheduled = []
+    for net, net_keys in _group_by_network(networks).items():
+        bridge = contracts.bridge(net)
+        max_escrow_time = snapshots.get(net).max_escrow_time
+        payments = aggregate(bridge.w3, [bridge.functions.payments(key) for key in net_keys])
+        for key, payment in zip(net_keys, payments):
+            if payment is not None:
+                scheduled.append((keys[key], net, payment[8] + max_escrow_time))  # Payment.createdAt
+    return scheduled
+
+def find_finalized_pending(scheduled, now=None):
+    """
+    One finality check for the scheduled escrows (``deadlines.by_urgency()``):
+    a single isFinalized + getSettlementStatus multicall per network. Returns
+    [(network, id_hash)] confirmed and ready to settle, closest to expiry
+    first. Escrows with less than SETTLE_MIN_LEAD seconds left, or whose
+    settlement already reverted, are skipped.
+    """
+    now = time.time() if now is None else now
+    candidates = {}
+    for id_hash, net, deadline in scheduled:
+        if id_hash in active_threads or id_hash in unsettleable:
+            continue
+        if deadline - now >= SETTLE_MIN_LEAD:
+            candidates.setdefault(net, []).append((deadline, id_hash))
+
+    ready = []
+    for net, entries in candidates.items():
+        bridge = contracts.bridge(net)
+        calls = []
+        for _, i in entries:
+            key = to_escrow_key(i)
+            calls += [bridge.functions.isFinalized(key), bridge.functions.getSettlementStatus(key)]
+        results = aggregate(bridge.w3, calls)
+        for (deadline, i), done, status in zip(entries, results[0::2], results[1::2]):
+            if done and status == SETTLEMENT_CONFIRMED:
+                ready.append((deadline, net, i))
+    return [(net, id_hash) for _, net, id_hash in sorted(ready)]
+
+# Re-signs at a fresh nonce when a first broadcast finds its nonce taken
+NONCE_CONFLICT_RETRIES = 3
+
+def send_bridge_tx(network, fn, kind, escrow_id, gas_factor=2, raise_on_revert=False):
+    """
+    Sign and send a bridge contract call from a pool signer, journaled in the
+    outbox; returns (tx_hash, receipt). If a send of the same kind for this
+    escrow is already in flight (or succeeded), it is confirmed instead. With
+    ``raise_on_revert``, a call that reverts in gas estimation raises
+    ContractLogicError instead of being sent with a default gas limit.
+    """
+    w3, _ = get_chain(network)
+    pool = get_signer_pool(network)
+    escrow_key = escrow_id.hex() if isinstance(escrow_id, (bytes, bytearray)) else escrow_id
+
+    signer = pool.acquire(kind)
     try:
-        print(f"Polling EscrowBridge Smart Contract for {id_hash}")
-        id_hash_bytes = Web3.to_bytes(hexstr=id_hash)
-        network, bridge = find_network_for_settlement(id_hash_bytes)
+        try:
+            entry_id, existing = outbox.open(network, kind, escrow_key, signer.address)
+        except Exception as e:
+            print(f"[outbox] Journal unavailable ({e}), sending without it")
+            entry_id, existing = None, None
+        if existing is not None:
+            print(f"[outbox] {kind} for {escrow_key[:16]}... already sent ({existing['tx_hash']}), confirming it")
+            account = pool.account_for(existing["sender"])
+            sign = account.sign_transaction if account is not None else None
+            receipt = outbox.confirm(w3, existing, sign=sign, policy=fee_policy)
+            if receipt is None:
+                # The earlier send can no longer land (now marked failed): send a fresh one
+                return send_bridge_tx(network, fn, kind, escrow_id, gas_factor, raise_on_revert)
+            return HexBytes(existing["tx_hash"]), receipt
 
-        w3, account = base_w3, base_account
+        try:
+            base_tx = fn.build_transaction({"from": signer.address})
 
-        for attempt in range(max_attempts):
-            is_finalized = bridge.functions.isFinalized(id_hash_bytes).call()
-            if is_finalized:
-                print(f"Payment is finalized for {id_hash}")
+            try:
+                gas_est = w3.eth.estimate_gas(base_tx)
+            except Exception as e:
+                if "Not authorized" in str(e):
+                    pool.disallow(signer, kind)
+                    raise
+                if raise_on_revert and isinstance(e, ContractLogicError):
+                    raise
+                gas_est = 200000
+                print("❌ Error estimating gas:", e)
+
+            latest_block = w3.eth.get_block("latest")
+            base_fee = latest_block.get("baseFeePerGas", DEFAULT_FALLBACK_BASE_FEE)
+
+            base_tx.update({
+                "gas": int(gas_est * gas_factor),
+                **fee_policy.initial(base_fee),
+                "type": 2
+            })
+        except Exception as e:
+            if entry_id is not None:
+                outbox.failed(entry_id, e)
+            raise
+
+        for attempt in range(NONCE_CONFLICT_RETRIES):
+            # Sign and broadcast under the signer's nonce lock (shared by every process
+            # using this key), so the next holder sees the nonce as taken
+            with pool.nonce_for(signer) as nonce:
+                base_tx["nonce"] = nonce
+                signed_tx = signer.account.sign_transaction(base_tx)
+
+                if entry_id is None:
+                    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+                else:
+                    # Journal the signed bytes before they can reach the network
+                    outbox.signed(entry_id, nonce, signed_tx.raw_transaction, signed_tx.hash, tx=base_tx)
+                    try:
+                        sent = outbox.send_raw(w3, entry_id, signed_tx.raw_transaction)
+                    except Exception as e:
+                        outbox.failed(entry_id, e)
+                        raise
+            if entry_id is None:
+                return tx_hash, w3.eth.wait_for_transaction_receipt(tx_hash)
+            if sent:
                 break
-            await asyncio.sleep(delay)
+            # Another transaction holds this nonce (mined or pending): re-sign at a fresh one
+            print(f"[outbox] Nonce {nonce} for {signer.address} is taken, re-signing {kind} for {escrow_key[:16]}...")
         else:
-            print(f"Timeout waiting for finalization for {id_hash}")
-            return
+            outbox.failed(entry_id, f"no free nonce after {NONCE_CONFLICT_RETRIES} attempts")
+            raise RuntimeError(f"Could not find a free nonce for {signer.address}")
+        # Replaced with bumped fees (same nonce) if it sits unmined, see FeePolicy
+        receipt = outbox.wait(w3, outbox.get(entry_id), sign=signer.account.sign_transaction, policy=fee_policy)
+        return HexBytes(receipt["transactionHash"]), receipt
+    finally:
+        pool.release(signer)
+
+def outbox_signer(entry):
+    """Signing callable for an outbox entry's sender, if this process holds its key."""
+    account = get_signer_pool(entry["network"]).account_for(entry["sender"])
+    return account.sign_transaction if account is not None else None
 
-        base_tx = bridge.functions.settlePayment(id_hash_bytes).build_transaction({
-            "from": account.address,
-            "nonce": w3.eth.get_transaction_count(account.address, "pending"),
-        })
+# An entry untouched this long has no sender waiting on it (Outbox.wait gives up after 120s)
+OUTBOX_IDLE_AFTER = 180
+OUTBOX_SWEEP_INTERVAL = int(os.getenv("OUTBOX_SWEEP_INTERVAL", "60"))
+
+async def resume_outbox(idle_for=None):
+    """
+    Confirm (re-broadcasting and fee-bumping if needed) unfinished transactions:
+    all of them at boot, or with ``idle_for`` only those no sender is waiting on.
+    """
+    try:
+        entries = await asyncio.to_thread(outbox.unfinished, None, idle_for)
+    except Exception as e:
+        print(f"[outbox] Could not read the journal: {e}")
+        return
+    owned = {e["escrow_id"] for e in entries if leases.owns(e["escrow_id"]) and e["escrow_id"] not in active_threads}
+    if not owned:
+        return
+    print(f"[outbox] Resuming {len(owned)} unfinished transaction(s)")
+    active_threads.update(owned)  # keep the scheduler off these until they resolve
+    try:
+        results = await asyncio.to_thread(
+            outbox.resume, lambda network: get_chain(network)[0], lambda entry: entry["escrow_id"] in owned,
+            outbox_signer, fee_policy, idle_for,
+        )
+        for entry, receipt in results:
+            outcome = "no longer valid" if receipt is None else f"mined (status {receipt['status']})"
+            print(f"[outbox] {entry['kind']} {entry['escrow_id'][:16]}... {outcome}")
+    finally:
+        active_threads.difference_update(owned)
 
+async def sweep_outbox(interval=OUTBOX_SWEEP_INTERVAL):
+    """
+    Keep driving sends whose sender timed out waiting for a receipt, so a stuck
+    transaction is still fee-bumped (and its escrow unblocked) without a restart.
+    """
+    while True:
+        await asyncio.sleep(interval)
         try:
-            gas_est = w3.eth.estimate_gas(base_tx)
+            await resume_outbox(idle_for=OUTBOX_IDLE_AFTER)
         except Exception as e:
-            gas_est = 200000
-            print("❌ Error estimating gas:", e)
-
-        latest_block = w3.eth.get_block("latest")
-        base_fee = latest_block.get("baseFeePerGas", w3.to_wei(15, "gwei"))
-        priority_fee = w3.to_wei(2, "gwei")
-        max_fee = base_fee + priority_fee
-
-        base_tx.update({
-            "gas": int(gas_est * 2),
-            "maxPriorityFeePerGas": priority_fee,
-            "maxFeePerGas": max_fee,
-            "type": 2
-        })
-
-        signed_tx = account.sign_transaction(base_tx)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-
-        if receipt.status == 1:
-            print(f"✅ Payment settled: {tx_hash.hex()}")
-        else:
-            print(f"❌ Transaction failed: {tx_hash.hex()}")
+            print(f"[outbox] Sweep failed: {e}")
+
+def settle_finalized_payment(network, id_hash_bytes):
+    """
+    Send settlePayment for a finalized escrow and wait for the receipt.
+    Returns True if the escrow is settled on chain (by this tx or another),
+    False if the settlement reverted. Raises ContractLogicError, without
+    sending, if it would revert.
+    """
+    bridge = contracts.bridge(network)
+    tx_hash, receipt = send_bridge_tx(
+        network, bridge.functions.settlePayment(id_hash_bytes), "settle", id_hash_bytes, raise_on_revert=True,
+    )
 
+    if receipt.status == 1:
+        print(f"✅ Payment settled: {tx_hash.hex()}")
+        return True
+    print(f"❌ Transaction failed: {tx_hash.hex()}")
+    return bridge.functions.isSettled(id_hash_bytes).call()
+
+def expire_due_escrow(network, id_hash_bytes):
+    """
+    Expire an escrow whose deadline has passed. Returns False if the chain
+    doesn't consider it expirable yet (block time lags wall-clock time).
+    """
+    bridge = contracts.bridge(network)
+    settled, expirable = aggregate(bridge.w3, [
+        bridge.functions.isSettled(id_hash_bytes),
+        bridge.functions.isEscrowExpired(id_hash_bytes),
+    ])
+    if settled:
+        return True
+    if not expirable:
+        return False
+
+    tx_hash, receipt = send_bridge_tx(network, bridge.functions.expireEscrow(id_hash_bytes), "expire", id_hash_bytes)
+    if receipt.status == 1:
+        print(f"✅ Escrow expired: {tx_hash.hex()}")
+    else:
+        print(f"❌ Transaction failed: {tx_hash.hex()}")
+    return True
+
+async def _settle_async(id_hash, network):
+    settled = reverted = False
+    id_hash_bytes = Web3.to_bytes(hexstr=id_hash)
+    try:
+        print(f"Payment is finalized for {id_hash}")
+        event_bus.publish("finalized", id_hash_bytes, network)
+        settled = await asyncio.to_thread(settle_finalized_payment, network, id_hash_bytes)
+        reverted = not settled
+    except ContractLogicError as e:
+        print(f"settlePayment for {id_hash} would revert, not sending it: {e}")
+        reverted = True
     except Exception as e:
         print(f"Error settling {id_hash}: {e}")
+        try:
+            settled = await asyncio.to_thread(contracts.bridge(network).functions.isSettled(id_hash_bytes).call)
+        except Exception:
+            pass
     finally:
-        async with asyncio.Lock():
-            pending_ids.discard(id_hash)
-            active_threads.discard(id_hash)
+        active_threads.discard(id_hash)
+    if settled:
+        pending_ids.discard(id_hash)
+        deadlines.remove(id_hash)
+        return
+    if reverted:
+        # Retrying would revert again: stop offering it for settlement, keep its deadline
+        unsettleable.add(id_hash)
+    if id_hash in pending_ids and id_hash not in deadlines:
+        # Its deadline passed (and was popped) while settling: hand it to the expiry path
+        deadlines.add(id_hash, network, time.time())
+    # Otherwise it keeps its deadline: the next finality pass retries a settlement
+    # that failed for other reasons, and it is expired once the deadline passes
+
+async def _expire_async(id_hash, network):
+    done = False
+    try:
+        done = await asyncio.to_thread(expire_due_escrow, network, Web3.to_bytes(hexstr=id_hash))
+    except Exception as e:
+        print(f"❌ Failed to expire {id_hash}: {e}")
+    finally:
+        active_threads.discard(id_hash)
+    if done:
+        pending_ids.discard(id_hash)
+        unsettleable.discard(id_hash)
+    elif id_hash in pending_ids:
+        # Not expirable on chain yet (or the tx failed): try again a block later
+        deadlines.add(id_hash, network, time.time() + EXPIRY_GRACE)
+
+def _drop_unowned():
+    """Unschedule escrows whose shard lease this process no longer holds."""
+    for id_hash, _, _ in deadlines.by_urgency():
+        if not leases.owns(id_hash):
+            deadlines.remove(id_hash)
+
+def _start(coro_fn, id_hash, network):
+    if id_hash in active_threads or not leases.owns(id_hash):
+        return
+    active_threads.add(id_hash)
+    asyncio.create_task(coro_fn(id_hash, network))
 
-async def poll_pending_settlements_async(max_attempts=60, delay=5):
+async def run_escrow_scheduler(finality_interval=FINALITY_POLL_INTERVAL):
+    """
+    Deadline-driven settler. Pending escrows sit in ``deadlines`` keyed on
+    createdAt + maxEscrowTime: each one is expired as soon as its deadline
+    passes, and every ``finality_interval`` seconds the escrows that can still
+    settle in time are checked for finality (most urgent first) in one batched
+    read. Between events the loop sleeps until the next deadline, waking early
+    when a new escrow is scheduled. Only escrows in shards leased by this
+    process are scheduled.
+    """
+    next_finality_check = 0
     while True:
-        for id_hash in list(pending_ids):
-            async with asyncio.Lock():
-                if id_hash in active_threads:
-                    continue
-                active_threads.add(id_hash)
+        try:
+            _drop_unowned()
+            for id_hash, network, _ in deadlines.pop_due(time.time() - EXPIRY_GRACE):
+                _start(_expire_async, id_hash, network)
+
+            if time.time() >= next_finality_check:
+                next_finality_check = time.time() + finality_interval
+                for id_hash, network, deadline in await asyncio.to_thread(schedule_pending_deadlines):
+                    if id_hash in pending_ids:  # may have settled while we were reading
+                        deadlines.add(id_hash, network, deadline)
+                scheduled = deadlines.by_urgency()
+                for network, id_hash in await asyncio.to_thread(find_finalized_pending, scheduled):
+                    _start(_settle_async, id_hash, network)
+        except Exception as e:
+            print(f"[settler] Scheduler pass failed: {e}")
 
-            asyncio.create_task(_poll_and_finalize_async(id_hash, max_attempts, delay))
+        wake_at = next_finality_check
+        next_deadline = deadlines.next_deadline()
+        if next_deadline is not None:
+            wake_at = min(wake_at, next_deadline + EXPIRY_GRACE)
+        await deadlines.wait(wake_at - time.time())
 
-        await asyncio.sleep(2)
- 
 async def log_loop_for_network(network, lookback=5):
-    w3, account = base_w3, base_account
+    w3, account = get_chain(network)
 
     try:
-        bridge = w3.eth.contract(
-            address=escrow_bridge_config[network]["address"],
-            abi=escrow_bridge_config[network]["abi"]
-        )
+        bridge = contracts.bridge(network)
     except Exception as e:
         print(f"[{network}] Error initializing contract: {e}")
         return
 
+    contract_name = get_deployment(network)["contract"]
+    config_topics = [get_topic(contract_name, name) for name in CONFIG_EVENTS]
+
     processed_tx_hashes = set()
     last_block = w3.eth.block_number - lookback  # Start with lookback on first iteration only
+    next_pending_check = time.monotonic() + PENDING_CHECK_INTERVAL
     print(f"[{network}] Starting event loop from block {last_block}")
 
     while True:
@@ -721,7 +1434,7 @@ async def log_loop_for_network(network, lookback=5):
                     tx_hash = ev['transactionHash'].hex()
                     if tx_hash not in processed_tx_hashes:
                         processed_tx_hashes.add(tx_hash)
-                        handle_init_event(ev)
+                        handle_init_event(ev, network)
 
                 logs = bridge.events.PaymentSettled.get_logs(
                     from_block=from_block,
@@ -731,10 +1444,36 @@ async def log_loop_for_network(network, lookback=5):
                     tx_hash = ev['transactionHash'].hex()
                     if tx_hash not in processed_tx_hashes:
                         processed_tx_hashes.add(tx_hash)
-                        handle_settle_event(ev)
+                        handle_settle_event(ev, network)
+
+                logs = bridge.events.EscrowExpired.get_logs(
+                    from_block=from_block,
+                    to_block=current_block
+                )
+                for ev in logs:
+                    tx_hash = ev['transactionHash'].hex()
+                    if tx_hash not in processed_tx_hashes:
+                        processed_tx_hashes.add(tx_hash)
+                        handle_expire_event(ev, network)
+
+                # One filter for all config-change events; any hit invalidates the snapshot
+                config_logs = w3.eth.get_logs({
+                    "address": bridge.address,
+                    "fromBlock": from_block,
+                    "toBlock": current_block,
+                    "topics": [config_topics]
+                })
+                if config_logs:
+                    print(f"[{network}] Contract config changed, refreshing snapshot")
+                    snapshots.refresh(network, w3, bridge)
 
                 last_block = current_block
 
+            # The pending set now reflects every log up to last_block; compare it there
+            if time.monotonic() >= next_pending_check:
+                next_pending_check = time.monotonic() + PENDING_CHECK_INTERVAL
+                await asyncio.to_thread(check_pending_ids, network, last_block)
+
             await asyncio.sleep(5)
         except Exception as e:
             print(f"[{network}] Error in log loop: {e}")
@@ -750,7 +1489,7 @@ async def main_log_loop():
 async def main():
     await asyncio.gather(
         main_log_loop(),
-        poll_pending_settlements_async()
+        run_escrow_scheduler()
     )
 
 # API Key Validation
@@ -768,18 +1507,29 @@ async def validate_api_key(x_api_key: str = Header(None)) -> APIKey:
     finally:
         session.close()
 
-def get_status(escrowId: str):
+async def get_status(escrowId: str):
+    """Pending/completed status for an escrow; concurrent requests for one id share a lookup."""
     if escrowId.startswith("0x"):
         escrowId = escrowId[2:]
+    status = await flights.do(("status", to_escrow_key(escrowId)), _get_status, escrowId)
+    return dict(status)
+
+async def _get_status(escrowId: str):
 
     print(f"Processing escrowId: {escrowId}")
 
     id_hash_bytes = Web3.to_bytes(hexstr=escrowId)
 
-    network, contract = find_network_for_settlement(id_hash_bytes)
+    network, contract = await find_network_for_settlement_async(id_hash_bytes)
+    if network is None:
+        return {"error": "Settlement not found."}
 
-    pending_escrows = contract.functions.getPendingEscrows().call({"from": base_account.address})
-    completed_escrows = contract.functions.getCompletedEscrows().call({"from": base_account.address})
+    # Coalesced with other in-flight status reads into one JSON-RPC batch
+    coalescer = coalescer_for(contract.w3)
+    pending_escrows, completed_escrows = await asyncio.gather(
+        coalescer.call(contract.functions.getPendingEscrows()),
+        coalescer.call(contract.functions.getCompletedEscrows()),
+    )
 
     if id_hash_bytes in pending_escrows:
         return {"status": "pending", "message": "Pending settlement found."}
@@ -794,13 +1544,30 @@ async def home(request: Request):
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    # Always 200 while the process is up (liveness); "ready" flips once chain state is loaded
+    rpc = {
+        net: {"endpoints": w3.provider.stats(), "block_cache": block_cache_for(w3).stats()}
+        for net, (w3, _) in list(_chains.items()) if hasattr(w3.provider, "stats")
+    }
+    return {
+        "status": "ok",
+        "live": True,
+        "ready": is_ready(),
+        "role": ROLE,
+        "checks": dict(readiness),
+        "rpc": rpc,
+        "flights": flights.stats(),
+        "stream_subscribers": event_bus.subscriber_count(),
+        "scheduled_deadlines": len(deadlines),
+        "leases": leases.stats(),
+        "signers": {net: pool.stats() for net, pool in list(_signer_pools.items())},
+    }
 
 @app.get("/config")
 async def config():
     clean_config = {}
-    for net, cfg in escrow_bridge_config.items():
-        clean_config[net] = {k:v for k,v in cfg.items() if k != "abi"}
+    for net in SUPPORTED_NETWORKS:
+        clean_config[net] = {"address": get_bridge_config(net)["address"]}
     return clean_config
 
 
@@ -808,7 +1575,7 @@ async def config():
 async def supported_networks():
     struct = {
         "base-sepolia": {
-            "chain_id": base_w3.eth.chain_id
+            "chain_id": get_snapshot("base-sepolia").chain_id
         }
     }
 
@@ -818,12 +1585,41 @@ async def supported_networks():
 async def charts():
     graph_json = create_charts()
 
+    base_contract = contracts.bridge("base-sepolia")
     blockdag_free_balance_raw = base_contract.functions.getFreeBalance().call()
     blockdag_free_balance = blockdag_free_balance_raw / 1e6  # USDC has 6 decimals
 
     return {"graph_1": graph_json, "graph_2": json.dumps({}), "bdag_balance": blockdag_free_balance}
 
-@app.get("/")
+@app.get("/status/stream")
+async def status_stream(request: Request, escrowIds: Optional[str] = None):
+    """
+    Server-Sent Events stream of lifecycle transitions (initialized, finalized,
+    settled, expired). ``escrowIds`` is a comma-separated filter; omit it to
+    receive every escrow. When ids are given, a ``snapshot`` event with each
+    id's current status is sent first so nothing that happened before the
+    subscription is missed.
+    """
+    ids, keys = [], []
+    if escrowIds:
+        ids, keys = _parse_batch_ids(EscrowIdsPayload(escrowIds=[i.strip() for i in escrowIds.split(",") if i.strip()]))
+
+    sub = event_bus.subscribe(keys or None)
+
+    async def stream():
+        with sub:
+            if keys:
+                statuses = await asyncio.to_thread(get_statuses_batch, keys)
+                for escrow_id, key in zip(ids, keys):
+                    yield format_sse({"escrowId": "0x" + key.hex(), "status": statuses[key]}, event="snapshot")
+            while not await request.is_disconnected():
+                message = await sub.get(timeout=STREAM_KEEPALIVE)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(message)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 @app.get("/status/{escrowId}")
 async def status(escrowId):
@@ -831,18 +1627,83 @@ async def status(escrowId):
     if not escrowId:
         raise HTTPException(status_code=400, detail="No data provided")
 
-    status = get_status(escrowId)
+    status = await get_status(escrowId)
 
     return {"escrowId": escrowId, "status": status}
 
 @app.get("/events")
-async def events():
-    df = events_to_df()
-    return {"events": df.to_dict(orient="records")}
+async def events(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    since: Optional[int] = None,
+    network: Optional[str] = None,
+    payer: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """
+    Settled events, newest first, ``limit`` per page; pass ``next_cursor`` back
+    as ``cursor`` for the next page. Pass ``latest_id`` back as ``since`` to
+    fetch only events stored since. Filter by ``network``, ``payer`` and a
+    ``start``/``end`` settlement time range.
+    """
+    if not 1 <= limit <= EVENTS_PAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {EVENTS_PAGE_MAX}")
+    if cursor is not None and since is not None:
+        raise HTTPException(status_code=400, detail="Use either cursor or since, not both")
+    if network is not None and network not in SUPPORTED_NETWORKS:
+        raise HTTPException(status_code=400, detail=f"Unsupported network: {network}")
+    if payer is not None:
+        if not Web3.is_address(payer):
+            raise HTTPException(status_code=400, detail="Invalid payer address")
+        payer = Web3.to_checksum_address(payer)
+    # Stored times are naive UTC
+    start, end = [t.astimezone(timezone.utc).replace(tzinfo=None) if t and t.tzinfo else t for t in (start, end)]
+    try:
+        return await asyncio.to_thread(page_settled_events, limit, cursor, since, network, payer, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+ANALYTICS_MAX_HOURS = 24 * 90
+
+def _analytics_window(network, hours):
+    if network is not None and network not in SUPPORTED_NETWORKS:
+        raise HTTPException(status_code=400, detail=f"Unsupported network: {network}")
+    if not 1 <= hours <= ANALYTICS_MAX_HOURS:
+        raise HTTPException(status_code=400, detail=f"hours must be between 1 and {ANALYTICS_MAX_HOURS}")
+    return datetime.utcnow() - timedelta(hours=hours)
+
+def _run_analytics(query_fn, network, since):
+    session = get_session()
+    try:
+        return query_fn(session, network=network, since=since)
+    finally:
+        session.close()
+
+@app.get("/analytics/settle_latency")
+async def settle_latency_endpoint(network: Optional[str] = None, hours: int = 24 * 7):
+    """Time-to-settle percentiles (seconds) for escrows settled in the last ``hours``."""
+    since = _analytics_window(network, hours)
+    result = await asyncio.to_thread(_run_analytics, settle_latency, network, since)
+    return {"network": network, "hours": hours, **result}
+
+@app.get("/analytics/expiry_ratio")
+async def expiry_ratio_endpoint(network: Optional[str] = None, hours: int = 24 * 7):
+    """Settled vs. expired escrows in the last ``hours``."""
+    since = _analytics_window(network, hours)
+    result = await asyncio.to_thread(_run_analytics, expiry_ratio, network, since)
+    return {"network": network, "hours": hours, **result}
+
+@app.get("/analytics/throughput")
+async def throughput_endpoint(network: Optional[str] = None, hours: int = 24):
+    """Escrows initialized / settled / expired per hour over the last ``hours``."""
+    since = _analytics_window(network, hours)
+    result = await asyncio.to_thread(_run_analytics, hourly_throughput, network, since)
+    return {"network": network, "hours": hours, "hourly": result}
 
 @app.get("/pending_ids")
 async def pending_ids_endpoint():
-    return {"pending_ids": cached_pending_contract_ids}
+    return {"pending_ids": pending_index.as_dict()}
 
 @app.post("/webhook")
 async def webhook(payload: WebhookPayload, background_tasks: BackgroundTasks):
@@ -889,26 +1750,80 @@ async def escrow_info(escrowId):
 
     escrow_id_bytes = Web3.to_bytes(hexstr=escrowId)
 
-    network, contract = find_network_for_settlement(escrow_id_bytes)
+    # Concurrent requests for the same escrow share one lookup
+    data, terminal = await flights.do(("escrow_info", to_escrow_key(escrow_id_bytes)), load_escrow_info, escrow_id_bytes)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Escrow not found")
 
-    data = get_payment(escrow_id_bytes, contract)
+    resp = {"escrowId": escrowId, "payment": dict(data)}
 
+    # Settled/expired records are immutable; live ones must be re-read
+    cache_control = TERMINAL_CACHE_CONTROL if terminal else "no-cache"
+    return JSONResponse(resp, headers={"Cache-Control": cache_control})
+
+async def load_escrow_info(escrow_id_bytes):
+    """
+    (payment, terminal) for an escrow with amounts in human units; payment is
+    None if unknown. Terminal escrows are served from the database; live ones
+    are read from chain, and stored once the read shows they are final.
+    """
+    escrow_id = escrow_id_bytes.hex()
+    data = await asyncio.to_thread(get_terminal_payment, escrow_id)
+    if data is not None:
+        return humanize_payment(data), True
+
+    network, contract = await find_network_for_settlement_async(escrow_id_bytes)
+    if network is None:
+        return None, False
+
+    data = await asyncio.to_thread(get_payment, escrow_id_bytes, contract)
+    if data is None:
+        raise HTTPException(status_code=502, detail="Could not read escrow from chain")
+
+    terminal = data.get("isSettled", False)
+    if terminal:
+        # isSettled also flips on expiry; only a settlement posts an amount
+        outcome = "settled" if data.get("postedAmountUsd") else "expired"
+        await asyncio.to_thread(save_terminal_payment, escrow_id, network, outcome, data)
+
+    return humanize_payment(data), terminal
+
+def humanize_payment(data):
+    """Convert raw Payment amounts to token / USD units."""
+    data = dict(data)
     data['requestedAmount'] = data.get("requestedAmount") / 1e18
     data['requestedAmountUsd'] = data.get("requestedAmountUsd") / 1e6
 
     data['postedAmount'] = data.get("postedAmount") / 1e18
     data['postedAmountUsd'] = data.get("postedAmountUsd") / 1e6
 
-    resp = {"escrowId": escrowId, "payment": data}
-
-    return resp
+    return data
+
+@app.post("/status/batch")
+async def status_batch(payload: EscrowIdsPayload):
+    ids, keys = _parse_batch_ids(payload)
+    statuses = await asyncio.to_thread(get_statuses_batch, keys)
+    return {"statuses": [{"escrowId": i, "status": statuses[k]} for i, k in zip(ids, keys)]}
+
+@app.post("/escrow_info/batch")
+async def escrow_info_batch(payload: EscrowIdsPayload):
+    ids, keys = _parse_batch_ids(payload)
+    infos = await asyncio.to_thread(get_escrow_infos_batch, keys)
+    escrows = []
+    for escrow_id, key in zip(ids, keys):
+        if infos[key] is None:
+            escrows.append({"escrowId": escrow_id, "payment": None, "error": "Escrow not found"})
+        else:
+            escrows.append({"escrowId": escrow_id, "payment": infos[key]})
+    return JSONResponse({"escrows": escrows}, headers={"Cache-Control": "no-cache"})
 
 @app.get("/exchange_rates")
 def get_exchange_rates():
-    return JSONResponse(cached_exchange_rates)
+    return JSONResponse(get_all_exchange_rates())
 
 @app.get("/max_escrow_time")
 def get_max_escrow_time():
+    max_escrow_time = get_snapshot("base-sepolia").max_escrow_time
     return {"seconds": max_escrow_time,
             "minutes": max_escrow_time / 60,
             "hours": max_escrow_time / 3600,
@@ -916,25 +1831,25 @@ def get_max_escrow_time():
 
 @app.get("/fee")
 def get_fee():
-    return {"fee_pct": fee_pct}
+    return {"fee_pct": get_snapshot("base-sepolia").fee_pct}
 
 @app.post("/request_payment")
 async def request_payment(payload: RequestPaymentPayload, api_key: str = Depends(require_auth)):
     amount = payload.amount
     receiver = payload.receiver
-    email = recipient_email
     network = payload.network
 
     if network not in SUPPORTED_NETWORKS:
         raise HTTPException(status_code=400, detail=f"Unsupported network: {network}")
 
-    w3, account = base_w3, base_account
+    snap = get_snapshot(network)
+    recipient_email = snap.recipient_email
+
+    w3, account = get_chain(network)
 
-    contract_address = escrow_bridge_config[network]["address"]
-    abi = escrow_bridge_config[network]["abi"]
-    contract = w3.eth.contract(address=contract_address, abi=abi)
+    contract = contracts.bridge(network)
 
-    decimals = token_decimals
+    decimals = snap.token_decimals
 
     raw_amount_needed = int(amount * 10**decimals)
     print(f"Raw amount needed: {raw_amount_needed}")
@@ -960,40 +1875,18 @@ async def request_payment(payload: RequestPaymentPayload, api_key: str = Depends
         raise HTTPException(status_code=400, detail="Invalid receiver address")
 
     try:
-        tx = contract.functions.initPayment(
-            id_hash_bytes,
-            raw_amount_needed,
-            receiver
-        ).build_transaction({
-            "from": account.address,
-            "nonce": w3.eth.get_transaction_count(account.address, "pending"),
-        })
-
-        try:
-            gas_est = w3.eth.estimate_gas(tx)
-        except Exception as e:
-            gas_est = 200000
-            print(f"Error estimating gas: {e}")
-
-        latest_block = w3.eth.get_block("latest")
-        base_fee = latest_block.get("baseFeePerGas", w3.to_wei(15, "gwei"))
-        priority_fee = w3.to_wei(2, "gwei")
-        max_fee = base_fee + priority_fee
-
-        tx.update({
-            "gas": int(gas_est * 1.5),
-            "maxPriorityFeePerGas": priority_fee,
-            "maxFeePerGas": max_fee,
-            "type": 2
-        })
-
-        signed_init = account.sign_transaction(tx)
-        h_init = w3.eth.send_raw_transaction(signed_init.raw_transaction)
-        receipt_init = w3.eth.wait_for_transaction_receipt(h_init)
+        h_init, receipt_init = await asyncio.to_thread(
+            send_bridge_tx, network,
+            contract.functions.initPayment(id_hash_bytes, raw_amount_needed, receiver),
+            "init", id_hash_bytes, 1.5,
+        )
 
         if receipt_init.status != 1:
             raise HTTPException(status_code=500, detail="initPayment transaction reverted")
 
+        # Also drops any negative entry this replica cached for the id
+        escrow_index.record(id_hash_bytes, network)
+
         print(f"initPayment({settlement_id}, {amount}) submitted -> Tx: {h_init.hex()}")
 
         user_url = None
@@ -137,6 +137,37 @@ async def test_async_sdk():
         else:
             print("    SKIPPED (no escrow ID from request_payment)")
 
+        # Test batch lookups (the unknown id should come back as not found)
+        print("\n[7b] Testing status_batch() / escrow_info_batch()...")
+        if TEST_ESCROW_ID:
+            try:
+                ids = [TEST_ESCROW_ID, "0x" + "00" * 32]
+                result = await sdk.status_batch(ids)
+                print(f"    Statuses: {result}")
+                assert len(result["statuses"]) == len(ids)
+                result = await sdk.escrow_info_batch(ids)
+                print(f"    Escrows: {result}")
+                assert result["escrows"][1]["payment"] is None
+                print("    PASSED")
+            except Exception as e:
+                print(f"    FAILED: {e}")
+        else:
+            print("    SKIPPED (no escrow ID from request_payment)")
+
+        # Test the status stream (a fresh escrow won't settle within the timeout)
+        print("\n[7c] Testing wait_for_settlement()...")
+        if TEST_ESCROW_ID:
+            try:
+                result = await sdk.wait_for_settlement(TEST_ESCROW_ID, timeout=10)
+                print(f"    Result: {result}")
+                print("    PASSED")
+            except TimeoutError as e:
+                print(f"    PASSED (not settled yet): {e}")
+            except Exception as e:
+                print(f"    FAILED: {e}")
+        else:
+            print("    SKIPPED (no escrow ID from request_payment)")
+
         print("\n[9] Testing webhook()...")
         if TEST_ESCROW_ID:
             print("    SKIPPED (uncomment to test - registers real webhook)")
@@ -31,6 +31,7 @@ if not CLIENT_API_KEY:
 TEST_RECEIVER = os.getenv("TEST_RECEIVER", "0x38979DFdB5d8FD76FAD4E797c4660e20015C6a84")  # Example addressita
 TEST_WEBHOOK_URL = os.getenv("TEST_WEBHOOK_URL", "http://localhost:9201/my-webhook")
 TEST_ESCROW_ID = None  # Will be set by request_payment() in sync test
+TEST_EXPIRED_ESCROW_ID = os.getenv("TEST_EXPIRED_ESCROW_ID")  # An escrow that has already expired
 USER_URL = None  # Will be set by request_payment() in sync test
 
 def test_sync_sdk():
@@ -140,6 +141,50 @@ def test_sync_sdk():
     else:
         print("    SKIPPED (no escrow ID from request_payment)")
 
+    # Test batch lookups (the unknown id should come back as not found)
+    print("\n[7b] Testing status_batch() / escrow_info_batch()...")
+    if TEST_ESCROW_ID:
+        try:
+            ids = [TEST_ESCROW_ID, "0x" + "00" * 32]
+            result = sdk.status_batch(ids)
+            print(f"    Statuses: {result}")
+            assert len(result["statuses"]) == len(ids)
+            result = sdk.escrow_info_batch(ids)
+            print(f"    Escrows: {result}")
+            assert result["escrows"][1]["payment"] is None
+            print("    PASSED")
+        except Exception as e:
+            print(f"    FAILED: {e}")
+    else:
+        print("    SKIPPED (no escrow ID from request_payment)")
+
+    # Test the status stream (a fresh escrow won't settle within the timeout)
+    print("\n[7c] Testing wait_for_settlement()...")
+    if TEST_ESCROW_ID:
+        try:
+            result = sdk.wait_for_settlement(TEST_ESCROW_ID, timeout=10)
+            print(f"    Result: {result}")
+            print("    PASSED")
+        except TimeoutError as e:
+            print(f"    PASSED (not settled yet): {e}")
+        except Exception as e:
+            print(f"    FAILED: {e}")
+    else:
+        print("    SKIPPED (no escrow ID from request_payment)")
+
+    # An escrow that already expired must end the wait at the snapshot
+    print("\n[7d] Testing wait_for_settlement() on an expired escrow...")
+    if TEST_EXPIRED_ESCROW_ID:
+        try:
+            result = sdk.wait_for_settlement(TEST_EXPIRED_ESCROW_ID, timeout=10)
+            print(f"    Result: {result}")
+            assert result["event"] == "snapshot" and result["status"]["status"] == "expired"
+            print("    PASSED")
+        except Exception as e:
+            print(f"    FAILED: {e}")
+    else:
+        print("    SKIPPED (set TEST_EXPIRED_ESCROW_ID)")
+
     # Test webhook (commented out by default)
     print("\n[9] Testing webhook()...")
     if TEST_ESCROW_ID:
@@ -2,10 +2,17 @@
 Escrow Bridge SDK - Client for interacting with the Escrow Bridge API.
 """
 
+import json
+import time
 import httpx
-from typing import Optional
+from typing import AsyncIterator, Iterator, List, Optional
 from dataclasses import dataclass
 
+# Escrow lifecycle events that end a /status/stream watch
+TERMINAL_EVENTS = ("settled", "expired")
+# Snapshot statuses of an escrow that had already finished when the watch started
+TERMINAL_STATUSES = ("completed", "expired")
+
 
 @dataclass
 class RequestPaymentParams:
@@ -24,6 +31,44 @@ class WebhookParams:
     escrow_id: str
 
 
+class _SSEParser:
+    """Minimal Server-Sent Events decoder: feed lines, get back complete messages."""
+
+    def __init__(self):
+        self._event = None
+        self._data = []
+
+    def feed(self, line: str) -> Optional[dict]:
+        if line == "":
+            if not self._data:
+                self._event = None
+                return None
+            message = json.loads("\n".join(self._data))
+            message.setdefault("event", self._event or "message")
+            self._event, self._data = None, []
+            return message
+        if line.startswith(":"):  # comment / keepalive
+            return None
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            self._event = value
+        elif field == "data":
+            self._data.append(value)
+        return None
+
+
+def _stream_params(escrow_ids: Optional[List[str]]) -> Optional[dict]:
+    return {"escrowIds": ",".join(escrow_ids)} if escrow_ids else None
+
+
+def _is_final(message: dict) -> bool:
+    """True for a settled/expired event, or a snapshot showing the escrow already completed or expired."""
+    if message.get("event") in TERMINAL_EVENTS:
+        return True
+    return message.get("event") == "snapshot" and message.get("status", {}).get("status") in TERMINAL_STATUSES
+
+
 class EscrowBridgeSDK:
     """
     SDK client for the Escrow Bridge API.
@@ -123,6 +168,31 @@ class EscrowBridgeSDK:
         """
         return self._get(f"/escrow_info/{escrow_id}")
 
+    def status_batch(self, escrow_ids: List[str]) -> dict:
+        """
+        Get the status of many escrows in one request.
+
+        Args:
+            escrow_ids: Escrow IDs (hex strings); the server caps how many per call
+
+        Returns:
+            dict with a "statuses" list of {escrowId, status}, in request order
+        """
+        return self._post("/status/batch", {"escrowIds": list(escrow_ids)})
+
+    def escrow_info_batch(self, escrow_ids: List[str]) -> dict:
+        """
+        Get payment details for many escrows in one request.
+
+        Args:
+            escrow_ids: Escrow IDs (hex strings); the server caps how many per call
+
+        Returns:
+            dict with an "escrows" list of {escrowId, payment}; unknown ids have
+            payment None and an "error"
+        """
+        return self._post("/escrow_info/batch", {"escrowIds": list(escrow_ids)})
+
     def exchange_rates(self) -> dict:
         """
         Get current exchange rates for all supported networks.
@@ -199,6 +269,54 @@ class EscrowBridgeSDK:
         }
         return self._post("/webhook", payload)
 
+    def _stream_events(self, escrow_ids: Optional[List[str]] = None) -> Iterator[Optional[dict]]:
+        """Yield stream messages, plus None at every keepalive so callers can check deadlines."""
+        url = f"{self.base_url}/status/stream"
+        with self._client.stream("GET", url, params=_stream_params(escrow_ids)) as response:
+            response.raise_for_status()
+            parser = _SSEParser()
+            for line in response.iter_lines():
+                message = parser.feed(line)
+                if message is not None or line == "":
+                    yield message
+
+    def watch(self, escrow_ids: Optional[List[str]] = None) -> Iterator[dict]:
+        """
+        Stream escrow lifecycle events from the server.
+
+        Args:
+            escrow_ids: Escrow IDs to follow; None follows every escrow
+
+        Yields:
+            dicts with "event" ("snapshot", "initialized", "finalized", "settled"
+            or "expired") and "escrowId". Filtered streams start with one
+            "snapshot" per id carrying its current status.
+        """
+        for message in self._stream_events(escrow_ids):
+            if message is not None:
+                yield message
+
+    def wait_for_settlement(self, escrow_id: str, timeout: float = 600.0) -> dict:
+        """
+        Block until an escrow is settled or expired.
+
+        Args:
+            escrow_id: The escrow ID to wait for
+            timeout: Seconds to wait before raising TimeoutError (checked on
+                every event and server keepalive, i.e. at least every ~15s)
+
+        Returns:
+            The settled/expired event (or the snapshot, if it had already
+            completed or expired)
+        """
+        deadline = time.monotonic() + timeout
+        for message in self._stream_events([escrow_id]):
+            if message is not None and _is_final(message):
+                return message
+            if time.monotonic() > deadline:
+                break
+        raise TimeoutError(f"Escrow {escrow_id} not settled within {timeout}s")
+
 
 class AsyncEscrowBridgeSDK:
     """
@@ -262,6 +380,14 @@ class AsyncEscrowBridgeSDK:
         """Get detailed information about an escrow."""
         return await self._get(f"/escrow_info/{escrow_id}")
 
+    async def status_batch(self, escrow_ids: List[str]) -> dict:
+        """Get the status of many escrows in one request."""
+        return await self._post("/status/batch", {"escrowIds": list(escrow_ids)})
+
+    async def escrow_info_batch(self, escrow_ids: List[str]) -> dict:
+        """Get payment details for many escrows in one request."""
+        return await self._post("/escrow_info/batch", {"escrowIds": list(escrow_ids)})
+
     async def exchange_rates(self) -> dict:
         """Get current exchange rates for all supported networks."""
         return await self._get("/exchange_rates")
@@ -301,3 +427,30 @@ class AsyncEscrowBridgeSDK:
             "escrowId": escrow_id,
         }
         return await self._post("/webhook", payload)
+
+    async def _stream_events(self, escrow_ids: Optional[List[str]] = None) -> AsyncIterator[Optional[dict]]:
+        """Yield stream messages, plus None at every keepalive so callers can check deadlines."""
+        url = f"{self.base_url}/status/stream"
+        async with self._client.stream("GET", url, params=_stream_params(escrow_ids)) as response:
+            response.raise_for_status()
+            parser = _SSEParser()
+            async for line in response.aiter_lines():
+                message = parser.feed(line)
+                if message is not None or line == "":
+                    yield message
+
+    async def watch(self, escrow_ids: Optional[List[str]] = None) -> AsyncIterator[dict]:
+        """Stream escrow lifecycle events from the server (see EscrowBridgeSDK.watch)."""
+        async for message in self._stream_events(escrow_ids):
+            if message is not None:
+                yield message
+
+    async def wait_for_settlement(self, escrow_id: str, timeout: float = 600.0) -> dict:
+        """Wait until an escrow is settled or expired; raises TimeoutError after ``timeout`` seconds."""
+        deadline = time.monotonic() + timeout
+        async for message in self._stream_events([escrow_id]):
+            if message is not None and _is_final(message):
+                return message
+            if time.monotonic() > deadline:
+                break
+        raise TimeoutError(f"Escrow {escrow_id} not settled within {timeout}s")